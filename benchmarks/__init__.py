@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks
+    :synopsis: Benchmarks, run them from the repository root, for example:
+        ``python -m benchmarks.allocations --profiles 1000000``,
+        ``python -m benchmarks.suite --nodes 1000 1000000``,
+        ``python -m benchmarks.imports``
+"""
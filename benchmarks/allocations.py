@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.allocations
+    :synopsis: Builder and visitor allocations during one parse of
+        ``documents/users.xml`` scaled to given number of profiles:
+
+        - ``visitors (fresh)``, visitor parse path with new builder and
+          visitor per nested node (previous behaviour)
+        - ``visitors``, visitor parse path with builder rebound to nested
+          nodes
+        - ``compiled``, compiled parse plans
+
+        ``python -m benchmarks.allocations --profiles 1000000``
+"""
+from __future__ import print_function
+
+import time
+import argparse
+from copy import deepcopy
+from collections import Counter
+
+from lxml import etree
+
+from tests.documents import Users
+from composite.builders import LXMLDocumentBuilder
+from composite.visitors import LXMLParseVisitor
+
+counter = Counter()
+
+
+class CountingVisitor(LXMLParseVisitor):
+    def __init__(self, *args, **kwargs):
+        counter['visitors'] += 1
+        super(CountingVisitor, self).__init__(*args, **kwargs)
+
+
+class CountingBuilder(LXMLDocumentBuilder):
+    parse_visitor_class = CountingVisitor
+
+    def __init__(self, document):
+        counter['builders'] += 1
+        super(CountingBuilder, self).__init__(document)
+
+
+class VisitorBuilder(CountingBuilder):
+    parse_compiler_class = None
+
+
+class FreshVisitorBuilder(VisitorBuilder):
+    def parse_nested(self, document_class, source):
+        return document_class.parse(self.__class__, source)
+
+
+BUILDERS = (
+    ('visitors (fresh)', FreshVisitorBuilder),
+    ('visitors', VisitorBuilder),
+    ('compiled', CountingBuilder),
+)
+
+
+def make_users(profiles, path='documents/users.xml'):
+    """
+    make users xml scaled to given number of profiles
+
+    :param int profiles: number of profiles
+    :param str path: users xml template
+    :rtype: lxml.etree.Element
+    :return: users document element
+    """
+    template = etree.parse(path).getroot()
+    samples = list(template)
+    root = etree.Element(template.tag)
+    for index in range(profiles):
+        root.append(deepcopy(samples[index % len(samples)]))
+    return root
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='builder and visitor allocations per parse')
+    parser.add_argument('--profiles', type=int, default=1000000)
+    args = parser.parse_args()
+
+    source = make_users(args.profiles)
+    print('%-18s %12s %12s %10s' % ('mode', 'builders', 'visitors',
+                                    'seconds'))
+    for name, builder_class in BUILDERS:
+        counter.clear()
+        start = time.time()
+        users = Users.parse(builder_class, source)
+        elapsed = time.time() - start
+        assert len(users) == args.profiles
+        print('%-18s %12d %12d %10.2f' % (name, counter['builders'],
+                                          counter['visitors'], elapsed))
+
+
+if __name__ == '__main__':
+    main()
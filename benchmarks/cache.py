@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.cache
+    :synopsis: Parse cache hit cost compared with parse, for every builder
+        source kind (dict, JSON text, xml bytes, lxml element) of
+        ``documents/company.json`` and users scaled to ``--profiles``:
+
+        - ``parse``, parse without cache
+        - ``hit``, cache hit keyed by source content (source is dumped and
+          hashed)
+        - ``hit (key)``, cache hit keyed by caller supplied ``cache_key``
+
+        ``python -m benchmarks.cache --profiles 2000``
+"""
+from __future__ import print_function
+
+import sys
+import json
+import timeit
+import argparse
+
+from lxml import etree
+
+from tests.documents import Company, Users
+from composite.cache import ParseCache
+from composite.builders import (
+    ExpatDocumentBuilder, JSONDocumentBuilder, LXMLDocumentBuilder,
+    PythonDocumentBuilder
+)
+
+
+def make_sources(profiles):
+    """
+    make sources of every builder
+
+    :param int profiles: number of users profiles
+    :rtype: list
+    :return: list[tuple[name, document class, builder class, source]]
+    """
+    with open('documents/company.json', 'r') as doc:
+        company = json.load(doc)
+    with open('documents/users.json', 'r') as doc:
+        users = json.load(doc)
+    users['profile'] = [users['profile'][index % len(users['profile'])]
+                        for index in range(profiles)]
+
+    sources = []
+    for name, document_class, source in (('company', Company, company),
+                                         ('users', Users, users)):
+        document = document_class.parse(PythonDocumentBuilder, source)
+        element = document_class.build(LXMLDocumentBuilder, document)
+        sources += [
+            (name, document_class, PythonDocumentBuilder, source),
+            (name, document_class, JSONDocumentBuilder,
+             document_class.build(JSONDocumentBuilder, document)),
+            (name, document_class, ExpatDocumentBuilder,
+             etree.tostring(element)),
+            (name, document_class, LXMLDocumentBuilder, element),
+        ]
+    return sources
+
+
+def measure(function, repeat=5):
+    """
+    measure function call time, every run takes 0.2 seconds at least
+    (python 3.6+, 100 calls otherwise)
+
+    :param callable function: function
+    :param int repeat: number of runs
+    :rtype: float
+    :return: best seconds per call
+    """
+    timer = timeit.Timer(function)
+    number = timer.autorange()[0] if hasattr(timer, 'autorange') else 100
+    return min(timer.repeat(repeat, number)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description='parse cache hit cost')
+    parser.add_argument('--profiles', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='json results file')
+    args = parser.parse_args()
+
+    results = []
+    print('%-8s %-22s %12s %12s %12s' % ('document', 'builder', 'parse us',
+                                         'hit us', 'hit (key) us'))
+    for name, document_class, builder_class, source in make_sources(
+            args.profiles):
+        cache = ParseCache()
+
+        def parse():
+            document_class.parse(builder_class, source)
+
+        def hit():
+            document_class.parse(builder_class, source, cache=cache)
+
+        def key_hit():
+            document_class.parse(builder_class, source, cache=cache,
+                                 cache_key=name)
+
+        hit()
+        key_hit()
+        result = {
+            'document': name, 'builder': builder_class.__name__,
+            'parse': measure(parse, repeat=args.repeat),
+            'hit': measure(hit, repeat=args.repeat),
+            'key_hit': measure(key_hit, repeat=args.repeat),
+        }
+        results.append(result)
+        print('%-8s %-22s %12.1f %12.1f %12.1f' % (
+            name, builder_class.__name__, result['parse'] * 1e6,
+            result['hit'] * 1e6, result['key_hit'] * 1e6))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'python': sys.version, 'profiles': args.profiles,
+                       'results': results}, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.compare
+    :synopsis: Compare two :py:mod:`benchmarks.suite` result files, phases
+        slower (or using more memory) than ``--threshold`` are reported as
+        regressions and the exit status is ``1``:
+
+        ``python -m benchmarks.compare before.json after.json``
+"""
+from __future__ import print_function
+
+import sys
+import json
+import argparse
+
+#: result fields identifying measurement
+KEY_FIELDS = ('builder', 'phase', 'scale', 'depth', 'attribute_density')
+
+#: compared metrics, higher values are worse
+METRICS = ('seconds', 'peak_bytes')
+
+
+def load_results(path):
+    """
+    load results file
+
+    :param str path: results file path
+    :rtype: dict
+    :return: ``key -> result`` mapping
+    """
+    with open(path, 'r') as source:
+        data = json.load(source)
+    return dict(
+        (tuple(result[field] for field in KEY_FIELDS), result)
+        for result in data['results']
+    )
+
+
+def compare(before, after, threshold=0.1):
+    """
+    compare results
+
+    :param dict before: baseline results, see :py:func:`load_results`
+    :param dict after: new results
+    :param float threshold: allowed relative growth of metrics
+    :rtype: list[tuple]
+    :return: tuple[key, metric, before value, after value, ratio,
+        regression flag] for every metric of common measurements
+    """
+    rows = []
+    for key in sorted(set(before) & set(after), key=repr):
+        for metric in METRICS:
+            old, new = before[key].get(metric), after[key].get(metric)
+            if not old or new is None:
+                continue
+            ratio = float(new) / old
+            rows.append((key, metric, old, new, ratio,
+                         ratio > 1 + threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='compare benchmark results')
+    parser.add_argument('before', help='baseline results file')
+    parser.add_argument('after', help='new results file')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed relative growth, 0.1 is 10%%')
+    args = parser.parse_args()
+
+    rows = compare(load_results(args.before), load_results(args.after),
+                   args.threshold)
+    print('%-8s %-6s %10s %-11s %14s %14s %7s' % (
+        'builder', 'phase', 'scale', 'metric', 'before', 'after', 'ratio'))
+    regressions = 0
+    for key, metric, old, new, ratio, regression in rows:
+        regressions += regression
+        print('%-8s %-6s %10d %-11s %14.4f %14.4f %7.2f%s' % (
+            key[0], key[1], key[2], metric, old, new, ratio,
+            ' !' if regression else ''))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.generator
+    :synopsis: Synthetic documents of any document schema at given scale:
+
+        - ``nodes``, approximate number of documents (nodes) in the tree,
+          ``Node`` fields get as few documents as possible and the rest
+          is split evenly between ``ListNode`` fields of every document
+        - ``depth``, max nesting depth, deeper ``ListNode`` fields stay
+          empty
+        - ``attribute_density``, share of documents with attributes
+
+        .. code-block:: python
+
+            users = generate(Users, nodes=100000, attribute_density=0.5)
+"""
+import random
+import string
+
+import six
+
+from composite.const import ATTRIBUTES_META_CLASS
+from composite.fields import Node, ListNode, ListField
+
+WORDS = ('alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf',
+         'hotel', 'india', 'juliett', 'kilo', 'lima', 'mike', 'november')
+
+
+def has_nested(document_class):
+    """
+    if document class has nested document fields
+
+    :param type document_class: document class
+    :rtype: bool
+    :return: True if document has ``Node`` or ``ListNode`` fields
+    """
+    return any(isinstance(field, (Node, ListNode))
+               for field in document_class._fields.values())
+
+
+def get_min_size(document_class):
+    """
+    get min number of documents in document tree, ``Node`` fields are
+    always filled while ``ListNode`` ones could be empty
+
+    :param type document_class: document class
+    :rtype: int
+    :return: number of documents
+    """
+    return 1 + sum(
+        get_min_size(field.type)
+        for field in document_class._fields.values()
+        if isinstance(field, Node)
+    )
+
+
+class DocumentGenerator(object):
+    """
+    Generates random documents of document class, values are random but
+    reproducible for the same ``seed``
+    """
+    def __init__(self, document_class, nodes=1000, depth=3,
+                 attribute_density=1.0, list_size=5, seed=0):
+        """
+        initiate generator
+
+        :param type document_class: document class
+        :param int nodes: approximate number of documents in the tree
+        :param int depth: max nesting depth
+        :param float attribute_density: share of documents with attributes,
+            ``0.0`` to ``1.0``
+        :param int list_size: number of ``ListField`` and ``ArrayField``
+            items
+        :param int seed: random seed
+        """
+        self.document_class = document_class
+        self.nodes = nodes
+        self.depth = depth
+        self.attribute_density = attribute_density
+        self.list_size = list_size
+        self.random = random.Random(seed)
+        #: number of generated documents (attributes are not counted)
+        self.count = 0
+
+    def make_value(self, typ):
+        """
+        make random value of field type
+
+        :param type typ: field type
+        :rtype: any
+        :return: value
+        """
+        rand = self.random
+        if typ is bool:
+            return rand.random() < 0.5
+        if typ in six.integer_types:
+            return rand.randint(0, 10 ** 6)
+        if typ is float:
+            return round(rand.uniform(-1000, 1000), 3)
+        if typ in six.string_types or typ is six.text_type:
+            return typ('%s %s%d' % (rand.choice(WORDS),
+                                    rand.choice(string.ascii_lowercase),
+                                    rand.randint(0, 999)))
+        return typ()
+
+    def fill_values(self, document, document_class):
+        """
+        fill document value fields (not nested documents)
+
+        :param composite.Document document: document
+        :param type document_class: document class
+        :rtype: None
+        :return: None
+        """
+        for field_name, field in document_class._fields.items():
+            if isinstance(field, (Node, ListNode)):
+                continue
+            if isinstance(field, ListField):
+                value = [self.make_value(field.type)
+                         for _ in range(self.list_size)]
+            else:
+                value = self.make_value(field.type)
+            setattr(document, field_name, value)
+
+    def make_document(self, document_class, budget, depth):
+        """
+        make document with ``budget`` documents in its tree (approximately)
+
+        :param type document_class: document class
+        :param int budget: number of documents in document tree
+        :param int depth: nesting depth left
+        :rtype: composite.Document
+        :return: document
+        """
+        document = document_class.blank()
+        self.count += 1
+        self.fill_values(document, document_class)
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class and (
+                self.random.random() < self.attribute_density):
+            attributes = attribute_class.blank()
+            self.fill_values(attributes, attribute_class)
+            document._attributes = attributes
+
+        nodes, lists = [], []
+        for field_name, field in document_class._fields.items():
+            if isinstance(field, ListNode):
+                lists.append((field_name, field))
+            elif isinstance(field, Node):
+                nodes.append((field_name, field))
+
+        count = self.count
+        for field_name, field in nodes:
+            node_budget = (get_min_size(field.type) if lists else
+                           max(budget - 1, 0) // len(nodes))
+            setattr(document, field_name, self.make_document(
+                field.type, node_budget, max(depth - 1, 0)))
+        if not lists:
+            return document
+
+        share = max(budget - 1 - (self.count - count), 0) // len(lists)
+        for field_name, field in lists:
+            item_budget = 0
+            if depth <= 0 or not share:
+                items = 0
+            elif depth > 1 and has_nested(field.type):
+                #: fan out evenly between this level and deeper ones
+                items = max(1, int(round(share ** 0.5)))
+                item_budget = share // items
+            else:
+                item_budget = get_min_size(field.type)
+                items = share // item_budget
+            setattr(document, field_name, [
+                self.make_document(field.type, item_budget, depth - 1)
+                for _ in range(items)
+            ])
+        return document
+
+    def generate(self):
+        """
+        generate document
+
+        :rtype: composite.Document
+        :return: document
+        """
+        self.count = 0
+        return self.make_document(self.document_class, self.nodes,
+                                  self.depth)
+
+
+def generate(document_class, nodes=1000, depth=3, attribute_density=1.0,
+             list_size=5, seed=0):
+    """
+    generate random document, see :py:class:`DocumentGenerator`
+
+    :rtype: composite.Document
+    :return: document
+    """
+    return DocumentGenerator(document_class, nodes, depth, attribute_density,
+                             list_size, seed).generate()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.imports
+    :synopsis: Cold import time of composite entry points, every target is
+        imported in a fresh interpreter (best of ``--repeat`` runs), number
+        of loaded modules and whether lxml is loaded are reported as well:
+
+        ``python -m benchmarks.imports --repeat 10``
+"""
+from __future__ import print_function
+
+import sys
+import json
+import argparse
+import subprocess
+
+#: target name -> import statement
+TARGETS = (
+    ('composite', 'import composite'),
+    ('python', 'from composite.builders import PythonDocumentBuilder'),
+    ('json', 'from composite.builders import JSONDocumentBuilder'),
+    ('expat', 'from composite.builders import ExpatDocumentBuilder'),
+    ('lxml', 'from composite.builders import LXMLDocumentBuilder'),
+    ('batch', 'import composite.batch'),
+)
+
+#: measures import statement in fresh interpreter, prints json
+SCRIPT = '''
+import sys, json, timeit
+modules = len(sys.modules)
+start = timeit.default_timer()
+%s
+seconds = timeit.default_timer() - start
+print(json.dumps({"seconds": seconds, "lxml": "lxml" in sys.modules,
+                  "modules": len(sys.modules) - modules}))
+'''
+
+
+def measure(statement, repeat=5, executable=sys.executable):
+    """
+    measure import statement in fresh interpreters
+
+    :param str statement: import statement
+    :param int repeat: number of runs
+    :param str executable: python interpreter
+    :rtype: dict
+    :return: best ``seconds``, number of loaded ``modules`` and ``lxml``
+        flag
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.check_output([executable, '-c',
+                                          SCRIPT % statement])
+        result = json.loads(output.decode('utf-8'))
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='cold import time')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--targets', nargs='+', default=None,
+                        choices=[name for name, _ in TARGETS])
+    parser.add_argument('--output', help='json results file')
+    args = parser.parse_args()
+
+    results = []
+    print('%-10s %10s %8s %5s' % ('target', 'ms', 'modules', 'lxml'))
+    for name, statement in TARGETS:
+        if args.targets and name not in args.targets:
+            continue
+        result = measure(statement, args.repeat)
+        result.update(target=name, statement=statement)
+        results.append(result)
+        print('%-10s %10.2f %8d %5s' % (name, result['seconds'] * 1000,
+                                        result['modules'],
+                                        'yes' if result['lxml'] else 'no'))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump({'python': sys.version, 'results': results}, output,
+                      indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: benchmarks.suite
+    :synopsis: Parse and build throughput, peak memory and allocations of
+        builders on synthetic documents (see :py:mod:`benchmarks.generator`)
+        at given scales. Every builder is measured in phases:
+
+        - ``load``, serialized source into builder source (``json.loads``,
+          ``lxml.etree.fromstring``)
+        - ``parse``, builder source into document
+        - ``build``, document into builder output
+        - ``dump``, builder output into serialized form
+
+        Peak memory is traced with :py:mod:`tracemalloc` (python 3.4+), so
+        libxml2 allocations are not counted, ``allocated_blocks`` is number
+        of python memory blocks the phase result keeps.
+
+        Results are written as json (``--output``), so runs of different
+        versions could be compared with :py:mod:`benchmarks.compare`.
+
+        ``python -m benchmarks.suite --nodes 1000 100000 --output a.json``
+"""
+from __future__ import print_function
+
+import gc
+import sys
+import json
+import time
+import platform
+import argparse
+import timeit
+
+from lxml import etree
+
+from composite.batch import import_object
+from composite.version import get_version
+from composite.builders import (
+    PythonDocumentBuilder, LXMLDocumentBuilder, ExpatDocumentBuilder,
+    JSONDocumentBuilder, BinaryDocumentBuilder
+)
+
+from benchmarks.generator import DocumentGenerator
+
+try:
+    import tracemalloc
+except ImportError:  #: pragma: no cover, python 2
+    tracemalloc = None
+
+#: results format version
+RESULTS_VERSION = 1
+
+
+def identity(value):
+    return value
+
+
+def dump_json(value):
+    return json.dumps(value).encode('utf-8')
+
+
+#: builder name -> (builder class, load, dump, source builder class),
+#: ``load`` turns serialized source into builder source and ``dump`` turns
+#: builder output into serialized form, sources of parse only builders are
+#: built with source builder class
+TARGETS = {
+    'python': (PythonDocumentBuilder, json.loads, dump_json, None),
+    'lxml': (LXMLDocumentBuilder, etree.fromstring, etree.tostring, None),
+    'expat': (ExpatDocumentBuilder, identity, etree.tostring,
+              LXMLDocumentBuilder),
+    'json': (JSONDocumentBuilder, identity, identity, None),
+    'binary': (BinaryDocumentBuilder, identity, identity, None),
+}
+
+#: builders measured by default
+DEFAULT_TARGETS = ('python', 'lxml')
+
+
+def measure_time(function, repeat):
+    """
+    best wall time of ``repeat`` calls
+
+    :param callable function: function
+    :param int repeat: number of calls
+    :rtype: tuple
+    :return: tuple[seconds, result of the last call]
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = timeit.default_timer()
+        result = function()
+        elapsed = timeit.default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, result
+
+
+def measure_memory(function):
+    """
+    peak traced memory of the call and number of memory blocks its result
+    keeps allocated
+
+    :param callable function: function
+    :rtype: tuple
+    :return: tuple[peak bytes, allocated blocks], ``None`` values if
+        python has no :py:mod:`tracemalloc`
+    """
+    if tracemalloc is None:  #: pragma: no cover
+        return None, None
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        result = function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    gc.collect()
+    allocated = sys.getallocatedblocks() - blocks
+    del result
+    return peak, allocated
+
+
+def run_target(name, document_class, document, nodes, repeat,
+               memory=True):
+    """
+    measure phases of one builder
+
+    :param str name: builder name, see :py:data:`TARGETS`
+    :param type document_class: document class
+    :param composite.Document document: generated document
+    :param int nodes: number of documents in generated tree
+    :param int repeat: number of timed runs of every phase
+    :param bool memory: measure memory as well
+    :rtype: list[dict]
+    :return: phase results
+    """
+    builder_class, load, dump, source_builder_class = TARGETS[name]
+    data = dump(document_class.build(source_builder_class or builder_class,
+                                     document))
+    size = len(data)
+
+    source = load(data)
+    parsed = document_class.parse(builder_class, source)
+    phases = []
+    if load is not identity:
+        phases.append(('load', lambda: load(data)))
+    phases.append(
+        ('parse', lambda: document_class.parse(builder_class, source)))
+    if source_builder_class is None:
+        built = document_class.build(builder_class, parsed)
+        phases.append(
+            ('build', lambda: document_class.build(builder_class, parsed)))
+        if dump is not identity:
+            phases.append(('dump', lambda: dump(built)))
+
+    results = []
+    for phase, function in phases:
+        seconds, _ = measure_time(function, repeat)
+        peak, blocks = measure_memory(function) if memory else (None, None)
+        results.append({
+            'builder': name,
+            'phase': phase,
+            'nodes': nodes,
+            'bytes': size,
+            'seconds': seconds,
+            'nodes_per_second': nodes / seconds if seconds else None,
+            'bytes_per_second': size / seconds if seconds else None,
+            'peak_bytes': peak,
+            'allocated_blocks': blocks,
+        })
+    return results
+
+
+def run(document_class, scales, targets=DEFAULT_TARGETS, depth=3,
+        attribute_density=1.0, repeat=3, memory=True, seed=0,
+        report=None):
+    """
+    run benchmarks
+
+    :param type document_class: document class
+    :param list[int] scales: numbers of documents in generated trees
+    :param list[str] targets: builder names, see :py:data:`TARGETS`
+    :param int depth: max nesting depth
+    :param float attribute_density: share of documents with attributes
+    :param int repeat: number of timed runs of every phase
+    :param bool memory: measure memory as well
+    :param int seed: random seed
+    :param callable report: called with every result once it's measured
+    :rtype: dict
+    :return: results
+    """
+    results = []
+    for scale in scales:
+        generator = DocumentGenerator(document_class, scale, depth,
+                                      attribute_density, seed=seed)
+        document = generator.generate()
+        for name in targets:
+            for result in run_target(name, document_class, document,
+                                     generator.count, repeat, memory):
+                result.update(scale=scale, depth=depth,
+                              attribute_density=attribute_density)
+                if report is not None:
+                    report(result)
+                results.append(result)
+    return {
+        'version': RESULTS_VERSION,
+        'composite': get_version(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'schema': '%s:%s' % (document_class.__module__,
+                             document_class.__name__),
+        'results': results,
+    }
+
+
+def print_result(result):
+    peak = result['peak_bytes']
+    print('%-8s %-6s %10d %10d %10.4f %12.0f %10s' % (
+        result['builder'], result['phase'], result['nodes'], result['bytes'],
+        result['seconds'], result['nodes_per_second'] or 0,
+        '%.1f' % (peak / 1024.0 / 1024) if peak is not None else '-'
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='builders parse/build throughput and memory')
+    parser.add_argument('--schema', default='tests.documents:Users',
+                        help='document class, module:Class')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[1000],
+                        help='numbers of documents in generated trees')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--attribute-density', type=float, default=1.0)
+    parser.add_argument('--builders', nargs='+', default=DEFAULT_TARGETS,
+                        choices=sorted(TARGETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip peak memory and allocations')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='json results file')
+    args = parser.parse_args()
+
+    print('%-8s %-6s %10s %10s %10s %12s %10s' % (
+        'builder', 'phase', 'nodes', 'bytes', 'seconds', 'nodes/s',
+        'peak MiB'))
+    results = run(import_object(args.schema), args.nodes, args.builders,
+                  args.depth, args.attribute_density, args.repeat,
+                  not args.no_memory, args.seed, report=print_result)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,22 @@
+import importlib
+
 from . import fields
-from . import visitors
 from .documents import Document
+from .registry import LAZY_IMPORTS
 from .version import __VERSION__
 
 __all__ = ['Document', '__VERSION__', 'fields', 'visitors']
+
+#: subpackages imported on the first access
+LAZY_SUBPACKAGES = ('builders', 'visitors')
+
+
+def __getattr__(name):
+    if name in LAZY_SUBPACKAGES:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError(
+        "module '%s' has no attribute '%s'" % (__name__, name))
+
+
+if not LAZY_IMPORTS:  #: pragma: no cover
+    from . import visitors  # noqa
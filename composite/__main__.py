@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.__main__
+    :synopsis: Command line batch parse of files into json lines
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+.. code-block:: bash
+
+    python -m composite myapp.documents:Users data/ 'extra/*.xml' \\
+        --workers 8 --output users.jsonl
+"""
+import sys
+import argparse
+
+from . import batch
+from .cache import FileCache
+from .builders import get_builder
+
+
+def get_parser():
+    """
+    get command line arguments parser
+
+    :rtype: argparse.ArgumentParser
+    :return: parser
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m composite',
+        description='Parse xml/json files into documents and write them '
+                    'as json lines'
+    )
+    parser.add_argument('document',
+                        help='document class, package.module:Class')
+    parser.add_argument('paths', nargs='+',
+                        help='files, directories or glob patterns')
+    parser.add_argument('-b', '--builder', default=None,
+                        help='builder: %s, builder class name (including '
+                             'composite.builders entry points) or '
+                             'package.module:Class, chosen by file '
+                             'extension by default' % ', '.join(
+                                 sorted(batch.BUILDERS)))
+    parser.add_argument('-p', '--pattern', default=None,
+                        help='file name pattern for directories')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='number of worker processes')
+    parser.add_argument('-q', '--max-pending', type=int, default=None,
+                        help='max number of files in flight')
+    parser.add_argument('-o', '--output', default=None,
+                        help='output file, stdout by default')
+    parser.add_argument('--only', action='append', default=None,
+                        help='dotted field path to parse')
+    parser.add_argument('--exclude', action='append', default=None,
+                        help='dotted field path to skip')
+    parser.add_argument('-c', '--cache-dir', default=None,
+                        help='on-disk parse cache directory')
+    parser.add_argument('-s', '--skip-errors', action='store_true',
+                        help='skip files failed to parse, they are '
+                             'reported and exit code is 1')
+    return parser
+
+
+def main(argv=None):
+    """
+    run batch parse
+
+    :param list[str] argv: command line arguments
+    :rtype: int
+    :return: exit code
+    """
+    args = get_parser().parse_args(argv)
+    document_class = batch.import_object(args.document)
+    builder_class = None
+    if args.builder:
+        name = batch.BUILDERS.get(args.builder, args.builder)
+        try:
+            builder_class = get_builder(name)
+        except LookupError:
+            builder_class = batch.import_object(name)
+
+    cache = None
+    if args.cache_dir:
+        cache = FileCache(args.cache_dir)
+
+    errors = []
+
+    def on_error(path, error):
+        errors.append(error)
+        if isinstance(error, batch.FileError):
+            description = str(error)
+        else:
+            description = '%s: %s' % (error.__class__.__name__, error)
+        sys.stderr.write('%s: %s\n' % (path, description))
+        if not args.skip_errors:
+            raise error
+
+    target = sys.stdout
+    if args.output:
+        target = open(args.output, 'w')
+    try:
+        count = batch.dump_files(
+            document_class, args.paths, target, builder_class=builder_class,
+            max_workers=args.workers, max_pending=args.max_pending,
+            pattern=args.pattern, only=args.only, exclude=args.exclude,
+            cache=cache, on_error=on_error
+        )
+    except Exception as error:
+        if not errors or error is not errors[-1]:
+            raise
+        sys.stderr.write('stopped, use --skip-errors to skip failed files\n')
+        return 1
+    finally:
+        if target is not sys.stdout:
+            target.close()
+    sys.stderr.write('%d documents written\n' % count)
+    if errors:
+        sys.stderr.write('%d files failed\n' % len(errors))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
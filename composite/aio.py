@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.aio
+    :synopsis: asyncio parse and build of documents, python 3.5.2+ only
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Sources are :py:class:`asyncio.StreamReader` instances (or any object with
+``async read(size)``) or async iterators of bytes chunks. Chunks are pushed
+into builder feed parsers (see
+:py:meth:`composite.documents.Document.feed_parser`) and the event loop is
+released after every chunk, so the loop is blocked for one chunk at most
+instead of the whole payload:
+
+.. code-block:: python
+
+    from composite import aio
+
+    users = await aio.parse(Users, LXMLDocumentBuilder, reader)
+
+    async for user in aio.iterparse(Users, LXMLDocumentBuilder, reader,
+                                    field='users'):
+        await store(user)
+
+    await aio.write(LXMLDocumentBuilder, users, writer, 'Users')
+"""
+import asyncio
+
+#: size of chunks read from stream readers
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkReader(object):
+    """
+    Reads bytes chunks from stream reader or async iterator
+    """
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        """
+        initiate reader
+
+        :param source: :py:class:`asyncio.StreamReader` or async iterator
+            of bytes chunks
+        :param int chunk_size: stream reader chunk size
+        """
+        self.chunk_size = chunk_size
+        if hasattr(source, 'read'):
+            self.stream = source
+            self.iterator = None
+        else:
+            self.stream = None
+            self.iterator = source.__aiter__()
+
+    async def read(self):
+        """
+        read next chunk
+
+        :rtype: bytes
+        :return: chunk, empty one at the end of source
+        """
+        if self.stream is not None:
+            return await self.stream.read(self.chunk_size)
+        while True:
+            try:
+                chunk = await self.iterator.__anext__()
+            except StopAsyncIteration:
+                return b''
+            if chunk:
+                return chunk
+
+
+class AsyncItems(object):
+    """
+    Async iterator of document list field items, source is read and fed to
+    the feed parser only when no parsed items are left. Parsed document
+    (without streamed items) is available as ``document`` once iteration
+    is over.
+    """
+    def __init__(self, parser, reader):
+        """
+        initiate iterator
+
+        :param composite.builders.base.BaseFeedParser parser: feed parser
+        :param ChunkReader reader: chunk reader
+        """
+        self.parser = parser
+        self.reader = reader
+        self.document = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        items = self.parser.items
+        while not items:
+            if self.document is not None:
+                raise StopAsyncIteration
+            chunk = await self.reader.read()
+            if chunk:
+                self.parser.feed(chunk)
+                await asyncio.sleep(0)
+            else:
+                self.document = self.parser.close()
+        return items.popleft()
+
+
+async def parse(document_class, builder_class, source, only=None,
+                exclude=None, chunk_size=CHUNK_SIZE):
+    """
+    parse document from async source
+
+    :param type document_class: document class
+    :param builder_class: builder class with feed parser
+        (:py:class:`composite.builders.LXMLDocumentBuilder`,
+        :py:class:`composite.builders.ExpatDocumentBuilder`)
+    :param source: :py:class:`asyncio.StreamReader` or async iterator of
+        bytes chunks
+    :param list[str] only: dotted field paths to parse
+    :param list[str] exclude: dotted field paths to skip
+    :param int chunk_size: stream reader chunk size
+    :rtype: composite.Document
+    :return: document instance
+    """
+    parser = document_class.feed_parser(builder_class, only=only,
+                                        exclude=exclude)
+    reader = ChunkReader(source, chunk_size)
+    while True:
+        chunk = await reader.read()
+        if not chunk:
+            return parser.close()
+        parser.feed(chunk)
+        await asyncio.sleep(0)
+
+
+def iterparse(document_class, builder_class, source, field, only=None,
+              exclude=None, chunk_size=CHUNK_SIZE):
+    """
+    iterate asynchronously through parsed items of document list ``field``
+
+    :param type document_class: document class
+    :param builder_class: builder class with feed parser
+    :param source: :py:class:`asyncio.StreamReader` or async iterator of
+        bytes chunks
+    :param str field: list field name
+    :param list[str] only: dotted field paths to parse
+    :param list[str] exclude: dotted field paths to skip
+    :param int chunk_size: stream reader chunk size
+    :rtype: AsyncItems
+    :return: async iterator of parsed items
+    """
+    parser = document_class.feed_parser(builder_class, field=field,
+                                        only=only, exclude=exclude)
+    return AsyncItems(parser, ChunkReader(source, chunk_size))
+
+
+async def write(builder_class, document, writer, node_name='Document'):
+    """
+    build document incrementally into :py:class:`asyncio.StreamWriter`
+    (any object with ``write`` and ``async drain`` methods), writer is
+    drained after every chunk so slow peers apply backpressure
+
+    :param builder_class: builder class with ``iterwrite`` support
+        (:py:class:`composite.builders.LXMLDocumentBuilder`)
+    :param composite.Document document: document instance
+    :param writer: stream writer
+    :param str node_name: document node name
+    :rtype: None
+    :return: None
+    """
+    for chunk in builder_class(document).iterwrite(node_name):
+        if chunk:
+            writer.write(chunk)
+            await writer.drain()
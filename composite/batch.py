@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.batch
+    :synopsis: Parallel parse of many files with bounded memory
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Files are parsed in worker processes, at most ``max_pending`` files are in
+flight at once, so memory is bounded no matter how many files are given.
+Results are streamed in input order:
+
+.. code-block:: python
+
+    from composite import batch
+
+    for path, users in batch.parse_files(Users, ['data/'], max_workers=8):
+        store(users)
+
+    with open('users.jsonl', 'w') as target:
+        batch.dump_files(Users, ['data/*.xml'], target)
+
+The same is available from the command line, see ``python -m composite -h``.
+"""
+import os
+import glob
+import json
+import fnmatch
+import importlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .builders import PythonDocumentBuilder, get_builder
+from .plans import StatePlan, get_plan
+
+#: builder names -> builder class names, builders are imported on demand
+#: (see :py:func:`composite.builders.get_builder`)
+BUILDERS = {
+    'xml': 'LXMLDocumentBuilder',
+    'expat': 'ExpatDocumentBuilder',
+    'json': 'PythonDocumentBuilder',
+}
+
+#: file extension -> builder class name, files of other extensions are
+#: skipped while walking directories
+EXTENSIONS = {
+    '.xml': 'LXMLDocumentBuilder',
+    '.json': 'PythonDocumentBuilder',
+}
+
+#: glob pattern special characters
+GLOB_CHARACTERS = '*?['
+
+
+class FileError(Exception):
+    """
+    File parse failed in worker process. Original exceptions are not sent
+    back from workers, some of them could not be pickled (lxml ones for
+    example), their class name and message are kept instead.
+    """
+    def __init__(self, path, error_class, message):
+        """
+        initiate error
+
+        :param str path: file path
+        :param str error_class: original exception class name
+        :param str message: original exception message
+        """
+        super(FileError, self).__init__(path, error_class, message)
+        self.path = path
+        self.error_class = error_class
+        self.message = message
+
+    def __str__(self):
+        return '%s: %s' % (self.error_class, self.message)
+
+
+def import_object(path):
+    """
+    import object by its path, ``package.module:Name`` or
+    ``package.module.Name``
+
+    :param str path: object path
+    :rtype: any
+    :return: object
+    """
+    if ':' in path:
+        module_name, name = path.split(':', 1)
+    else:
+        module_name, _, name = path.rpartition('.')
+    obj = importlib.import_module(module_name)
+    for attribute in name.split('.'):
+        obj = getattr(obj, attribute)
+    return obj
+
+
+def get_builder_class(path, builder_class=None):
+    """
+    get builder class for file
+
+    :param str path: file path
+    :param builder_class: builder class, it's chosen by file extension if
+        not given
+    :rtype: type
+    :return: builder class
+    :raises ValueError:
+        - if file extension is unknown
+    """
+    if builder_class is not None:
+        return builder_class
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError("No builder for `%s` files" % path)
+    return get_builder(EXTENSIONS[extension])
+
+
+def iter_files(paths, pattern=None):
+    """
+    iterate through files of paths: directories are walked recursively
+    (for files matching ``pattern`` or of known extensions), glob patterns
+    are expanded
+
+    :param list[str] paths: files, directories and glob patterns
+    :param str pattern: file name pattern for directories
+    :rtype: generator
+    :return: file paths
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file_name in sorted(files):
+                    if pattern is not None:
+                        if not fnmatch.fnmatch(file_name, pattern):
+                            continue
+                    elif os.path.splitext(file_name)[1].lower() not in (
+                            EXTENSIONS):
+                        continue
+                    yield os.path.join(root, file_name)
+        elif any(character in path for character in GLOB_CHARACTERS):
+            for file_path in sorted(glob.glob(path)):
+                if os.path.isfile(file_path):
+                    yield file_path
+        else:
+            yield path
+
+
+def load_document(document_class, builder_class, path, options, cache=None):
+    """
+    parse file
+
+    :param type document_class: document class
+    :param builder_class: builder class
+    :param str path: file path
+    :param dict options: parse options
+    :param composite.cache.FileCache cache: on-disk parse cache
+    :rtype: composite.Document
+    :return: document instance
+    """
+    builder_class = get_builder_class(path, builder_class)
+    if cache is not None:
+        return cache.parse(document_class, builder_class, path, **options)
+    return document_class.parse(builder_class,
+                                builder_class.load_file(path), **options)
+
+
+def parse_file(document_class, builder_class, path, options, cache=None):
+    """
+    parse file in worker process
+
+    :param type document_class: document class
+    :param builder_class: builder class
+    :param str path: file path
+    :param dict options: parse options
+    :param composite.cache.FileCache cache: on-disk parse cache
+    :rtype: tuple
+    :return: document state, see :py:class:`composite.plans.StatePlan`
+    :raises FileError:
+        - if file could not be parsed
+    """
+    try:
+        document = load_document(document_class, builder_class, path,
+                                 options, cache)
+        return get_plan(StatePlan, document_class).dump(document)
+    except Exception as error:
+        raise FileError(path, error.__class__.__name__, str(error))
+
+
+def build_file(document_class, builder_class, path, options, cache=None):
+    """
+    parse file in worker process and build it into json line
+
+    :param type document_class: document class
+    :param builder_class: builder class
+    :param str path: file path
+    :param dict options: parse options
+    :param composite.cache.FileCache cache: on-disk parse cache
+    :rtype: str
+    :return: json line
+    :raises FileError:
+        - if file could not be parsed or built
+    """
+    try:
+        document = load_document(document_class, builder_class, path,
+                                 options, cache)
+        return json.dumps({
+            'path': path,
+            'document': document_class.build(PythonDocumentBuilder, document)
+        }) + '\n'
+    except Exception as error:
+        raise FileError(path, error.__class__.__name__, str(error))
+
+
+def pop_result(pending, on_error=None):
+    """
+    wait for the first pending call
+
+    :param collections.deque pending: tuple[arguments, future] pairs
+    :param callable on_error: called with arguments and exception of
+        failed call, exceptions are raised if it's not given
+    :rtype: tuple | None
+    :return: tuple[arguments, result], ``None`` for handled failed call
+    """
+    arguments, future = pending.popleft()
+    if on_error is None:
+        return arguments, future.result()
+    try:
+        return arguments, future.result()
+    except Exception as error:
+        on_error(arguments, error)
+        return None
+
+
+def imap(executor, function, args, max_pending, on_error=None):
+    """
+    map function over arguments in executor keeping at most
+    ``max_pending`` calls in flight, results are yielded in order
+
+    :param concurrent.futures.Executor executor: executor
+    :param callable function: function
+    :param args: function arguments iterable
+    :param int max_pending: max number of calls in flight
+    :param callable on_error: called with arguments and exception of
+        failed call, such calls are skipped, exceptions are raised if it's
+        not given
+    :rtype: generator
+    :return: tuple[arguments, result]
+    """
+    pending = deque()
+    for arguments in args:
+        if len(pending) >= max_pending:
+            result = pop_result(pending, on_error)
+            if result is not None:
+                yield result
+        pending.append((arguments, executor.submit(function, *arguments)))
+    while pending:
+        result = pop_result(pending, on_error)
+        if result is not None:
+            yield result
+
+
+def map_files(function, document_class, paths, builder_class=None,
+              executor=None, max_workers=None, max_pending=None,
+              pattern=None, cache=None, on_error=None, **options):
+    """
+    map worker function over files, see :py:func:`parse_files`
+
+    :rtype: generator
+    :return: tuple[file path, result]
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers) as executor:
+            for result in map_files(function, document_class, paths,
+                                    builder_class, executor, max_workers,
+                                    max_pending, pattern, cache, on_error,
+                                    **options):
+                yield result
+        return
+
+    if max_pending is None:
+        max_pending = 2 * (max_workers or multiprocessing.cpu_count())
+    options = document_class.get_parse_options(**options)
+    args = (
+        (document_class, builder_class, path, options, cache)
+        for path in iter_files(paths, pattern)
+    )
+    handle_error = None
+    if on_error is not None:
+        handle_error = (lambda arguments, error:
+                        on_error(arguments[2], error))
+    for arguments, result in imap(executor, function, args, max_pending,
+                                  handle_error):
+        yield arguments[2], result
+
+
+def parse_files(document_class, paths, builder_class=None, executor=None,
+                max_workers=None, max_pending=None, pattern=None,
+                only=None, exclude=None, cache=None, on_error=None):
+    """
+    parse files in process pool
+
+    :param type document_class: document class
+    :param list[str] paths: files, directories and glob patterns
+    :param builder_class: builder class, it's chosen by file extension
+        (see :py:data:`EXTENSIONS`) if not given
+    :param concurrent.futures.Executor executor: executor to use, new
+        :py:class:`concurrent.futures.ProcessPoolExecutor` is started if
+        it's not given
+    :param int max_workers: number of worker processes of new executor
+    :param int max_pending: max number of files in flight, twice the
+        number of workers by default
+    :param str pattern: file name pattern for directories
+    :param list[str] only: dotted field paths to parse
+    :param list[str] exclude: dotted field paths to skip
+    :param composite.cache.FileCache cache: on-disk parse cache, cached
+        files are restored in workers without parsing
+    :param callable on_error: called with path and exception (it's
+        :py:class:`FileError` for files failed in workers) of every file
+        failed to parse, such files are skipped and the rest are parsed,
+        the first exception is raised if it's not given
+    :rtype: generator
+    :return: tuple[file path, document]
+    """
+    load = get_plan(StatePlan, document_class).load
+    for path, state in map_files(parse_file, document_class, paths,
+                                 builder_class, executor, max_workers,
+                                 max_pending, pattern, cache, on_error,
+                                 only=only, exclude=exclude):
+        yield path, load(state)
+
+
+def dump_files(document_class, paths, target, builder_class=None,
+               executor=None, max_workers=None, max_pending=None,
+               pattern=None, only=None, exclude=None, cache=None,
+               on_error=None):
+    """
+    parse files in process pool and write them into ``target`` as json
+    lines: ``{"path": "...", "document": {...}}``, documents are built
+    with :py:class:`composite.builders.PythonDocumentBuilder` in workers.
+    Other parameters are the same as :py:func:`parse_files` ones.
+
+    :param target: text file object
+    :rtype: int
+    :return: number of written documents
+    """
+    count = 0
+    for _, line in map_files(build_file, document_class, paths,
+                             builder_class, executor, max_workers,
+                             max_pending, pattern, cache, on_error,
+                             only=only, exclude=exclude):
+        target.write(line)
+        count += 1
+    return count
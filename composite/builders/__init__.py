@@ -1,6 +1,50 @@
-from .base import BaseDocumentBuilder
-from .xml import LXMLDocumentBuilder
-from .python import PythonDocumentBuilder
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.builders
+    :synopsis: Builders, they are imported on the first access, so
+        :py:class:`PythonDocumentBuilder` users never import lxml
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+"""
+from ..registry import Registry, LAZY_IMPORTS
 
-__all__ = ['BaseDocumentBuilder', 'LXMLDocumentBuilder',
-           'PythonDocumentBuilder']
+#: entry points group of third party builders
+ENTRY_POINTS_GROUP = 'composite.builders'
+
+registry = Registry(__name__, [
+    ('BaseDocumentBuilder', '.base'),
+    ('LXMLDocumentBuilder', '.xml'),
+    ('PythonDocumentBuilder', '.python'),
+    ('ExpatDocumentBuilder', '.expat'),
+    ('BinaryDocumentBuilder', '.binary'),
+    ('JSONDocumentBuilder', '.jsontext'),
+], entry_points_group=ENTRY_POINTS_GROUP)
+
+__all__ = registry.names
+
+
+def get_builder(name):
+    """
+    get builder class by its name, builtin builders and third party ones
+    registered in ``composite.builders`` entry points group
+
+    :param str name: builder class name or entry point name
+    :rtype: type
+    :return: builder class
+    :raises LookupError:
+        - if there's no such builder
+    """
+    return registry.get(name)
+
+
+def __getattr__(name):
+    return registry.load(name)
+
+
+def __dir__():
+    return registry.dir(globals())
+
+
+if not LAZY_IMPORTS:  #: pragma: no cover
+    registry.load_all()
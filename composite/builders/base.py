@@ -6,7 +6,112 @@
 .. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
+from collections import deque
+
 from ..const import ATTRIBUTES_META_CLASS
+from ..fields import ListNode, ListField
+from ..plans import get_child_options
+from ..exceptions import ImproperlyConfigured
+
+
+class BaseFeedParser(object):
+    """
+    Base push (feed) parser, source data is fed by chunks as soon as they
+    arrive and the document is filled incrementally:
+
+    .. code-block:: python
+
+        parser = Users.feed_parser(LXMLDocumentBuilder, field='users')
+        for chunk in chunks:
+            parser.feed(chunk)
+            for user in parser.read_items():
+                process(user)
+        users = parser.close()
+
+    Items of list ``field`` are not stored in the document, they are queued
+    once their nodes end and returned by :py:meth:`read_items`, so memory
+    is bounded by item size rather than payload size.
+    """
+    def __init__(self, document_class, builder_class, field=None, **options):
+        """
+        initiate feed parser
+
+        :param type document_class: document class
+        :param builder_class: builder class
+        :param str field: list field name (:py:class:`ListNode` or
+            :py:class:`ListField`) whose items are queued for
+            :py:meth:`read_items`
+        :param options: parse plan options, see
+            :py:class:`composite.plans.ParsePlan`
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if field is not a list node or list field
+            - if lazy parse is requested, raw nodes are dropped once
+              processed
+        """
+        if options.get('lazy'):
+            raise ImproperlyConfigured(
+                "`%s` does not support lazy parse" % self.__class__.__name__
+            )
+        self.document = document_class.blank()
+        self.builder_class = builder_class
+        self.options = options
+        self.plan = document_class.get_parse_plan(builder_class, **options)
+        self.field = None
+        self.items = deque()
+        if field is not None:
+            item = document_class._fields.get(field)
+            if not isinstance(item, (ListNode, ListField)):
+                raise ImproperlyConfigured(
+                    "`%s` should be `ListNode` or `ListField` field of "
+                    "`%s`" % (field, document_class.__name__)
+                )
+            self.field = item
+
+    def get_item_plan(self):
+        """
+        get parse plan of ``field`` items
+
+        :rtype: composite.plans.ParsePlan
+        :return: parse plan
+        """
+        field = self.field
+        field_name = self.document._fields_mapping[field.name]
+        options = get_child_options(self.options, field_name)
+        return field.type.get_parse_plan(self.builder_class, **options)
+
+    def read_items(self):
+        """
+        get ``field`` items completed so far, every item is returned once
+
+        :rtype: generator
+        :return: parsed items
+        """
+        items = self.items
+        while items:
+            yield items.popleft()
+
+    def feed(self, data):
+        """
+        feed source chunk
+
+        :param bytes data: source chunk
+        :rtype: None
+        :return: None
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        finish parse
+
+        :rtype: composite.Document
+        :return: document instance
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
 
 
 class BaseDocumentBuilder(object):
@@ -15,6 +120,16 @@ class BaseDocumentBuilder(object):
     """
     parse_visitor_class = None
     build_visitor_class = None
+    #: parse compiler class, builds compiled parse plans
+    #: (:py:class:`composite.plans.ParsePlan`), set it to ``None`` to
+    #: parse documents with ``parse_visitor_class`` visitors instead
+    parse_compiler_class = None
+    #: build compiler class, builds compiled build plans
+    #: (:py:class:`composite.plans.BuildPlan`), set it to ``None`` to
+    #: build documents with ``build_visitor_class`` visitors instead
+    build_compiler_class = None
+    #: feed parser class, see :py:meth:`feed_parser`
+    feed_parser_class = None
 
     def __init__(self, document):
         """
@@ -25,6 +140,23 @@ class BaseDocumentBuilder(object):
         :return: None
         """
         self.document = document
+        #: parse visitor reused for nested documents, see :py:meth:`bind`
+        self.parse_visitor = None
+
+    def bind(self, document):
+        """
+        rebind builder (and its parse visitor) to another document, so the
+        same builder could parse nested documents
+
+        :param composite.documents.Document document: document
+        :rtype: composite.documents.Document
+        :return: previously bound document
+        """
+        previous = self.document
+        self.document = document
+        if self.parse_visitor is not None:
+            self.parse_visitor.composite = document
+        return previous
 
     def get_parse_visitor_class(self):
         """
@@ -43,7 +175,30 @@ class BaseDocumentBuilder(object):
         :return: parse visitor class
         """
         parser_class = self.__class__
-        return self.get_parse_visitor_class()(parser_class, self.document)
+        return self.get_parse_visitor_class()(parser_class, self.document,
+                                              builder=self)
+
+    def get_parse_compiler_class(self):
+        """
+        get parse compiler class
+
+        :rtype: type
+        :return: parse compiler class
+        """
+        return self.parse_compiler_class
+
+    def get_parse_compiler(self, document_class, **options):
+        """
+        get parse compiler
+
+        :param type document_class: document class to compile
+        :param options: parse plan options
+        :rtype: composite.visitors.ParseCompiler
+        :return: parse compiler
+        """
+        builder_class = self.__class__
+        return self.get_parse_compiler_class()(builder_class, document_class,
+                                               **options)
 
     def get_build_visitor_class(self):
         """
@@ -64,6 +219,26 @@ class BaseDocumentBuilder(object):
         builder_class = self.__class__
         return self.get_build_visitor_class()(builder_class, document)
 
+    def get_build_compiler_class(self):
+        """
+        get build compiler class
+
+        :rtype: type
+        :return: build compiler class
+        """
+        return self.build_compiler_class
+
+    def get_build_compiler(self, document_class):
+        """
+        get build compiler
+
+        :param type document_class: document class to compile
+        :rtype: composite.visitors.BuildCompiler
+        :return: build compiler
+        """
+        builder_class = self.__class__
+        return self.get_build_compiler_class()(builder_class, document_class)
+
     def get_document_fields(self):
         """
         get document fields
@@ -143,25 +318,156 @@ class BaseDocumentBuilder(object):
         """
         raise NotImplemented
 
-    def parse(self, source):
+    @classmethod
+    def dump_source(cls, source):
+        """
+        dump source data into bytes, equal sources give equal bytes
+
+        :param source: source data
+        :rtype: bytes
+        :return: dumped source
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def load_file(cls, path):
+        """
+        load source data from file
+
+        :param str path: file path
+        :return: source data to parse
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def load_data(cls, data):
+        """
+        load source data from file content, the same as
+        :py:meth:`load_file` does for file of ``data`` content
+
+        :param bytes data: file content
+        :return: source data to parse
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def iterate_list_node(cls, raw_node):
+        """
+        iterate through items of raw ``ListNode`` node, as list node
+        setter gets it
+
+        :param raw_node: raw list node
+        :rtype: collections.Iterable
+        :return: raw item nodes
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def dump_nodes(cls, nodes):
+        """
+        dump raw source nodes into picklable form, so they could be
+        transferred to worker processes
+
+        :param list nodes: raw source nodes
+        :rtype: any
+        :return: picklable nodes
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def load_nodes(cls, data):
+        """
+        load raw source nodes dumped with :py:meth:`dump_nodes`
+
+        :param data: dumped nodes
+        :rtype: collections.Iterable
+        :return: raw source nodes
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def iterparse(cls, document_class, source, field):
+        """
+        iterate through source items of document list field without loading
+        the whole source into memory
+
+        :param type document_class: document class
+        :param source: source file name or file object
+        :param str field: document list field name
+            (:py:class:`composite.fields.ListNode` or
+            :py:class:`composite.fields.ListField`)
+        :rtype: generator
+        :return: parsed list field items
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def feed_parser(cls, document_class, field=None, **options):
+        """
+        get push parser of ``document_class`` documents fed by chunks
+
+        :param type document_class: document class
+        :param str field: list field name whose items are queued
+        :param options: parse plan options
+        :rtype: BaseFeedParser
+        :return: feed parser
+        :raises NotImplementedError:
+            - if builder has no feed parser
+        """
+        if cls.feed_parser_class is None:
+            raise NotImplementedError(
+                "`%s` has no feed parser" % cls.__name__
+            )
+        return cls.feed_parser_class(document_class, cls, field, **options)
+
+    def parse(self, source, **options):
         """
         parse source data with any format to final document
 
         :param source: source data (:py:class:`dict`,
             :py:class:`lxml.etree.Element` element, etc)
+        :param options: parse plan options, see
+            :py:class:`composite.plans.ParsePlan`
         :rtype: composite.Document
         :return: document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if options are given to builder without parse compiler
         """
         document = self.document
+        if self.get_parse_compiler_class() is not None:
+            plan = document.get_parse_plan(self.__class__, **options)
+            return plan.fill(document, source)
+        if options:
+            raise ImproperlyConfigured(
+                "`%s` has no parse compiler, parse options are not "
+                "supported" % self.__class__.__name__
+            )
+
         fields_mapping = self.get_document_fields_mapping()
         fields = self.get_document_fields()
-        visitor = self.get_parse_visitor()
+        visitor = self.parse_visitor
+        if visitor is None:
+            visitor = self.parse_visitor = self.get_parse_visitor()
 
         # #: parse attributes first
         attribute_class = self.get_attribute_class()
         if attribute_class:
             attrs_source = self.build_attributes(source)
-            new_attrs = attribute_class.parse(self.__class__, attrs_source)
+            new_attrs = self.parse_nested(attribute_class, attrs_source)
             setattr(document, '_attributes', new_attrs)
 
         #: parse nodes
@@ -173,6 +479,53 @@ class BaseDocumentBuilder(object):
             field.visit(visitor, node)
         return self.document
 
+    def parse_nested(self, document_class, source):
+        """
+        parse nested document with the same builder and parse visitor
+        temporary bound to the new document, so one parse allocates O(1)
+        builders and visitors instead of O(nodes)
+
+        :param type document_class: nested document class
+        :param source: nested document source data
+        :rtype: composite.Document
+        :return: nested document instance
+        """
+        document = document_class.blank()
+        previous = self.bind(document)
+        try:
+            self.parse(source)
+        finally:
+            self.bind(previous)
+        return document
+
+    def iterwrite(self, node_name='document'):
+        """
+        build document incrementally
+
+        :param str node_name: name of the node
+        :rtype: generator
+        :return: serialized document chunks (:py:class:`bytes`)
+        :raises NotImplementedError:
+            - should be implemented in children classes
+        """
+        raise NotImplementedError
+
+    def write(self, target, node_name='document'):
+        """
+        build document incrementally into the target writing every chunk as
+        soon as it's built
+
+        :param target: file name or binary file object
+        :param str node_name: name of the node
+        :rtype: None
+        :return: None
+        """
+        if not hasattr(target, 'write'):
+            with open(target, 'wb') as target_file:
+                return self.write(target_file, node_name)
+        for chunk in self.iterwrite(node_name):
+            target.write(chunk)
+
     def build(self, node_name='document'):
         """
         build instance from python object (document)
@@ -182,6 +535,10 @@ class BaseDocumentBuilder(object):
         :return: built instance
         """
         document = self.document
+        if self.get_build_compiler_class() is not None:
+            plan = document.get_build_plan(self.__class__)
+            return plan.build(document, node_name)
+
         source_object = self.build_object(node_name)
 
         visitor = self.get_build_visitor(source_object)
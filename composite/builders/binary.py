@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.builers.binary
+    :synopsis: Compact schema-driven binary builder
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Documents are encoded without field names, fields follow each other in
+order of sorted document attribute names:
+
+- integers, zigzag varints
+- floats, little-endian doubles
+- booleans, one byte
+- strings and bytes, varint length prefixed (strings in utf-8), values of
+  other field types are encoded as their text
+- lists, varint length and items, arrays are stored as item size, varint
+  length and raw little-endian items
+- nodes, nested documents inline
+- attributes, one byte presence flag and attribute fields
+
+Both sides should use the same document schema. Values are converted
+with field types before encoding, as other builders do.
+"""
+import sys
+import struct
+from array import array
+
+import six
+
+from .base import BaseDocumentBuilder
+from ..columns import Columns
+from ..const import ATTRIBUTES_META_CLASS
+from ..exceptions import ImproperlyConfigured
+from ..plans import get_plan
+from ..visitors import FieldVisitor
+
+#: arrays are stored in little-endian byte order
+_SWAP = sys.byteorder != 'little'
+_DOUBLE = struct.Struct('<d')
+#: python 2 arrays have no ``tobytes`` and ``frombytes``
+_array_tobytes = getattr(array, 'tobytes', None) or array.tostring
+_array_frombytes = getattr(array, 'frombytes', None) or array.fromstring
+#: integer typecodes by signedness and item size, native sizes vary between
+#: platforms (``l`` is 4 bytes on windows and 8 bytes on linux)
+_INT_TYPECODES = {}
+for _typecode in reversed('bBhHiIlLqQ'):
+    try:
+        _INT_TYPECODES[_typecode.isupper(), array(_typecode).itemsize] = (
+            _typecode)
+    except ValueError:
+        #: no ``q`` typecode before python 3.3
+        pass
+
+
+def check_end(data, end):
+    """
+    check if data is not truncated before ``end``
+
+    :param bytearray data: input buffer
+    :param int end: value end offset
+    :rtype: None
+    :return: None
+    :raises ValueError:
+        - if data is truncated
+    """
+    if end > len(data):
+        raise ValueError(
+            "Truncated data, %d bytes expected, %d given" % (end, len(data)))
+
+
+def encode_varint(out, value):
+    """
+    encode unsigned integer as varint
+
+    :param bytearray out: output buffer
+    :param int value: value
+    :rtype: None
+    :return: None
+    """
+    while value > 0x7f:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """
+    decode unsigned varint
+
+    :param bytearray data: input buffer
+    :param int offset: value offset
+    :rtype: tuple
+    :return: tuple[value, next offset]
+    """
+    byte = data[offset]
+    if byte < 0x80:
+        return byte, offset + 1
+    value, shift = 0, 0
+    while byte & 0x80:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        offset += 1
+        byte = data[offset]
+    return value | (byte << shift), offset + 1
+
+
+def encode_int(out, value):
+    encode_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def decode_int(data, offset):
+    value, offset = decode_varint(data, offset)
+    return (-((value + 1) >> 1) if value & 1 else value >> 1), offset
+
+
+def encode_float(out, value):
+    out += _DOUBLE.pack(value)
+
+
+def decode_float(data, offset):
+    return _DOUBLE.unpack_from(data, offset)[0], offset + 8
+
+
+def encode_bool(out, value):
+    out.append(1 if value else 0)
+
+
+def decode_bool(data, offset):
+    return data[offset] != 0, offset + 1
+
+
+def encode_bytes(out, value):
+    encode_varint(out, len(value))
+    out += value
+
+
+def decode_bytes(data, offset):
+    size, offset = decode_varint(data, offset)
+    end = offset + size
+    check_end(data, end)
+    return bytes(data[offset:end]), end
+
+
+def encode_text(out, value):
+    encode_bytes(out, value.encode('utf-8'))
+
+
+def decode_text(data, offset):
+    size, offset = decode_varint(data, offset)
+    end = offset + size
+    check_end(data, end)
+    return data[offset:end].decode('utf-8'), end
+
+
+def coerced(encode, typ):
+    """
+    get encode function converting values with field type first
+
+    :param callable encode: encode function
+    :param type typ: field type
+    :rtype: callable
+    :return: encode function
+    """
+    def encode_value(out, value):
+        encode(out, typ(value))
+    return encode_value
+
+
+def get_scalar_codec(typ):
+    """
+    get encode and decode functions for values of field type
+
+    :param type typ: field type
+    :rtype: tuple
+    :return: tuple[encode, decode]
+    """
+    if typ is bool:
+        return coerced(encode_bool, typ), decode_bool
+    if typ in six.integer_types:
+        return coerced(encode_int, typ), decode_int
+    if typ is float:
+        return coerced(encode_float, typ), decode_float
+    if typ is six.text_type:
+        return coerced(encode_text, typ), decode_text
+    if typ is bytes:
+        return coerced(encode_bytes, typ), decode_bytes
+
+    def encode(out, value):
+        encode_text(out, six.text_type(typ(value)))
+
+    def decode(data, offset):
+        value, offset = decode_text(data, offset)
+        return typ(value), offset
+    return encode, decode
+
+
+def get_list_codec(encode_item, decode_item):
+    """
+    get encode and decode functions of lists
+
+    :param callable encode_item: item encode function
+    :param callable decode_item: item decode function
+    :rtype: tuple
+    :return: tuple[encode, decode]
+    """
+    def encode(out, value):
+        encode_varint(out, len(value))
+        for item in value:
+            encode_item(out, item)
+
+    def decode(data, offset):
+        size, offset = decode_varint(data, offset)
+        items = []
+        append = items.append
+        for _ in range(size):
+            item, offset = decode_item(data, offset)
+            append(item)
+        return items, offset
+    return encode, decode
+
+
+def get_array_codec(typecode):
+    """
+    get encode and decode functions of arrays, item size is encoded, so
+    arrays of typecodes with platform dependent size are decoded on any
+    platform (if values fit)
+
+    :param str typecode: array typecode
+    :rtype: tuple
+    :return: tuple[encode, decode]
+    """
+    itemsize = array(typecode).itemsize
+    unsigned = typecode.isupper()
+
+    def encode(out, value):
+        if not isinstance(value, array) or value.typecode != typecode:
+            value = array(typecode, value)
+        if _SWAP:
+            value = array(typecode, value)
+            value.byteswap()
+        out.append(itemsize)
+        encode_varint(out, len(value))
+        out += _array_tobytes(value)
+
+    def decode(data, offset):
+        check_end(data, offset + 1)
+        size = data[offset]
+        count, offset = decode_varint(data, offset + 1)
+        end = offset + count * size
+        check_end(data, end)
+        if size == itemsize:
+            value = array(typecode)
+        elif typecode in 'fd' or (unsigned, size) not in _INT_TYPECODES:
+            raise ValueError("Array item size %d is not supported for "
+                             "`%s` typecode" % (size, typecode))
+        else:
+            value = array(_INT_TYPECODES[unsigned, size])
+        _array_frombytes(value, bytes(data[offset:end]))
+        if _SWAP:
+            value.byteswap()
+        if size != itemsize:
+            try:
+                value = array(typecode, value)
+            except OverflowError as error:
+                raise ValueError("Array values do not fit `%s` typecode: "
+                                 "%s" % (typecode, error))
+        return value, end
+    return encode, decode
+
+
+class BinaryCompiler(FieldVisitor):
+    """
+    Binary codec compiler. Visits fields of ``composite`` document class and
+    returns ``(encode, decode)`` function pairs: ``encode(out, value)``
+    appends encoded value to ``bytearray`` buffer and
+    ``decode(data, offset)`` returns ``(value, next offset)``.
+    """
+    def get_node_plan(self, node):
+        """
+        get binary plan of node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: BinaryPlan
+        :return: binary plan
+        """
+        return get_plan(BinaryPlan, node.type, self.builder_class)
+
+    def visit_field(self, field, name):
+        return get_scalar_codec(field.type)
+
+    def visit_attribute_field(self, field, name):
+        return get_scalar_codec(field.type)
+
+    def visit_list_field(self, field, name):
+        return get_list_codec(*get_scalar_codec(field.type))
+
+    def visit_array_field(self, field, name):
+        return get_array_codec(field.typecode)
+
+    def visit_node(self, node, name):
+        plan = self.get_node_plan(node)
+        return plan.encode, plan.decode
+
+    def visit_list_node(self, node, name):
+        plan = self.get_node_plan(node)
+        return get_list_codec(plan.encode, plan.decode)
+
+    def visit_column_list_node(self, node, name):
+        factory = node.factory
+        fields = node.type._fields
+        #: (column index, codec) in order of sorted field names
+        codecs = []
+        for index, field_name in sorted(enumerate(fields),
+                                        key=lambda item: item[1]):
+            typecode = node.typecodes.get(field_name)
+            if typecode:
+                codec = get_array_codec(typecode)
+            else:
+                codec = get_list_codec(
+                    *get_scalar_codec(fields[field_name].type))
+            codecs.append((index, codec))
+
+        def encode(out, value):
+            if not isinstance(value, Columns):
+                columns = factory()
+                columns.extend(value)
+                value = columns
+            for index, (encode_column, _) in codecs:
+                encode_column(out, value.columns[index])
+
+        def decode(data, offset):
+            value = factory()
+            columns = list(value.columns)
+            for index, (_, decode_column) in codecs:
+                columns[index], offset = decode_column(data, offset)
+            value.columns = tuple(columns)
+            return value, offset
+        return encode, decode
+
+
+class BinaryPlan(object):
+    """
+    Binary plan compiled once per (document class, builder class) pair, it
+    keeps field codecs in order of sorted document attribute names.
+    """
+    __slots__ = ['document_class', 'builder_class', 'encoders', 'decoders',
+                 'attributes']
+
+    def __init__(self, document_class, builder_class):
+        self.document_class = document_class
+        self.builder_class = builder_class
+        self.encoders = ()
+        self.decoders = ()
+        self.attributes = None
+
+    def compile(self):
+        """
+        compile field codecs
+
+        :rtype: None
+        :return: None
+        """
+        document_class = self.document_class
+        compiler = BinaryCompiler(self.builder_class, document_class)
+        codecs = [
+            (field_name, document_class._fields[field_name].visit(
+                compiler, field_name))
+            for field_name in sorted(document_class._fields)
+        ]
+        self.encoders = tuple(
+            (field_name, encode) for field_name, (encode, _) in codecs)
+        self.decoders = tuple(
+            (field_name, decode) for field_name, (_, decode) in codecs)
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class:
+            self.attributes = get_plan(BinaryPlan, attribute_class,
+                                       self.builder_class)
+
+    def encode(self, out, document):
+        """
+        encode document
+
+        :param bytearray out: output buffer
+        :param composite.Document document: document
+        :rtype: None
+        :return: None
+        """
+        for field_name, encode in self.encoders:
+            encode(out, getattr(document, field_name))
+        attributes = self.attributes
+        if attributes is not None:
+            if document.has_attributes():
+                out.append(1)
+                attributes.encode(out, document._attributes)
+            else:
+                out.append(0)
+
+    def fill(self, document, data, offset):
+        """
+        decode fields into document
+
+        :param composite.Document document: document
+        :param bytearray data: input buffer
+        :param int offset: document offset
+        :rtype: int
+        :return: next offset
+        """
+        for field_name, decode in self.decoders:
+            value, offset = decode(data, offset)
+            setattr(document, field_name, value)
+        attributes = self.attributes
+        if attributes is not None:
+            offset += 1
+            if data[offset - 1]:
+                document._attributes, offset = attributes.decode(data,
+                                                                 offset)
+        return offset
+
+    def decode(self, data, offset):
+        """
+        decode new document
+
+        :param bytearray data: input buffer
+        :param int offset: document offset
+        :rtype: tuple
+        :return: tuple[document, next offset]
+        """
+        document = self.document_class.blank()
+        return document, self.fill(document, data, offset)
+
+
+class BinaryDocumentBuilder(BaseDocumentBuilder):
+    """
+    Binary documents builder class, documents are built into compact bytes
+    (see :py:mod:`composite.builders.binary`) and parsed back:
+
+    .. code-block:: python
+
+        data = Users.build(BinaryDocumentBuilder, users)
+        users = Users.parse(BinaryDocumentBuilder, data)
+    """
+    def get_plan(self):
+        """
+        get binary plan of builder document
+
+        :rtype: BinaryPlan
+        :return: binary plan
+        """
+        return get_plan(BinaryPlan, self.document.__class__, self.__class__)
+
+    def parse(self, source, **options):
+        """
+        parse bytes to document
+
+        :param bytes source: encoded document
+        :param options: parse options, they are not supported
+        :rtype: composite.Document
+        :return: document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if parse options are given
+        :raises ValueError:
+            - if source is truncated or has trailing data
+        """
+        if options:
+            raise ImproperlyConfigured(
+                "`%s` does not support parse options" % (
+                    self.__class__.__name__)
+            )
+        data = bytearray(source)
+        try:
+            offset = self.get_plan().fill(self.document, data, 0)
+        except (IndexError, struct.error):
+            #: fixed size values (varints, floats, flags) out of data
+            raise ValueError("Truncated data, %d bytes given" % len(data))
+        if offset != len(data):
+            raise ValueError("Trailing data after document at %d" % offset)
+        return self.document
+
+    def build(self, node_name='document'):
+        """
+        build document into bytes
+
+        :param str node_name: node name, it's not encoded
+        :rtype: bytes
+        :return: encoded document
+        """
+        out = bytearray()
+        self.get_plan().encode(out, self.document)
+        return bytes(out)
+
+    @classmethod
+    def dump_source(cls, source):
+        """
+        encoded documents are dumped as is
+
+        :param bytes source: encoded document
+        :rtype: bytes
+        :return: encoded document
+        """
+        return bytes(source)
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.builers.expat
+    :synopsis: XML (expat) event-driven builder
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+"""
+from __future__ import absolute_import
+
+from xml.parsers import expat
+
+from .base import BaseDocumentBuilder, BaseFeedParser
+from ..fields import ListNode, ListField
+from ..exceptions import ImproperlyConfigured
+from ..visitors import EventParseCompiler
+
+#: size of file chunks fed into expat parser
+CHUNK_SIZE = 64 * 1024
+
+
+class EventHandler(object):
+    """
+    Handles expat start/end/data events and fills documents straight from
+    them with compiled parse plans, no element tree is built. Every open
+    element keeps ``(document, handlers, setter)`` frame in the stack:
+
+    - ``document``, document being filled (the parent one for text fields)
+    - ``handlers``, ``tag -> (plan, setter)`` table of the document
+      (``None`` for text fields)
+    - ``setter``, stores element result into the parent document
+
+    Elements of unknown tags are skipped along with their subtrees.
+    """
+    __slots__ = ['document', 'handlers', 'attributes', 'stack', 'skip',
+                 'text']
+
+    def __init__(self, document, handlers, attributes=None):
+        """
+        initiate handler
+
+        :param composite.documents.Document document: root document
+        :param dict handlers: ``tag -> (plan, setter)`` table of root document
+        :param composite.plans.ParsePlan attributes: parse plan of root
+            document attributes
+        """
+        self.document = document
+        self.handlers = handlers
+        self.attributes = attributes
+        self.stack = []
+        self.skip = 0
+        self.text = None
+
+    def bind(self, parser):
+        """
+        bind handler to expat parser
+
+        :param parser: expat parser
+        :rtype: xml.parsers.expat.XMLParserType
+        :return: parser
+        """
+        parser.buffer_text = True
+        parser.StartElementHandler = self.start
+        parser.EndElementHandler = self.end
+        parser.CharacterDataHandler = self.data
+        return parser
+
+    def start(self, tag, attributes):
+        if self.skip:
+            self.skip += 1
+            return
+        stack = self.stack
+        if not stack:
+            document = self.document
+            if self.attributes is not None:
+                document._attributes = self.attributes.parse(attributes)
+            stack.append((document, self.handlers, None))
+            return
+
+        document, handlers, _ = stack[-1]
+        handler = handlers.get(tag) if handlers is not None else None
+        if handler is None:
+            self.skip = 1
+            return
+        plan, setter = handler
+        if plan is None:
+            self.text = []
+            stack.append((document, None, setter))
+            return
+        child = plan.document_class.blank()
+        if plan.attributes is not None:
+            child._attributes = plan.attributes.parse(attributes)
+        stack.append((child, plan.setters, setter))
+
+    def end(self, tag):
+        if self.skip:
+            self.skip -= 1
+            return
+        stack = self.stack
+        document, handlers, setter = stack.pop()
+        if setter is None:
+            return
+        if handlers is None:
+            text, self.text = self.text, None
+            setter(document, ''.join(text))
+        else:
+            setter(stack[-1][0], document)
+
+    def data(self, text):
+        if self.text is not None and not self.skip:
+            self.text.append(text)
+
+
+class ExpatFeedParser(BaseFeedParser):
+    """
+    Feed parser, chunks are fed straight into expat parser
+    """
+    def __init__(self, document_class, builder_class, field=None, **options):
+        super(ExpatFeedParser, self).__init__(document_class, builder_class,
+                                              field, **options)
+        plan = self.plan
+        handlers = dict(plan.setters)
+        field = self.field
+        if field is not None:
+            items = self.items
+            if isinstance(field, ListNode):
+                def collect(document, value):
+                    items.append(value)
+                handlers[field.name] = (self.get_item_plan(), collect)
+            else:
+                typ = field.type
+
+                def collect(document, text):
+                    items.append(typ(text))
+                handlers[field.name] = (None, collect)
+        handler = EventHandler(self.document, handlers, plan.attributes)
+        self.parser = handler.bind(expat.ParserCreate())
+
+    def feed(self, data):
+        self.parser.Parse(data, False)
+
+    def close(self):
+        self.parser.Parse(b'', True)
+        return self.document
+
+
+class ExpatDocumentBuilder(BaseDocumentBuilder):
+    """
+    XML documents builder class for parse documents from raw xml (bytes,
+    str or file objects) with :py:mod:`xml.parsers.expat`. Documents are
+    filled straight from parser events, so elements are never allocated.
+    It's parse only builder which depends on python standard library only.
+    """
+    parse_compiler_class = EventParseCompiler
+    feed_parser_class = ExpatFeedParser
+
+    def parse(self, source, **options):
+        """
+        parse xml source to document
+
+        :param source: xml data (bytes, str) or file object
+        :param options: parse plan options, see
+            :py:class:`composite.plans.ParsePlan`
+        :rtype: composite.Document
+        :return: document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if lazy parse is requested, there are no raw nodes to keep
+        """
+        if options.get('lazy'):
+            raise ImproperlyConfigured(
+                "`%s` does not support lazy parse" % self.__class__.__name__
+            )
+        document = self.document
+        plan = document.get_parse_plan(self.__class__, **options)
+        handler = EventHandler(document, plan.setters, plan.attributes)
+        parser = handler.bind(expat.ParserCreate())
+        if hasattr(source, 'read'):
+            parser.ParseFile(source)
+        else:
+            parser.Parse(source, True)
+        return document
+
+    @classmethod
+    def iterparse(cls, document_class, source, field):
+        """
+        iterate through ``field`` items of xml file, the file is fed to
+        expat parser by chunks and items are yielded as soon as their
+        elements end, other document nodes are skipped.
+
+        :param type document_class: document class
+        :param source: xml file name or binary file object
+        :param str field: document list field name
+            (:py:class:`composite.fields.ListNode` or
+            :py:class:`composite.fields.ListField`)
+        :rtype: generator
+        :return: parsed list field items
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if field is not a list node or list field
+        """
+        item = document_class._fields.get(field)
+        items = []
+        if isinstance(item, ListNode):
+            def collect(document, value):
+                items.append(value)
+            handler = (item.type.get_parse_plan(cls), collect)
+        elif isinstance(item, ListField):
+            typ = item.type
+
+            def collect(document, text):
+                items.append(typ(text))
+            handler = (None, collect)
+        else:
+            raise ImproperlyConfigured(
+                "`%s` should be `ListNode` or `ListField` field of `%s`" % (
+                    field, document_class.__name__)
+            )
+
+        if not hasattr(source, 'read'):
+            with open(source, 'rb') as source_file:
+                for result in cls.iterparse(document_class, source_file,
+                                            field):
+                    yield result
+            return
+
+        event_handler = EventHandler(document_class.blank(),
+                                     {item.name: handler})
+        parser = event_handler.bind(expat.ParserCreate())
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            parser.Parse(chunk, not chunk)
+            for result in items:
+                yield result
+            del items[:]
+            if not chunk:
+                break
+
+    @classmethod
+    def dump_source(cls, source):
+        """
+        xml data is dumped as is
+
+        :param source: xml data
+        :type source: bytes | str
+        :rtype: bytes
+        :return: xml data
+        :raises TypeError:
+            - if source is file object, it could be read once only
+        """
+        if isinstance(source, bytes):
+            return source
+        if hasattr(source, 'read'):
+            raise TypeError("File objects could not be dumped")
+        return source.encode('utf-8')
+
+    @classmethod
+    def load_file(cls, path):
+        """
+        load xml file
+
+        :param str path: file path
+        :rtype: bytes
+        :return: xml data
+        """
+        with open(path, 'rb') as source:
+            return source.read()
+
+    @classmethod
+    def load_data(cls, data):
+        """
+        load xml file content, it's parsed as is
+
+        :param bytes data: file content
+        :rtype: bytes
+        :return: xml data
+        """
+        return data
+
+    def build(self, node_name='document'):
+        raise NotImplementedError(
+            "`%s` is parse only builder" % self.__class__.__name__
+        )
+
+    def build_attributes(self, source_object):
+        """
+        attributes
+
+        :param dict source_object: element attributes
+        :rtype: dict
+        :return: attributes
+        """
+        return source_object
+
+    @classmethod
+    def iterate(cls, source):
+        """
+        iterate through element attributes
+
+        :param dict source: element attributes
+        :rtype: collections.Iterable
+        :return: tuple[attribute name, value]
+        """
+        return source.items()
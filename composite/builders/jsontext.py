@@ -0,0 +1,886 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.builers.jsontext
+    :synopsis: JSON text builder
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Documents are built straight into JSON text with key fragments
+(``{"title":``, ``,"address":``) encoded once per document class, and
+parsed straight from JSON text: objects of documents with nested ones are
+scanned key by key and filled into documents, values of other fields and
+flat documents are decoded with the standard library ``json`` scanner.
+Dict tree of the whole source is never built, at most one flat document
+is kept as dict at once. Documents have the same JSON layout as
+:py:class:`composite.builders.PythonDocumentBuilder` ones dumped with
+:py:func:`json.dumps`, attributes are kept in ``_attributes`` object.
+"""
+from __future__ import absolute_import
+
+import re
+import json
+import codecs
+from json.decoder import WHITESPACE, scanstring
+from json.encoder import encode_basestring_ascii
+from json.scanner import make_scanner
+from array import array
+
+import six
+
+from .base import BaseDocumentBuilder, BaseFeedParser
+from .python import PythonDocumentBuilder
+from ..columns import Columns
+from ..const import ATTRIBUTES_META_CLASS
+from ..exceptions import ImproperlyConfigured
+from ..fields import Node, ListNode, ColumnListNode
+from ..plans import get_child_options, get_plan
+from ..visitors import FieldVisitor, DictParseCompiler
+
+#: attributes object key
+ATTRIBUTES_KEY = '_attributes'
+
+#: size of file chunks fed into feed parser
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = ' \t\n\r'
+_skip_whitespace = WHITESPACE.match
+_scan_once = make_scanner(json.JSONDecoder())
+#: number continued by the next chunk, ``1.`` of ``1.5``
+_number_tail = re.compile(r'[0-9.eE+-]+$').match
+#: literals scanned by the standard library scanner
+_LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+
+class MalformedData(ValueError):
+    """
+    Error of complete JSON text: unexpected character or value not
+    converted to field type. Feed parsers raise it at once, other value
+    errors could mean JSON text is not complete yet.
+    """
+
+
+def unexpected(text, end, message):
+    """
+    get error of text not matching expectation at ``end``
+
+    :param str text: JSON text
+    :param int end: offset
+    :param str message: error message
+    :rtype: ValueError
+    :return: :py:class:`MalformedData` if there is unexpected character,
+        :py:class:`ValueError` if text ends at offset (or with number tail)
+    """
+    if end >= len(text) or _number_tail(text, end):
+        error_class = ValueError
+    else:
+        error_class = MalformedData
+    return error_class("%s at %d" % (message, end))
+
+
+def converted(convert, *args):
+    """
+    call conversion of scanned value
+
+    :param callable convert: conversion (setter, field type or parse)
+    :param args: conversion arguments
+    :return: conversion result
+    :raises MalformedData:
+        - if value could not be converted
+    """
+    try:
+        return convert(*args)
+    except MalformedData:
+        raise
+    except ValueError as error:
+        raise MalformedData(str(error))
+
+
+def is_incomplete(text, position, message=''):
+    """
+    if scan failed at ``position`` because text ends too early, i.e. it
+    could succeed once the next chunk arrives
+
+    :param str text: JSON text
+    :param int position: error position
+    :param str message: scanner error message
+    :rtype: bool
+    :return: True if text is incomplete
+    """
+    if message.startswith('Unterminated string'):
+        return True
+    if message.startswith('Invalid \\uXXXX'):
+        #: scanner wants one more character after escape
+        return len(text) - position < 6
+    tail = text[position:]
+    return (not tail or _number_tail(tail) is not None or
+            any(literal.startswith(tail) for literal in _LITERALS))
+
+
+def scan_value(text, end):
+    """
+    decode JSON value with the standard library scanner
+
+    :param str text: JSON text
+    :param int end: value offset
+    :rtype: tuple
+    :return: tuple[value, next offset]
+    :raises MalformedData:
+        - if there is no valid value at offset
+    :raises ValueError:
+        - if text ends before value does
+    """
+    try:
+        return _scan_once(text, end)
+    except StopIteration as error:
+        position = error.args[0] if error.args else end
+        error_class = (ValueError if is_incomplete(text, position)
+                       else MalformedData)
+        raise error_class("Expecting value at %d" % position)
+    except ValueError as error:
+        #: python 2 scanner errors have no position, they are retried
+        position = getattr(error, 'pos', None)
+        if position is None or is_incomplete(text, position, error.msg):
+            raise
+        raise MalformedData(str(error))
+
+
+def skip_whitespace(text, end):
+    """
+    skip whitespace
+
+    :param str text: JSON text
+    :param int end: offset
+    :rtype: int
+    :return: offset of the next non whitespace character
+    """
+    if text[end:end + 1] in _WHITESPACE:
+        end = _skip_whitespace(text, end).end()
+    return end
+
+
+def expect(text, end, character):
+    """
+    skip whitespace and expected character
+
+    :param str text: JSON text
+    :param int end: offset
+    :param str character: expected character
+    :rtype: int
+    :return: offset after character and whitespace following it
+    :raises ValueError:
+        - if there is another character
+    """
+    end = skip_whitespace(text, end)
+    if text[end:end + 1] != character:
+        raise unexpected(text, end, "Expecting '%s'" % character)
+    return skip_whitespace(text, end + 1)
+
+
+def decode_object(plan, document, text, end):
+    """
+    fill document with JSON object, known keys are decoded with plan
+    decoders and values of unknown keys are skipped
+
+    :param composite.plans.ParsePlan plan: document parse plan
+    :param composite.Document document: document
+    :param str text: JSON text
+    :param int end: object offset
+    :rtype: int
+    :return: offset after object
+    :raises ValueError:
+        - if JSON text is malformed
+    """
+    setters = plan.setters
+    attributes = plan.attributes
+    if attributes is not None:
+        document._attributes = attributes.document_class.blank()
+
+    end = expect(text, end, '{')
+    if text[end:end + 1] == '}':
+        return end + 1
+    while True:
+        if text[end:end + 1] != '"':
+            raise unexpected(text, end, "Expecting property name")
+        key, end = scanstring(text, end + 1)
+        end = expect(text, end, ':')
+        setter = setters.get(key)
+        if setter is not None:
+            end = setter(document, text, end)
+        elif key == ATTRIBUTES_KEY and attributes is not None:
+            end = decode_object(attributes, document._attributes, text, end)
+        else:
+            _, end = scan_value(text, end)
+        end = skip_whitespace(text, end)
+        character = text[end:end + 1]
+        if character == '}':
+            return end + 1
+        if character != ',':
+            raise unexpected(text, end, "Expecting ',' delimiter")
+        end = skip_whitespace(text, end + 1)
+
+
+def decode_array(decode_item, text, end):
+    """
+    decode JSON array item by item
+
+    :param callable decode_item: item decode function with
+        ``(text, offset)`` signature returning ``(item, next offset)``
+    :param str text: JSON text
+    :param int end: array offset
+    :rtype: tuple
+    :return: tuple[items, offset after array]
+    :raises ValueError:
+        - if JSON text is malformed
+    """
+    items = []
+    append = items.append
+    end = expect(text, end, '[')
+    if text[end:end + 1] == ']':
+        return items, end + 1
+    while True:
+        item, end = decode_item(text, end)
+        append(item)
+        end = skip_whitespace(text, end)
+        character = text[end:end + 1]
+        if character == ']':
+            return items, end + 1
+        if character != ',':
+            raise unexpected(text, end, "Expecting ',' delimiter")
+        end = skip_whitespace(text, end + 1)
+
+
+def decode_text(source):
+    """
+    get JSON text of source
+
+    :param source: JSON data (bytes, str) or file object
+    :rtype: str
+    :return: JSON text
+    """
+    if hasattr(source, 'read'):
+        source = source.read()
+    if isinstance(source, bytes):
+        source = source.decode('utf-8')
+    return source
+
+
+def is_flat(document_class):
+    """
+    if document class has no nested documents
+
+    :param type document_class: document class
+    :rtype: bool
+    :return: True if document has no ``Node`` and ``ListNode`` fields
+        (``ColumnListNode`` ones are flat)
+    """
+    return not any(
+        isinstance(field, (Node, ListNode)) and
+        not isinstance(field, ColumnListNode)
+        for field in document_class._fields.values()
+    )
+
+
+def scanned(setter):
+    """
+    make decoder of value decoded with the standard library scanner
+
+    :param callable setter: dict parse compiler setter
+    :rtype: callable
+    :return: decoder
+    """
+    def decode(document, text, end):
+        value, end = scan_value(text, end)
+        converted(setter, document, value)
+        return end
+    return decode
+
+
+class JSONParseCompiler(DictParseCompiler):
+    """
+    JSON text parse compiler, returns decoders with ``(document, text,
+    offset)`` signature: decoder fills document with value at offset and
+    returns offset after the value. Nested documents are filled straight
+    from text, other values are decoded with the standard library scanner
+    and set with dict parse compiler setters.
+    """
+    def get_node_plan(self, node):
+        """
+        get compiled parse plan of node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: composite.plans.ParsePlan
+        :return: parse plan
+        """
+        field_name = self.composite._fields_mapping[node.name]
+        options = get_child_options(self.options, field_name)
+        return node.type.get_parse_plan(self.builder_class, **options)
+
+    def visit_field(self, field, name):
+        return scanned(super(JSONParseCompiler, self).visit_field(
+            field, name))
+
+    def visit_attribute_field(self, field, name):
+        return scanned(super(JSONParseCompiler, self).visit_attribute_field(
+            field, name))
+
+    def visit_list_field(self, field, name):
+        return scanned(super(JSONParseCompiler, self).visit_list_field(
+            field, name))
+
+    def visit_array_field(self, field, name):
+        return scanned(super(JSONParseCompiler, self).visit_array_field(
+            field, name))
+
+    def visit_column_list_node(self, node, name):
+        return scanned(super(JSONParseCompiler, self).visit_column_list_node(
+            node, name))
+
+    def get_node_decoder(self, node):
+        """
+        get decode function of node document, it has ``(text, offset)``
+        signature and returns ``(document, next offset)``. Flat documents
+        (without nested ones) are decoded into dict with the standard
+        library scanner and parsed with dict parse plan, other ones are
+        filled straight from text.
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: callable
+        :return: decode function
+        """
+        plan = self.get_node_plan(node)
+        if is_flat(node.type):
+            parse = node.type.get_parse_plan(
+                PythonDocumentBuilder, **plan.options).parse
+
+            def decode(text, end):
+                value, end = scan_value(text, end)
+                if not isinstance(value, dict):
+                    raise MalformedData("Expecting object before %d" % end)
+                return converted(parse, value), end
+            return decode
+
+        blank = plan.document_class.blank
+
+        def decode(text, end):
+            value = blank()
+            return value, decode_object(plan, value, text, end)
+        return decode
+
+    def visit_node(self, node, name):
+        decode_node = self.get_node_decoder(node)
+
+        def decode(document, text, end):
+            value, end = decode_node(text, end)
+            setattr(document, name, value)
+            return end
+        return decode
+
+    def visit_list_node(self, node, name):
+        decode_item = self.get_node_decoder(node)
+
+        def decode(document, text, end):
+            items, end = decode_array(decode_item, text, end)
+            setattr(document, name, items)
+            return end
+        return decode
+
+
+def get_scalar_encoder(typ):
+    """
+    get JSON encode function for values of field type
+
+    :param type typ: field type
+    :rtype: callable
+    :return: encode function, returns JSON text of value
+    """
+    if typ is bool:
+        return lambda value: 'true' if value else 'false'
+    if typ in six.integer_types:
+        return lambda value: str(int(value))
+    if typ is float:
+        return encode_float
+    if typ in six.string_types or typ is six.text_type:
+        return lambda value: encode_basestring_ascii(typ(value))
+    return lambda value: json.dumps(typ(value))
+
+
+def encode_float(value):
+    """
+    encode float the same way :py:func:`json.dumps` does
+
+    :param float value: value
+    :rtype: str
+    :return: JSON text
+    """
+    value = float(value)
+    if value != value:
+        return 'NaN'
+    if value == float('inf'):
+        return 'Infinity'
+    if value == -float('inf'):
+        return '-Infinity'
+    return repr(value)
+
+
+def get_key_fragments(keys):
+    """
+    get JSON fragments preceding object values
+
+    :param list[str] keys: object keys
+    :rtype: list[str]
+    :return: fragments, ``{"first":``, ``,"second":``, ...
+    """
+    return [
+        ('{' if index == 0 else ',') + encode_basestring_ascii(key) + ':'
+        for index, key in enumerate(keys)
+    ]
+
+
+class JSONBuildCompiler(FieldVisitor):
+    """
+    JSON text build compiler, returns encoders with ``(append, value)``
+    signature: encoder appends JSON text fragments of value with
+    ``append``.
+    """
+    def get_node_plan(self, node):
+        """
+        get JSON plan of node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: JSONPlan
+        :return: JSON plan
+        """
+        return get_plan(JSONPlan, node.type, self.builder_class)
+
+    def visit_field(self, field, name):
+        encode = get_scalar_encoder(field.type)
+
+        def emit(append, value):
+            append(encode(value))
+        return emit
+
+    visit_attribute_field = visit_field
+
+    def visit_list_field(self, field, name):
+        encode = get_scalar_encoder(field.type)
+
+        def emit(append, value):
+            append('[' + ','.join([encode(x) for x in value]) + ']')
+        return emit
+
+    def visit_array_field(self, field, name):
+        encode = get_scalar_encoder(field.type)
+
+        def emit(append, value):
+            if isinstance(value, array):
+                value = value.tolist()
+            append('[' + ','.join([encode(x) for x in value]) + ']')
+        return emit
+
+    def visit_node(self, node, name):
+        return self.get_node_plan(node).encode
+
+    def visit_list_node(self, node, name):
+        encode = self.get_node_plan(node).encode
+
+        def emit(append, value):
+            separator = '['
+            for x in value:
+                append(separator)
+                encode(append, x)
+                separator = ','
+            append(']' if separator == ',' else '[]')
+        return emit
+
+    def visit_column_list_node(self, node, name):
+        emit_list = self.visit_list_node(node, name)
+        fields = list(node.type._fields.values())
+        fragments = get_key_fragments([field.name for field in fields])
+        encoders = [get_scalar_encoder(field.type) for field in fields]
+        if not fields:
+            return emit_list
+
+        def emit(append, value):
+            if not isinstance(value, Columns):
+                return emit_list(append, value)
+            rows = []
+            for row in zip(*value.columns):
+                rows.append(''.join([
+                    fragment + encode(x)
+                    for fragment, encode, x in zip(fragments, encoders, row)
+                ]) + '}')
+            append('[' + ','.join(rows) + ']')
+        return emit
+
+
+class JSONPlan(object):
+    """
+    JSON build plan compiled once per (document class, builder class) pair,
+    it keeps ``(key fragment, attribute name, encoder)`` triples in
+    ``_fields`` order.
+    """
+    __slots__ = ['document_class', 'builder_class', 'encoders',
+                 'attributes']
+
+    def __init__(self, document_class, builder_class):
+        self.document_class = document_class
+        self.builder_class = builder_class
+        self.encoders = ()
+        self.attributes = None
+
+    def compile(self):
+        """
+        compile field encoders
+
+        :rtype: None
+        :return: None
+        """
+        document_class = self.document_class
+        compiler = JSONBuildCompiler(self.builder_class, document_class)
+        fields = list(document_class._fields.items())
+        fragments = get_key_fragments(
+            [field.name for _, field in fields] + [ATTRIBUTES_KEY])
+        self.encoders = tuple(
+            (fragment, field_name, field.visit(compiler, field_name))
+            for fragment, (field_name, field) in zip(fragments, fields)
+        )
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class:
+            self.attributes = (
+                fragments[-1],
+                get_plan(JSONPlan, attribute_class, self.builder_class)
+            )
+
+    def encode(self, append, document):
+        """
+        encode document
+
+        :param callable append: JSON text fragments consumer
+        :param composite.Document document: document
+        :rtype: None
+        :return: None
+        """
+        empty = True
+        for fragment, field_name, encode in self.encoders:
+            append(fragment)
+            encode(append, getattr(document, field_name))
+            empty = False
+        attributes = self.attributes
+        if attributes is not None and document.has_attributes():
+            fragment, plan = attributes
+            append(fragment)
+            plan.encode(append, document._attributes)
+            empty = False
+        append('{}' if empty else '}')
+
+
+class JSONFeedParser(BaseFeedParser):
+    """
+    Incremental JSON parser. Chunks are decoded into text buffer and the
+    root object is consumed step by step (key, value, delimiter): every
+    step takes ``(text, offset)`` and returns ``(next step, offset)``, it's
+    retried once more data arrives if buffer ends in the middle of it.
+    Items of list ``field`` are decoded one by one and consumed text is
+    dropped, so memory is bounded by chunk and item size.
+
+    Incomplete values are decoded again from their start, the next attempt
+    waits for pending text to double, so huge values are decoded in linear
+    time overall. Malformed input (unexpected characters, values not
+    converted to field types) is reported at once, incomplete one on
+    :py:meth:`close`.
+    """
+    def __init__(self, document_class, builder_class, field=None, **options):
+        super(JSONFeedParser, self).__init__(document_class, builder_class,
+                                             field, **options)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.offset = 0
+        #: chunks fed since the last attempt and pending text size
+        self.chunks = []
+        self.size = 0
+        #: pending text size required for the next attempt
+        self.wait = 0
+        self.closed = False
+        self.key = None
+        self.step = self.start
+        self.decode_item = None
+        attributes = self.plan.attributes
+        if attributes is not None:
+            self.document._attributes = attributes.document_class.blank()
+        field = self.field
+        if isinstance(field, ListNode):
+            compiler = JSONParseCompiler(builder_class, document_class,
+                                         **options)
+            self.decode_item = compiler.get_node_decoder(field)
+        elif field is not None:
+            typ = field.type
+
+            def decode_item(text, end):
+                value, end = scan_value(text, end)
+                return converted(typ, value), end
+            self.decode_item = decode_item
+
+    def check_complete(self, text, end):
+        """
+        check value ending at ``end`` is complete, numbers and literals
+        at the end of buffer (or followed by number tail, ``1`` of
+        ``1.5``) could be continued by the next chunk
+
+        :param str text: buffer
+        :param int end: value end
+        :rtype: None
+        :return: None
+        :raises ValueError:
+            - if buffer ends at value end
+        """
+        if not self.closed and (end >= len(text) or
+                                _number_tail(text, end)):
+            raise ValueError("Unexpected end of data at %d" % end)
+
+    def start(self, text, end):
+        end = expect(text, end, '{')
+        if text[end:end + 1] == '}':
+            return None, end + 1
+        return self.read_key, end
+
+    def read_key(self, text, end):
+        end = skip_whitespace(text, end)
+        if text[end:end + 1] != '"':
+            raise unexpected(text, end, "Expecting property name")
+        self.key, end = scanstring(text, end + 1)
+        return self.read_value, expect(text, end, ':')
+
+    def read_value(self, text, end):
+        end = skip_whitespace(text, end)
+        key, plan, field = self.key, self.plan, self.field
+        if field is not None and key == field.name:
+            end = expect(text, end, '[')
+            if text[end:end + 1] == ']':
+                return self.read_delimiter, end + 1
+            return self.read_item, end
+
+        setter = plan.setters.get(key)
+        if setter is not None:
+            end = setter(self.document, text, end)
+        elif key == ATTRIBUTES_KEY and plan.attributes is not None:
+            end = decode_object(plan.attributes, self.document._attributes,
+                                text, end)
+        else:
+            _, end = scan_value(text, end)
+        self.check_complete(text, end)
+        return self.read_delimiter, end
+
+    def read_delimiter(self, text, end):
+        end = skip_whitespace(text, end)
+        character = text[end:end + 1]
+        if character == '}':
+            return None, end + 1
+        if character != ',':
+            raise unexpected(text, end, "Expecting ',' delimiter")
+        return self.read_key, skip_whitespace(text, end + 1)
+
+    def read_item(self, text, end):
+        end = skip_whitespace(text, end)
+        item, end = self.decode_item(text, end)
+        self.check_complete(text, end)
+        self.items.append(item)
+        return self.read_item_delimiter, end
+
+    def read_item_delimiter(self, text, end):
+        end = skip_whitespace(text, end)
+        character = text[end:end + 1]
+        if character == ']':
+            return self.read_delimiter, end + 1
+        if character != ',':
+            raise unexpected(text, end, "Expecting ',' delimiter")
+        return self.read_item, skip_whitespace(text, end + 1)
+
+    def process(self):
+        """
+        run parse steps until buffer is exhausted
+
+        :rtype: None
+        :return: None
+        :raises MalformedData:
+            - if JSON text is malformed
+        :raises ValueError:
+            - if JSON text is incomplete on close
+        """
+        chunks = self.chunks
+        if chunks:
+            chunks.insert(0, self.buffer[self.offset:])
+            self.buffer, self.offset, self.chunks = ''.join(chunks), 0, []
+        text, end = self.buffer, self.offset
+        step = self.step
+        while step is not None:
+            try:
+                step, end = step(text, end)
+            except MalformedData:
+                raise
+            except ValueError:
+                if self.closed:
+                    raise
+                self.wait = 2 * (len(text) - end)
+                break
+            self.step = step
+            self.wait = 0
+        if self.step is None:
+            end = skip_whitespace(text, end)
+            if end < len(text):
+                raise ValueError("Extra data at %d" % end)
+        #: drop consumed text
+        if end > len(text) // 2:
+            self.buffer, self.offset = text[end:], 0
+        else:
+            self.offset = end
+        self.size = len(self.buffer) - self.offset
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            data = self.decoder.decode(data)
+        self.chunks.append(data)
+        self.size += len(data)
+        if self.size >= self.wait:
+            self.process()
+
+    def close(self):
+        self.chunks.append(self.decoder.decode(b'', True))
+        self.closed = True
+        self.process()
+        return self.document
+
+
+class JSONDocumentBuilder(BaseDocumentBuilder):
+    """
+    JSON documents builder class, documents are built straight into JSON
+    text (bytes) and parsed straight from it (bytes, str or file objects)
+    without intermediate dicts (see :py:mod:`composite.builders.jsontext`):
+
+    .. code-block:: python
+
+        data = Users.build(JSONDocumentBuilder, users)
+        users = Users.parse(JSONDocumentBuilder, data, only=['users.id'])
+    """
+    parse_compiler_class = JSONParseCompiler
+    feed_parser_class = JSONFeedParser
+
+    def parse(self, source, **options):
+        """
+        parse JSON source to document
+
+        :param source: JSON data (bytes, str) or file object
+        :param options: parse plan options, see
+            :py:class:`composite.plans.ParsePlan`
+        :rtype: composite.Document
+        :return: document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if lazy parse is requested, there are no raw nodes to keep
+        :raises ValueError:
+            - if JSON text is malformed
+        """
+        if options.get('lazy'):
+            raise ImproperlyConfigured(
+                "`%s` does not support lazy parse" % self.__class__.__name__
+            )
+        document = self.document
+        plan = document.get_parse_plan(self.__class__, **options)
+        text = decode_text(source)
+        end = skip_whitespace(text, decode_object(plan, document, text, 0))
+        if end != len(text):
+            raise ValueError("Extra data at %d" % end)
+        return document
+
+    @classmethod
+    def iterparse(cls, document_class, source, field):
+        """
+        iterate through ``field`` items of JSON file, the file is fed to
+        :py:class:`JSONFeedParser` by chunks and items are yielded as soon
+        as they are decoded, memory is bounded by chunk and item size
+
+        :param type document_class: document class
+        :param source: JSON file name or file object
+        :param str field: document list field name
+            (:py:class:`composite.fields.ListNode` or
+            :py:class:`composite.fields.ListField`), its key should be in
+            the root object
+        :rtype: generator
+        :return: parsed list field items
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if field is not a list node or list field
+        """
+        if not hasattr(source, 'read'):
+            with open(source, 'rb') as source_file:
+                for result in cls.iterparse(document_class, source_file,
+                                            field):
+                    yield result
+            return
+
+        parser = cls.feed_parser(document_class, field)
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            for result in parser.read_items():
+                yield result
+        parser.close()
+        for result in parser.read_items():
+            yield result
+
+    def build(self, node_name='document'):
+        """
+        build document into JSON text
+
+        :param str node_name: node name, it's not encoded
+        :rtype: bytes
+        :return: JSON text
+        """
+        parts = []
+        plan = get_plan(JSONPlan, self.document.__class__, self.__class__)
+        plan.encode(parts.append, self.document)
+        return ''.join(parts).encode('utf-8')
+
+    @classmethod
+    def dump_source(cls, source):
+        """
+        JSON text is dumped as is
+
+        :param source: JSON data
+        :type source: bytes | str
+        :rtype: bytes
+        :return: JSON data
+        :raises TypeError:
+            - if source is file object, it could be read once only
+        """
+        if isinstance(source, bytes):
+            return source
+        if hasattr(source, 'read'):
+            raise TypeError("File objects could not be dumped")
+        return source.encode('utf-8')
+
+    @classmethod
+    def load_file(cls, path):
+        """
+        load JSON file
+
+        :param str path: file path
+        :rtype: bytes
+        :return: JSON data
+        """
+        with open(path, 'rb') as source:
+            return source.read()
+
+    @classmethod
+    def load_data(cls, data):
+        """
+        load JSON file content, it's parsed as is
+
+        :param bytes data: file content
+        :rtype: bytes
+        :return: JSON data
+        """
+        return data
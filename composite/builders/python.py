@@ -6,9 +6,17 @@
 .. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
+import json
 
 from .base import BaseDocumentBuilder
-from ..visitors import DictBuildVisitor, DictParseVisitor
+from ..visitors import (
+    DictBuildVisitor, DictParseVisitor, DictParseCompiler,
+    DictBuildCompiler
+)
+
+#: canonical json encoder of ``dump_source``, ``json.dumps`` makes new one
+#: per call
+_canonical_encoder = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
 
 
 class PythonDocumentBuilder(BaseDocumentBuilder):
@@ -19,10 +27,12 @@ class PythonDocumentBuilder(BaseDocumentBuilder):
     """
     build_visitor_class = DictBuildVisitor
     parse_visitor_class = DictParseVisitor
+    parse_compiler_class = DictParseCompiler
+    build_compiler_class = DictBuildCompiler
 
-    def parse(self, source):
+    def parse(self, source, **options):
         assert isinstance(source, (dict, ))
-        return super(PythonDocumentBuilder, self).parse(source)
+        return super(PythonDocumentBuilder, self).parse(source, **options)
 
     def build(self, node_name='document'):
         assert (not isinstance(self.document, (dict, )))
@@ -46,12 +56,86 @@ class PythonDocumentBuilder(BaseDocumentBuilder):
         """
         iterate through source document
 
-        :param lxml.etree.Element source: xml document
-        :rtype: generator
+        :param dict source: python document
+        :rtype: collections.Iterable
         :return: tuple[node name, node]
         """
-        for name, item in source.items():
-            yield (name, item)
+        return source.items()
+
+    @classmethod
+    def dump_source(cls, source):
+        """
+        dump python document into canonical json (sorted keys)
+
+        :param dict source: python document
+        :rtype: bytes
+        :return: json data
+        :raises ValueError:
+            - if source has values not serializable to json or dicts with
+              keys of mixed types, such sources have no canonical form
+        """
+        try:
+            data = _canonical_encoder.encode(source)
+        except TypeError as error:
+            raise ValueError("Source could not be dumped into canonical "
+                             "json: %s" % error)
+        return data.encode('utf-8')
+
+    @classmethod
+    def load_file(cls, path):
+        """
+        load json file
+
+        :param str path: file path
+        :rtype: dict
+        :return: python document
+        """
+        with open(path, 'r') as source:
+            return json.load(source)
+
+    @classmethod
+    def load_data(cls, data):
+        """
+        load json file content
+
+        :param bytes data: file content
+        :rtype: dict
+        :return: python document
+        """
+        return json.loads(data.decode('utf-8'))
+
+    @classmethod
+    def iterate_list_node(cls, raw_node):
+        """
+        python list node is list of items
+
+        :param list[dict] raw_node: list node
+        :rtype: list[dict]
+        :return: item nodes
+        """
+        return raw_node
+
+    @classmethod
+    def dump_nodes(cls, nodes):
+        """
+        python nodes are picklable as is
+
+        :param list[dict] nodes: python nodes
+        :rtype: list[dict]
+        :return: nodes copy
+        """
+        return list(nodes)
+
+    @classmethod
+    def load_nodes(cls, data):
+        """
+        load python nodes
+
+        :param list[dict] data: python nodes
+        :rtype: list[dict]
+        :return: python nodes
+        """
+        return data
 
     def init_blank_attributes(self, source_object):
         """
@@ -7,8 +7,98 @@
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
 from lxml import etree
-from .base import BaseDocumentBuilder
-from ..visitors import LXMLBuildVisitor, LXMLParseVisitor
+from .base import BaseDocumentBuilder, BaseFeedParser
+from ..fields import ListNode, ListField, MetaListField
+from ..exceptions import ImproperlyConfigured
+from ..visitors import (
+    LXMLBuildVisitor, LXMLParseVisitor, LXMLParseCompiler,
+    LXMLBuildCompiler
+)
+
+
+class _ChunkSink(list):
+    """
+    collects chunks written by :py:class:`lxml.etree.xmlfile`
+    """
+    write = list.append
+
+
+class LXMLFeedParser(BaseFeedParser):
+    """
+    Feed parser built on :py:class:`lxml.etree.XMLPullParser`, root children
+    are parsed with compiled plan setters as soon as they end, then they are
+    cleared and dropped.
+    """
+    def __init__(self, document_class, builder_class, field=None, **options):
+        super(LXMLFeedParser, self).__init__(document_class, builder_class,
+                                             field, **options)
+        self.setters = dict(self.plan.setters)
+        self.root = None
+        self.parser = etree.XMLPullParser(events=('end', ))
+        field = self.field
+        if field is None:
+            return
+        items = self.items
+        if isinstance(field, ListNode):
+            parse = self.get_item_plan().parse
+
+            def setter(document, element):
+                items.append(parse(element))
+        else:
+            typ = field.type
+
+            def setter(document, element):
+                items.append(typ(element.text))
+        self.setters[field.name] = setter
+
+    def start(self, root):
+        """
+        process root element, its attributes are known once it starts
+
+        :param lxml.etree.Element root: root element
+        :rtype: None
+        :return: None
+        """
+        self.root = root
+        plan = self.plan
+        if plan.attributes is not None:
+            self.document._attributes = plan.attributes.parse(
+                plan.build_attributes(root))
+
+    def process(self):
+        """
+        process parser events
+
+        :rtype: None
+        :return: None
+        """
+        document, setters = self.document, self.setters
+        for _, element in self.parser.read_events():
+            parent = element.getparent()
+            if parent is None:
+                if self.root is None:
+                    self.start(element)
+                continue
+            #: only root children are document nodes
+            if parent.getparent() is not None:
+                continue
+            if self.root is None:
+                self.start(parent)
+            setter = setters.get(element.tag)
+            if setter is not None:
+                setter(document, element)
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+    def feed(self, data):
+        self.parser.feed(data)
+        self.process()
+
+    def close(self):
+        self.parser.close()
+        self.process()
+        return self.document
 
 
 class LXMLDocumentBuilder(BaseDocumentBuilder):
@@ -18,10 +108,13 @@ class LXMLDocumentBuilder(BaseDocumentBuilder):
     """
     build_visitor_class = LXMLBuildVisitor
     parse_visitor_class = LXMLParseVisitor
+    parse_compiler_class = LXMLParseCompiler
+    build_compiler_class = LXMLBuildCompiler
+    feed_parser_class = LXMLFeedParser
 
-    def parse(self, source):
+    def parse(self, source, **options):
         assert isinstance(source, (etree._Element, etree._Attrib))
-        return super(LXMLDocumentBuilder, self).parse(source)
+        return super(LXMLDocumentBuilder, self).parse(source, **options)
 
     def build(self, node_name='document'):
         assert (not isinstance(self.document, (etree._Element, etree._Attrib)))
@@ -74,3 +167,160 @@ class LXMLDocumentBuilder(BaseDocumentBuilder):
         else:
             for name, item in source.iteritems():
                 yield (name, item)
+
+    @classmethod
+    def dump_source(cls, source):
+        """
+        serialize element
+
+        :param lxml.etree.Element source: element
+        :rtype: bytes
+        :return: xml data
+        """
+        return etree.tostring(source)
+
+    @classmethod
+    def load_file(cls, path):
+        """
+        load xml file
+
+        :param str path: file path
+        :rtype: lxml.etree.Element
+        :return: root element
+        """
+        return etree.parse(path).getroot()
+
+    @classmethod
+    def load_data(cls, data):
+        """
+        load xml file content
+
+        :param bytes data: file content
+        :rtype: lxml.etree.Element
+        :return: root element
+        """
+        return etree.fromstring(data)
+
+    @classmethod
+    def iterate_list_node(cls, raw_node):
+        """
+        every list node item is separate element
+
+        :param lxml.etree.Element raw_node: item element
+        :rtype: tuple
+        :return: item elements
+        """
+        return (raw_node, )
+
+    @classmethod
+    def dump_nodes(cls, nodes):
+        """
+        serialize elements into one xml chunk
+
+        :param list[lxml.etree.Element] nodes: elements
+        :rtype: bytes
+        :return: xml chunk
+        """
+        to_string = etree.tostring
+        return b''.join(
+            [b'<chunk>'] +
+            [to_string(node, with_tail=False) for node in nodes] +
+            [b'</chunk>']
+        )
+
+    @classmethod
+    def load_nodes(cls, data):
+        """
+        load elements serialized with :py:meth:`dump_nodes`
+
+        :param bytes data: xml chunk
+        :rtype: lxml.etree.Element
+        :return: chunk element, its children are the elements
+        """
+        return etree.fromstring(data)
+
+    @classmethod
+    def iterparse(cls, document_class, source, field):
+        """
+        iterate through ``field`` items of xml file with help of
+        :py:func:`lxml.etree.iterparse`, every processed element and its
+        preceding siblings are cleared so memory stays flat no matter how
+        big the file is. Other document nodes are skipped.
+
+        :param type document_class: document class
+        :param source: xml file name or file object
+        :param str field: document list field name
+            (:py:class:`composite.fields.ListNode` or
+            :py:class:`composite.fields.ListField`)
+        :rtype: generator
+        :return: parsed list field items
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if field is not a list node or list field
+        """
+        item = document_class._fields.get(field)
+        if isinstance(item, ListNode):
+            parse = item.type.get_parse_plan(cls).parse
+        elif isinstance(item, ListField):
+            typ = item.type
+
+            def parse(element):
+                return typ(element.text)
+        else:
+            raise ImproperlyConfigured(
+                "`%s` should be `ListNode` or `ListField` field of `%s`" % (
+                    field, document_class.__name__)
+            )
+
+        context = etree.iterparse(source, events=('end', ), tag=item.name)
+        for _, element in context:
+            parent = element.getparent()
+            #: only root children are items, deeper elements with the same
+            #: tag are cleared along with their item
+            if parent is None or parent.getparent() is not None:
+                continue
+            result = parse(element)
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+            yield result
+
+    def iterwrite(self, node_name='document'):
+        """
+        build xml document incrementally with :py:class:`lxml.etree.xmlfile`,
+        ``ListNode`` and ``ListField`` values could be any iterables
+        (generators as well), every item is serialized as soon as it's built,
+        so the whole tree is never kept in memory.
+
+        :param str node_name: document node name
+        :rtype: generator
+        :return: serialized xml chunks (:py:class:`bytes`)
+        """
+        document = self.document
+        fields = document._fields
+        plan = document.get_build_plan(self.__class__)
+        scratch = self.build_object(node_name)
+        if plan.attribute_emitters and document.has_attributes():
+            attributes = document._attributes
+            for field_name, emit in plan.attribute_emitters:
+                emit(scratch, getattr(attributes, field_name))
+
+        sink = _ChunkSink()
+        with etree.xmlfile(sink, encoding='utf-8') as xml_file:
+            xml_file.write_declaration()
+            with xml_file.element(node_name, dict(scratch.attrib)):
+                for field_name, emit in plan.emitters:
+                    value = getattr(document, field_name)
+                    if isinstance(fields[field_name], MetaListField):
+                        items = ((item, ) for item in value)
+                    else:
+                        items = (value, )
+                    for item in items:
+                        emit(scratch, item)
+                        for element in scratch:
+                            xml_file.write(element)
+                        del scratch[:]
+                        xml_file.flush()
+                        if sink:
+                            yield b''.join(sink)
+                            del sink[:]
+        yield b''.join(sink)
@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.cache
+    :synopsis: Content-addressed and persistent on-disk parse caches
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Parsed documents are cached by hash of their source (dumped with builder
+``dump_source``) along with document class, builder class and parse
+options, so repeated payloads are never parsed twice:
+
+.. code-block:: python
+
+    from composite.cache import ParseCache
+
+    cache = ParseCache(max_entries=1000, max_bytes=64 * 1024 * 1024)
+    company = Company.parse(LXMLDocumentBuilder, source, cache=cache)
+    cache.stats()  # {'hits': 0, 'misses': 1, ...}
+
+Dumping and hashing of source is the most of hit cost (sorted json of
+dicts, ``etree.tostring`` of elements), for ``PythonDocumentBuilder`` it
+costs about as much as parse itself. Callers knowing identity of their
+payloads (message ids, ETags, content hashes from transport) pass it as
+key and source is not dumped at all:
+
+.. code-block:: python
+
+    company = Company.parse(PythonDocumentBuilder, payload, cache=cache,
+                            cache_key=message.content_hash)
+
+Documents are kept as compact states (see
+:py:class:`composite.plans.StatePlan`) in memory, every hit returns new
+document restored from the state, so callers could modify it freely.
+``python -m benchmarks.cache`` compares hits with parse.
+
+:py:class:`FileCache` keeps parsed files on disk between runs.
+"""
+import os
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .const import ATTRIBUTES_META_CLASS
+from .exceptions import ImproperlyConfigured
+from .fields import Node, ListNode
+from .plans import StatePlan, get_plan
+
+#: version of cached states format, bump it on
+#: :py:class:`composite.plans.StatePlan` changes
+STATE_VERSION = 1
+
+#: size of file chunks read for content hash
+CHUNK_SIZE = 64 * 1024
+
+#: atomic rename replacing existing file
+_replace = getattr(os, 'replace', os.rename)
+
+
+def get_fingerprint(document_class):
+    """
+    get schema fingerprint of document class, it's derived from document
+    fields (names, types, nested documents and attributes) so any schema
+    change gives another fingerprint
+
+    :param type document_class: document class
+    :rtype: str
+    :return: fingerprint (hex digest)
+    """
+    def describe(document_class, seen):
+        if document_class in seen:
+            return document_class.__name__
+        seen = seen | frozenset([document_class])
+        fields = []
+        #: declaration order, it's the order of state values
+        for field_name, field in document_class._fields.items():
+            if isinstance(field, (Node, ListNode)):
+                field_type = describe(field.type, seen)
+            else:
+                field_type = getattr(field.type, '__name__', repr(field.type))
+            fields.append((
+                field_name, field.__class__.__name__, field.name, field_type,
+                getattr(field, 'typecode', None),
+                sorted(getattr(field, 'typecodes', {}).items())
+            ))
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class:
+            fields.append(describe(attribute_class, seen))
+        return document_class.__name__, fields
+
+    description = repr((STATE_VERSION, describe(document_class, frozenset())))
+    return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+
+def get_file_digest(path):
+    """
+    get content hash of file
+
+    :param str path: file path
+    :rtype: str
+    :return: hex digest
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache(object):
+    """
+    LRU parse cache bounded by number of entries and (optionally) total size
+    of states in bytes (size of pickled state, it's computed once on miss)
+    """
+    def __init__(self, max_entries=1024, max_bytes=None):
+        """
+        initiate cache
+
+        :param int max_entries: max number of cached documents
+        :param int max_bytes: max total size of cached states, unbounded
+            if not given
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_key(self, document_class, builder_class, source, options,
+                source_key=None):
+        """
+        get cache key of source
+
+        :param type document_class: document class
+        :param builder_class: builder class
+        :param source: source data
+        :param dict options: parse options, profiler is not a part of key
+        :param source_key: hashable key identifying source content, source
+            is dumped and hashed if it's not given
+        :rtype: tuple
+        :return: key
+        :raises ValueError:
+            - if source could not be dumped, see
+              :py:meth:`composite.builders.BaseDocumentBuilder.dump_source`
+        """
+        if source_key is None:
+            source_key = hashlib.sha1(
+                builder_class.dump_source(source)).digest()
+        else:
+            #: never equal to digests
+            source_key = (source_key, )
+        return (document_class, builder_class, source_key) + tuple(
+            sorted(item for item in options.items()
+                   if item[0] != 'profiler'))
+
+    def parse(self, document_class, builder_class, source, key=None,
+              **options):
+        """
+        parse source or restore cached document
+
+        :param type document_class: document class
+        :param builder_class: builder class
+        :param source: source data
+        :param key: hashable key identifying source content, equal keys
+            must be given for equal sources only, source is dumped and
+            hashed if it's not given
+        :param options: parse options, see
+            :py:meth:`composite.documents.Document.get_parse_options`
+        :rtype: composite.Document
+        :return: new document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if lazy parse is requested, cached documents are complete
+        :raises ValueError:
+            - if source could not be dumped into cache key
+        """
+        if options.get('lazy'):
+            raise ImproperlyConfigured(
+                "`%s` does not support lazy parse" % self.__class__.__name__
+            )
+        plan = get_plan(StatePlan, document_class)
+        key = self.get_key(document_class, builder_class, source, options,
+                           key)
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.entries[key] = entry
+                self.hits += 1
+        if entry is not None:
+            return plan.load(entry[1])
+
+        document = document_class.parse(builder_class, source, **options)
+        state = plan.dump(document)
+        size = len(pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+        with self.lock:
+            self.misses += 1
+            self.put(key, state, size)
+        return document
+
+    def put(self, key, state, size):
+        """
+        put entry evicting least recently used ones, entries bigger than
+        ``max_bytes`` are not cached at all
+
+        :param tuple key: cache key
+        :param tuple state: document state
+        :param int size: state size in bytes
+        :rtype: None
+        :return: None
+        """
+        max_bytes = self.max_bytes
+        if max_bytes is not None and size > max_bytes:
+            return
+        entries = self.entries
+        previous = entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[0]
+        entries[key] = size, state
+        self.size += size
+        while (len(entries) > self.max_entries or
+               max_bytes is not None and self.size > max_bytes):
+            _, (evicted, _) = entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def clear(self):
+        """
+        drop all entries, counters are kept
+
+        :rtype: None
+        :return: None
+        """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        get cache counters
+
+        :rtype: dict
+        :return: counters
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.size,
+            }
+
+
+class FileCache(object):
+    """
+    Persistent on-disk cache of parsed files, every entry is one file in
+    ``directory`` keyed by source path, document class schema fingerprint
+    (see :py:func:`get_fingerprint`), builder class and parse options. Entry
+    keeps source file mtime, size and content hash along with pickled
+    document state, so source changes and schema changes invalidate it:
+
+    .. code-block:: python
+
+        cache = FileCache('/var/cache/myapp')
+        users = Users.parse(LXMLDocumentBuilder, 'users.xml', cache=cache)
+
+    Entry is used as is if source mtime and size match, content hash is
+    checked otherwise (touched but unchanged files are still hits, their
+    entries are updated with new mtime). Builder has to implement
+    ``load_data``, so content hash is computed from parsed bytes.
+    """
+    def __init__(self, directory):
+        """
+        initiate cache
+
+        :param str directory: cache directory, it's created if missing
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def get_key(self, document_class, builder_class, path, options,
+                source_key=None):
+        """
+        get entry key
+
+        :param type document_class: document class
+        :param builder_class: builder class
+        :param str path: source file path
+        :param dict options: parse options, profiler is not a part of key
+        :param source_key: key used instead of absolute source path
+        :rtype: str
+        :return: key (hex digest)
+        """
+        description = repr((
+            os.path.abspath(path) if source_key is None else source_key,
+            get_fingerprint(document_class),
+            builder_class.__module__, builder_class.__name__,
+            sorted((name, sorted(value) if isinstance(value, frozenset)
+                    else value) for name, value in options.items()
+                   if name != 'profiler')
+        ))
+        return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+    def get_entry_path(self, key):
+        """
+        get entry file path
+
+        :param str key: entry key
+        :rtype: str
+        :return: path
+        """
+        return os.path.join(self.directory, key + '.cache')
+
+    def load(self, entry_path, path, stat):
+        """
+        load entry state if entry is still valid
+
+        :param str entry_path: entry file path
+        :param str path: source file path
+        :param stat: source file stat
+        :rtype: tuple | None
+        :return: document state
+        """
+        try:
+            with open(entry_path, 'rb') as entry:
+                (mtime, size, digest), state = pickle.load(entry)
+        except (IOError, OSError, EOFError, ValueError, pickle.PickleError):
+            return None
+        if size != stat.st_size:
+            return None
+        if mtime != stat.st_mtime:
+            if digest != get_file_digest(path):
+                return None
+            #: touched but unchanged, keep new mtime so the file is not
+            #: hashed on every run
+            self.save(entry_path, (stat.st_mtime, size, digest), state)
+        return state
+
+    def save(self, entry_path, metadata, state):
+        """
+        save entry atomically
+
+        :param str entry_path: entry file path
+        :param tuple metadata: tuple[source mtime, source size, source
+            content hash]
+        :param tuple state: document state
+        :rtype: None
+        :return: None
+        """
+        handle, temp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(handle, 'wb') as entry:
+                pickle.dump((metadata, state), entry,
+                            pickle.HIGHEST_PROTOCOL)
+            _replace(temp_path, entry_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def parse(self, document_class, builder_class, path, key=None,
+              **options):
+        """
+        parse file (loaded with builder ``load_data``) or restore cached
+        document
+
+        :param type document_class: document class
+        :param builder_class: builder class
+        :param str path: source file path
+        :param key: key used instead of absolute source path, so moved
+            files keep their entries
+        :param options: parse options, see
+            :py:meth:`composite.documents.Document.get_parse_options`
+        :rtype: composite.Document
+        :return: document instance
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if lazy parse is requested, cached documents are complete
+        """
+        if options.get('lazy'):
+            raise ImproperlyConfigured(
+                "`%s` does not support lazy parse" % self.__class__.__name__
+            )
+        plan = get_plan(StatePlan, document_class)
+        entry_path = self.get_entry_path(
+            self.get_key(document_class, builder_class, path, options, key))
+        stat = os.stat(path)
+        state = self.load(entry_path, path, stat)
+        if state is not None:
+            self.hits += 1
+            return plan.load(state)
+
+        self.misses += 1
+        with open(path, 'rb') as source:
+            data = source.read()
+        document = document_class.parse(
+            builder_class, builder_class.load_data(data), **options)
+        #: file could be changed since stat, metadata describes parsed
+        #: content, changed mtime gets it checked on the next run
+        metadata = (stat.st_mtime, len(data), hashlib.sha1(data).hexdigest())
+        self.save(entry_path, metadata, plan.dump(document))
+        return document
+
+    def clear(self):
+        """
+        remove all entries
+
+        :rtype: None
+        :return: None
+        """
+        for file_name in os.listdir(self.directory):
+            if file_name.endswith('.cache'):
+                os.remove(os.path.join(self.directory, file_name))
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.columns
+    :synopsis: Columnar (struct of arrays) storage for list of flat documents
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+"""
+from array import array
+
+try:
+    array('q')
+    #: 64-bit integer typecode, ``l`` is 32-bit on windows
+    INT64_TYPECODE = 'q'
+except ValueError:  #: pragma: no cover, python 2 has no ``q`` typecode
+    INT64_TYPECODE = 'l'
+
+#: typecodes of columns used for document field types by default,
+#: other types are stored in lists
+DEFAULT_TYPECODES = {
+    int: INT64_TYPECODE,
+    float: 'd',
+}
+
+
+class Columns(object):
+    """
+    List of flat documents stored as one column (:py:class:`array.array`
+    or :py:class:`list`) per document field instead of one python object per
+    item. Items are materialized into documents on indexing and iteration,
+    they are row copies, so changes of them are not written back to columns
+    until the row is assigned:
+
+    .. code-block:: python
+
+        vectors.vectors[0]  # <Vector: (1.20, 3.20)>
+        vectors.vectors.column('x')  # array('d', [1.2, 3.14, 5.2])
+
+        vector = vectors.vectors[0]
+        vector.x = 2.0  # columns are not changed
+        vectors.vectors[0] = vector  # now they are
+
+    Array columns support buffer protocol, so numpy could use them without
+    copying: ``numpy.frombuffer(columns.column('x'), dtype='d')``.
+    """
+    __slots__ = ['document_class', 'names', 'columns']
+
+    def __init__(self, document_class, typecodes):
+        """
+        initiate columns
+
+        :param type document_class: flat document class
+        :param dict typecodes: document field name -> column typecode
+            mapping, ``None`` typecode stands for list column
+        """
+        self.document_class = document_class
+        self.names = tuple(document_class._fields)
+        self.columns = tuple(
+            array(typecodes[name]) if typecodes.get(name) else []
+            for name in self.names
+        )
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(self.columns[0])
+
+    def __iter__(self):
+        make_document = self.make_document
+        for values in zip(*self.columns):
+            yield make_document(values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        return self.make_document([column[index] for column in self.columns])
+
+    def __setitem__(self, index, document):
+        for name, column in zip(self.names, self.columns):
+            column[index] = getattr(document, name)
+
+    def __repr__(self):
+        return '<%s: %s[%d]>' % (self.__class__.__name__,
+                                 self.document_class.__name__, len(self))
+
+    def make_document(self, values):
+        """
+        make document from row values
+
+        :param list values: row values in column order
+        :rtype: composite.documents.Document
+        :return: document instance
+        """
+        document = self.document_class.blank()
+        for name, value in zip(self.names, values):
+            setattr(document, name, value)
+        return document
+
+    def column(self, name):
+        """
+        get column of document field
+
+        :param str name: document field name
+        :rtype: array.array | list
+        :return: column
+        """
+        return self.columns[self.names.index(name)]
+
+    def append(self, document):
+        """
+        append document as new row
+
+        :param composite.documents.Document document: document instance
+        :rtype: None
+        :return: None
+        """
+        for name, column in zip(self.names, self.columns):
+            column.append(getattr(document, name))
+
+    def append_row(self, values):
+        """
+        append row values
+
+        :param list values: row values in column order
+        :rtype: None
+        :return: None
+        """
+        for column, value in zip(self.columns, values):
+            column.append(value)
+
+    def extend(self, documents):
+        """
+        extend columns with documents
+
+        :param documents: documents iterable
+        :rtype: None
+        :return: None
+        """
+        append = self.append
+        for document in documents:
+            append(document)
+
+    def copy(self):
+        """
+        get columns copy, column containers are copied
+
+        :rtype: Columns
+        :return: columns
+        """
+        columns = self.__class__.__new__(self.__class__)
+        columns.document_class = self.document_class
+        columns.names = self.names
+        columns.columns = tuple(column[:] for column in self.columns)
+        return columns
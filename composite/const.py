@@ -9,3 +9,4 @@
 from __future__ import unicode_literals
 
 ATTRIBUTES_META_CLASS = 'Attributes'
+OPTIONS_META_CLASS = 'Meta'
@@ -10,32 +10,146 @@ from __future__ import unicode_literals
 
 import six
 from .exceptions import ImproperlyConfigured
-from .fields import BaseField, MetaListField, AttributeField
-from .const import ATTRIBUTES_META_CLASS
+from .fields import (
+    BaseField, AttributeField, MetaListField, Node, ListNode
+)
+from .const import ATTRIBUTES_META_CLASS, OPTIONS_META_CLASS
+from .plans import ParsePlan, BuildPlan, get_plan
+
+
+#: types of immutable field values, such defaults are computed once and
+#: shared between documents
+IMMUTABLE_TYPES = (
+    (bool, float, complex, bytes, tuple, frozenset, type(None)) +
+    six.integer_types + six.string_types
+)
+
+
+def _get_defaults(fields):
+    """
+    precompute immutable field defaults, other fields (nodes, lists, etc)
+    get their defaults on the first access only
+
+    :param dict fields: document fields
+    :rtype: dict
+    :return: field name -> default value
+    """
+    defaults = {}
+    for field_name, item in fields.items():
+        if isinstance(item, (Node, MetaListField)):
+            continue
+        try:
+            value = item.factory()
+        except Exception:
+            continue
+        if type(value) in IMMUTABLE_TYPES:
+            defaults[field_name] = value
+    return defaults
+
+
+def _compile_init(defaults, slots=False):
+    """
+    compile specialized ``__init__`` for document fields, it assigns
+    precomputed defaults directly instead of ``setattr`` in the loop
+
+    :param dict defaults: field defaults
+    :param bool slots: if document stores fields in slots
+    :rtype: callable
+    :return: ``__init__`` function
+    """
+    if not slots:
+        def __init__(self):
+            if defaults:
+                self.__dict__.update(defaults)
+        return __init__
+
+    namespace = {}
+    lines = ['def __init__(self):']
+    for index, (field_name, value) in enumerate(defaults.items()):
+        default = 'default_%d' % index
+        namespace[default] = value
+        lines.append('    self.%s = %s' % (field_name, default))
+    if not defaults:
+        lines.append('    pass')
+    six.exec_('\n'.join(lines), namespace)
+    return namespace['__init__']
 
 
 class DocumentMeta(type):
     """
-    Document Meta class for building documents
+    Document Meta class for building documents, document options could be
+    set up with inner ``Meta`` class:
+
+    - ``slots``, store fields (and attributes) in generated ``__slots__``
+      instead of per-instance ``__dict__``:
+
+        .. code-block:: python
+
+            class Vector(Document):
+                x = Field('x', float)
+                y = Field('y', float)
+
+                class Meta:
+                    slots = True
     """
     def __new__(cls, name, bases, attrs):
         _fields = {}
         _fields_mapping = {}
 
         attribute_class = attrs.pop(ATTRIBUTES_META_CLASS, None)
+        options = attrs.pop(OPTIONS_META_CLASS, None)
+        slots = getattr(options, 'slots', False)
         for field_name, item in attrs.items():
             if isinstance(item, BaseField):
                 _fields[field_name] = item
                 _fields_mapping[item.name] = field_name
+        _defaults = _get_defaults(_fields)
+        init_fields = _compile_init(_defaults, slots)
+        #: documents with overridden ``__init__`` are made with it
+        custom_init = any(getattr(base, '_custom_init', False) or (
+            '__init__' in attrs and isinstance(base, DocumentMeta)
+        ) for base in bases)
         attrs.update({
+            '_custom_init': custom_init,
             '_fields': _fields,
-            '_fields_mapping': _fields_mapping
+            '_fields_mapping': _fields_mapping,
+            '_defaults': _defaults,
+            '_init_fields': staticmethod(init_fields),
+            '_plans': {}
         })
-        new_class = super(DocumentMeta, cls).__new__(cls, name, bases, attrs)
+        namespace = attrs
+        if slots:
+            #: slots would conflict with fields defined as class variables
+            namespace = dict(
+                (key, value) for key, value in attrs.items()
+                if key not in _fields
+            )
+            namespace['__slots__'] = tuple(str(key) for key in _fields)
+            if any(isinstance(item, (Node, ListNode))
+                   for item in _fields.values()):
+                #: pending nodes of lazy parsed documents
+                namespace['__slots__'] += (str('_lazy'), )
+            if attribute_class:
+                namespace['__slots__'] += (str('_attributes'), )
+            if '__init__' not in attrs:
+                namespace['__init__'] = init_fields
+        new_class = super(DocumentMeta, cls).__new__(cls, name, bases,
+                                                     namespace)
         if attribute_class:
+            attribute_attrs = dict(
+                (key, value)
+                for key, value in attribute_class.__dict__.items()
+                if key not in ('__dict__', '__weakref__')
+            )
+            if slots:
+                attribute_attrs[str(OPTIONS_META_CLASS)] = options
+            #: keeps the class importable by name, so documents pickle
+            qualname = getattr(attribute_class, '__qualname__', None)
+            if qualname:
+                attribute_attrs['__qualname__'] = qualname
             attribute_composite_class = type(
                 str(ATTRIBUTES_META_CLASS), (DocumentAttribute, ),
-                dict(attribute_class.__dict__)
+                attribute_attrs
             )
             setattr(new_class, str(ATTRIBUTES_META_CLASS),
                     attribute_composite_class)
@@ -83,15 +197,31 @@ class Document(six.with_metaclass(DocumentMeta)):
         {'name': 'Alice', 'age': 10, 'address': 'Wonderland'}
 
     """
+    __slots__ = ()
     _fields_mapping = {}
     _fields = {}
+    _plans = {}
 
     def __init__(self):
-        for name, item in self._fields.items():
-            if isinstance(item, MetaListField):
-                setattr(self, name, [])
-            else:
-                setattr(self, name, item.type())
+        #: precomputed immutable defaults only, other fields get their
+        #: defaults on the first access
+        self._init_fields(self)
+
+    @classmethod
+    def blank(cls):
+        """
+        make blank document for builders, it skips ``__init__`` and sets
+        precomputed immutable defaults only, documents with overridden
+        ``__init__`` are made with it
+
+        :rtype: composite.Document
+        :return: document instance
+        """
+        if cls._custom_init:
+            return cls()
+        document = cls.__new__(cls)
+        cls._init_fields(document)
+        return document
 
     def __str__(self):  #: pragma: no cover
         return '0x%08x' % id(self)
@@ -99,22 +229,183 @@ class Document(six.with_metaclass(DocumentMeta)):
     def __repr__(self):
         return '<%s: %s>' % (self.__class__.__name__, self.__str__())
 
+    def __getattr__(self, name):
+        #: slot documents get here for unset fields
+        if name in self._fields:
+            return self._missing_field(name)
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (self.__class__.__name__,
+                                                   name)
+        )
+
     @classmethod
-    def parse(cls, builder_class, source):
+    def parse(cls, builder_class, source, lazy=False, only=None,
+              exclude=None, cache=None, cache_key=None, profiler=None):
         """
         parse to python-object instance with ``build_class`` ``source`` data
 
+        .. code-block:: python
+
+            company = Company.parse(builders.PythonDocumentBuilder, source,
+                                    only=['title', 'ceo.sign'])
+
         :param builder_class: builder class
             (:py:class:`composite.builders.BaseDocumentBuilder`)
         :param source: any data to process
+        :param bool lazy: keep raw source of ``Node`` and ``ListNode``
+            fields and parse them on the first access only, parsed values
+            are cached in the document
+        :param list[str] only: dotted field paths to parse, other fields
+            and their subtrees are skipped
+        :param list[str] exclude: dotted field paths to skip
+        :param composite.cache.ParseCache cache: parse cache, repeated
+            sources are restored from it instead of being parsed
+        :param cache_key: hashable key identifying source content (message
+            id, content hash), cache dumps and hashes source if it's not
+            given
+        :param composite.profiling.Profiler profiler: profiler recording
+            per field counters of parse
         :rtype: composite.Document
         :return: document instance
         """
-        new_obj = cls()
+        options = cls.get_parse_options(lazy=lazy, only=only,
+                                        exclude=exclude, profiler=profiler)
+        if cache is not None:
+            return cache.parse(cls, builder_class, source, key=cache_key,
+                               **options)
+        new_obj = cls.blank()
         builder = builder_class(new_obj)
-        builder.parse(source)
+        builder.parse(source, **options)
         return new_obj
 
+    @staticmethod
+    def get_parse_options(lazy=False, only=None, exclude=None,
+                          profiler=None):
+        """
+        get parse plan options, see :py:class:`composite.plans.ParsePlan`
+
+        :param bool lazy: lazy parse
+        :param list[str] only: dotted field paths to parse
+        :param list[str] exclude: dotted field paths to skip
+        :param composite.profiling.Profiler profiler: parse profiler
+        :rtype: dict
+        :return: non default options
+        """
+        options = {}
+        if lazy:
+            options['lazy'] = True
+        if only is not None:
+            options['only'] = frozenset(only)
+        if exclude:
+            options['exclude'] = frozenset(exclude)
+        if profiler is not None:
+            options['profiler'] = profiler
+        return options
+
+    def materialize(self, name=None):
+        """
+        parse pending field kept by lazy parse, all pending fields
+        are parsed if ``name`` is not given
+
+        :param str name: document field name
+        :rtype: any
+        :return: field value
+        """
+        if name is None:
+            for field_name in list(getattr(self, '_lazy', None) or ()):
+                getattr(self, field_name)
+            return None
+        return getattr(self, name)
+
+    def _missing_field(self, name):
+        """
+        get value of field missing in the document: it's either parsed
+        pending node or default value created on the first access
+
+        :param str name: document field name
+        :rtype: any
+        :return: field value
+        """
+        value = self._fields[name].factory()
+        setattr(self, name, value)
+        pending = getattr(self, '_lazy', None)
+        if pending and name in pending:
+            setter, raw_nodes = pending.pop(name)
+            for raw_node in raw_nodes:
+                setter(self, raw_node)
+            value = getattr(self, name)
+        return value
+
+    @classmethod
+    def iterparse(cls, builder_class, source, field):
+        """
+        iterate through parsed items of document list ``field`` one at a
+        time, so huge sources are never loaded into memory as a whole:
+
+        .. code-block:: python
+
+            for user in Users.iterparse(builders.LXMLDocumentBuilder,
+                                        'users.xml', field='users'):
+                print(user.id)
+
+        :param builder_class: builder class
+            (:py:class:`composite.builders.BaseDocumentBuilder`)
+        :param source: source file name or file object
+        :param str field: list field name
+        :rtype: generator
+        :return: parsed list field items
+        """
+        return builder_class.iterparse(cls, source, field)
+
+    @classmethod
+    def feed_parser(cls, builder_class, field=None, only=None, exclude=None):
+        """
+        get push parser, source is fed by chunks as soon as they arrive
+        (sockets, message queues), ``field`` list items are available
+        while input is still arriving:
+
+        .. code-block:: python
+
+            parser = Users.feed_parser(builders.LXMLDocumentBuilder,
+                                       field='users')
+            for chunk in chunks:
+                parser.feed(chunk)
+                for user in parser.read_items():
+                    print(user.id)
+            users = parser.close()
+
+        :param builder_class: builder class
+            (:py:class:`composite.builders.BaseDocumentBuilder`)
+        :param str field: list field name whose items are returned by
+            ``read_items`` instead of being stored in the document
+        :param list[str] only: dotted field paths to parse
+        :param list[str] exclude: dotted field paths to skip
+        :rtype: composite.builders.base.BaseFeedParser
+        :return: feed parser
+        """
+        options = cls.get_parse_options(only=only, exclude=exclude)
+        return builder_class.feed_parser(cls, field, **options)
+
+    @classmethod
+    def get_parse_plan(cls, builder_class, **options):
+        """
+        get parse plan compiled for ``builder_class`` and options, it's
+        compiled once on the first use
+
+        :param builder_class: builder class
+            (:py:class:`composite.builders.BaseDocumentBuilder`)
+        :param options: parse options, see :py:meth:`get_parse_options`
+        :rtype: composite.plans.ParsePlan
+        :return: compiled parse plan
+        """
+        if options:
+            options = cls.get_parse_options(**options)
+            return get_plan(ParsePlan, cls, builder_class, **options)
+        plan = cls._plans.get((ParsePlan, builder_class))
+        if plan is None:
+            plan = get_plan(ParsePlan, cls, builder_class)
+        return plan
+
     @classmethod
     def build(cls, builder_class, document, node_name='Document'):
         """
@@ -131,6 +422,46 @@ class Document(six.with_metaclass(DocumentMeta)):
         builder = builder_class(document)
         return builder.build(node_name)
 
+    @classmethod
+    def get_build_plan(cls, builder_class):
+        """
+        get build plan compiled for ``builder_class``, it's compiled
+        once on the first use
+
+        :param builder_class: builder class
+            (:py:class:`composite.builders.BaseDocumentBuilder`)
+        :rtype: composite.plans.BuildPlan
+        :return: compiled build plan
+        """
+        plan = cls._plans.get((BuildPlan, builder_class))
+        if plan is None:
+            plan = get_plan(BuildPlan, cls, builder_class)
+        return plan
+
+    @classmethod
+    def write(cls, builder_class, document, target, node_name='Document'):
+        """
+        build document incrementally into ``target`` file, ``ListNode`` and
+        ``ListField`` values could be generators:
+
+        .. code-block:: python
+
+            users = Users()
+            users.users = (make_user(row) for row in rows)
+            Users.write(builders.LXMLDocumentBuilder, users, 'users.xml')
+
+        :param builder_class: builder class
+            (:py:class:`composite.builders.BaseDocumentBuilder`)
+        :param composite.Document document: python instance
+            (:py:class:`composite.Document`)
+        :param target: file name or binary file object
+        :param str node_name: document node name
+        :rtype: None
+        :return: None
+        """
+        builder = builder_class(document)
+        builder.write(target, node_name)
+
     def has_attributes(self):
         """
         if document has attributes
@@ -180,6 +511,8 @@ class DocumentAttribute(Document):
         User.build(builders.PythonDocumentBuilder, user)
         {'name': 'Alice', '_attributes': {'age': 10, 'gender': 'female'}}
     """
+    __slots__ = ()
+
     def get_attribute_fields(self):
         """
         get attribute fields
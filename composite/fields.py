@@ -5,6 +5,15 @@
 .. moduleauthor:: NickolasFox <tarvitz@blacklibrary.ru>
 .. sectionauthor:: NickolasFox <tarvitz@blacklibrary.ru>
 """
+from array import array
+from functools import partial
+
+from .columns import Columns, DEFAULT_TYPECODES
+from .const import ATTRIBUTES_META_CLASS
+from .exceptions import ImproperlyConfigured
+
+#: array typecodes storing float numbers, others store integers
+FLOAT_TYPECODES = 'fd'
 
 
 class BaseField(object):
@@ -21,11 +30,38 @@ class BaseField(object):
         self.type = type
         self.default = default
 
+    def __get__(self, instance, owner):
+        #: documents get here for fields missing in instance dict only:
+        #: pending nodes of lazy parsed documents and fields with
+        #: defaults created on the first access
+        if instance is None:
+            return self
+        field_name = owner._fields_mapping.get(self.name)
+        if field_name is None or owner._fields[field_name] is not self:
+            #: field inherited from other document class, it's not a field
+            #: of the owner, so ``getattr`` with default falls back
+            raise AttributeError(
+                "'%s' object has no field `%s`" % (owner.__name__, self.name))
+        return instance._missing_field(field_name)
+
+    @property
+    def factory(self):
+        """
+        callable makes blank field value for new documents
+
+        :rtype: callable
+        :return: factory
+        """
+        return self.type
+
 
 class MetaListField(BaseField):
     """
     For list fields, list nodes, list etc usage
     """
+    @property
+    def factory(self):
+        return list
 
 
 class Field(BaseField):
@@ -44,10 +80,10 @@ class Field(BaseField):
         method call with given source.
 
         :param any source: any source data
-        :rtype: None
-        :return: None
+        :rtype: any
+        :return: visitor result
         """
-        visitor.visit_field(self, source)
+        return visitor.visit_field(self, source)
 
 
 class ListField(MetaListField):
@@ -66,10 +102,57 @@ class ListField(MetaListField):
         method call with given source.
 
         :param any source: any source data
-        :rtype: None
-        :return: None
+        :rtype: any
+        :return: visitor result
+        """
+        return visitor.visit_list_field(self, source)
+
+
+class ArrayField(ListField):
+    """
+    List of numbers stored in :py:class:`array.array` with given
+    ``typecode`` instead of list of boxed python numbers, values are
+    converted in bulk where source allows it:
+
+    .. code-block:: python
+
+        values = ArrayField('values', 'q')  # array('q'), 64-bit integers
+        weights = ArrayField('weights', 'd')  # array('d'), C double values
+
+    Array supports buffer protocol, so it could be used with numpy without
+    copying: ``numpy.frombuffer(doc.values, dtype=doc.values.typecode)``.
+    Any iterable of numbers (numpy arrays as well) could be built.
+    """
+    def __init__(self, name, typecode, default=None):
         """
-        visitor.visit_list_field(self, source)
+        initiate array field object
+
+        :param str name: field name
+        :param str typecode: :py:mod:`array` typecode
+        :param default: default value
+        :raises ValueError:
+            - if typecode is not supported by :py:mod:`array`
+        """
+        array(typecode)
+        typ = float if typecode in FLOAT_TYPECODES else int
+        super(ArrayField, self).__init__(name, typ, default)
+        self.typecode = typecode
+
+    @property
+    def factory(self):
+        return partial(array, self.typecode)
+
+    def visit(self, visitor, source):
+        """
+        invoke visitor's
+        :py:func:`composite.visitors.FieldVisitor.visit_array_field`
+        method call with given source.
+
+        :param any source: any source data
+        :rtype: any
+        :return: visitor result
+        """
+        return visitor.visit_array_field(self, source)
 
 
 class AttributeField(BaseField):
@@ -88,10 +171,10 @@ class AttributeField(BaseField):
         method call with given source.
 
         :param any source: base data types source data
-        :rtype: None
-        :return: None
+        :rtype: any
+        :return: visitor result
         """
-        visitor.visit_attribute_field(self, source)
+        return visitor.visit_attribute_field(self, source)
 
 
 class Node(BaseField):
@@ -120,8 +203,8 @@ class Node(BaseField):
         method call with given source.
 
         :param any source: any source of data
-        :rtype: None
-        :return: None
+        :rtype: any
+        :return: visitor result
         """
         return visitor.visit_node(self, source)
 
@@ -147,7 +230,68 @@ class ListNode(MetaListField):
         method call with given source.
 
         :param any source: any source of data
-        :rtype: None
-        :return: None
+        :rtype: any
+        :return: visitor result
         """
         return visitor.visit_list_node(self, source)
+
+
+class ColumnListNode(ListNode):
+    """
+    List of flat nodes (documents with :py:class:`Field` fields only) stored
+    in :py:class:`composite.columns.Columns`, one typed column per document
+    field instead of one python object per item:
+
+    .. code-block:: python
+        :emphasize-lines: 6
+
+        class Vector(Document):
+            x = Field('x', float)
+            y = Field('y', float)
+
+        class Vectors(Document):
+            vectors = ColumnListNode('vector', Vector)
+
+    Column typecodes are taken from
+    :py:data:`composite.columns.DEFAULT_TYPECODES` by field types and could
+    be overridden with ``typecodes`` (``None`` typecode stands for list).
+    """
+    def __init__(self, name, type, default=None, typecodes=None):
+        """
+        initiate column list node object
+
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if node document is not flat
+        """
+        super(ColumnListNode, self).__init__(name, type, default)
+        errors = [
+            {'msg': "Field `%s` has type `%r`" % (field_name, item.__class__)}
+            for field_name, item in type._fields.items()
+            if item.__class__ is not Field
+        ]
+        if errors or getattr(type, ATTRIBUTES_META_CLASS, None):
+            raise ImproperlyConfigured(
+                "Column list node document should be configured with "
+                "`Field` only and have no attributes", errors
+            )
+        self.typecodes = dict(
+            (field_name, DEFAULT_TYPECODES.get(item.type))
+            for field_name, item in type._fields.items()
+        )
+        self.typecodes.update(typecodes or {})
+
+    @property
+    def factory(self):
+        return partial(Columns, self.type, self.typecodes)
+
+    def visit(self, visitor, source):
+        """
+        invoke visitor's
+        :py:func:`composite.visitors.FieldVisitor.visit_column_list_node`
+        method call with given source.
+
+        :param any source: any source of data
+        :rtype: any
+        :return: visitor result
+        """
+        return visitor.visit_column_list_node(self, source)
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.memory
+    :synopsis: Memory accounting of parsed document trees
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Instance count and deep size of document tree per document class and
+field, ``sys.getsizeof`` of a document does not count its field values:
+
+.. code-block:: python
+
+    from composite.memory import get_memory_usage
+
+    usage = get_memory_usage(users)
+    usage.as_dict()
+    # {'Users': {'instances': 1, 'bytes': 56, 'deep_bytes': 288,
+    #            'fields': {'users': {'values': 1, 'bytes': 232}}},
+    #  'User': {...}, 'User.Attributes': {...}}
+    print(usage.format())
+
+Every document is counted in its own class, so values of ``Node`` and
+``ListNode`` fields are their list containers only, attribute documents
+are counted in ``Attributes`` classes and are values of ``_attributes``
+pseudo field, pending nodes of lazy parsed documents are values of
+``_lazy`` one. Objects shared between documents (immutable defaults for
+example) are counted once, where they are met first. Fields are counted
+where documents store them (instance ``__dict__`` or slots), so unset
+fields with defaults on the first access are not counted at all.
+
+:py:func:`trace_parse` attributes memory allocated by parse to source
+lines with :py:mod:`tracemalloc` (python 3.4+).
+"""
+import sys
+from collections import OrderedDict
+
+from .columns import Columns
+from .documents import Document
+from .exceptions import ImproperlyConfigured
+from .profiling import get_document_name
+
+try:
+    import tracemalloc
+except ImportError:  #: pragma: no cover, python 2
+    tracemalloc = None
+
+#: slot names of document classes
+_slot_names = {}
+
+
+def get_slot_names(document_class):
+    """
+    get slot names of document class and its bases
+
+    :param type document_class: document class
+    :rtype: tuple[str]
+    :return: slot names
+    """
+    names = _slot_names.get(document_class)
+    if names is None:
+        names = _slot_names[document_class] = tuple(
+            name
+            for klass in reversed(document_class.__mro__)
+            for name in klass.__dict__.get('__slots__', ())
+            if name not in ('__dict__', '__weakref__')
+        )
+    return names
+
+
+def iterate_stored(document):
+    """
+    iterate through values document stores, it does not trigger defaults
+    creation and lazy parse of missing fields
+
+    :param composite.Document document: document
+    :rtype: generator
+    :return: generator with tuple[attribute name, value]
+    """
+    for name in get_slot_names(document.__class__):
+        try:
+            value = object.__getattribute__(document, name)
+        except AttributeError:
+            continue
+        yield name, value
+    storage = document.__dict__ if hasattr(document, '__dict__') else None
+    if storage:
+        for item in storage.items():
+            yield item
+
+
+def get_deep_size(value, seen, documents):
+    """
+    get size of value with everything it refers to except documents,
+    they are appended to ``documents`` instead
+
+    :param any value: value
+    :param set seen: ids of objects already counted
+    :param list documents: documents met
+    :rtype: int
+    :return: size in bytes
+    """
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, Document):
+        documents.append(value)
+        return 0
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += (get_deep_size(key, seen, documents) +
+                     get_deep_size(item, seen, documents))
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += get_deep_size(item, seen, documents)
+    elif isinstance(value, Columns):
+        size += (get_deep_size(value.names, seen, documents) +
+                 get_deep_size(value.columns, seen, documents))
+    return size
+
+
+class FieldUsage(object):
+    """
+    Memory usage of document class field
+    """
+    __slots__ = ['values', 'bytes']
+
+    def __init__(self):
+        #: number of stored values
+        self.values = 0
+        #: deep size of values, nested documents are not included
+        self.bytes = 0
+
+
+class ClassUsage(object):
+    """
+    Memory usage of document class instances
+    """
+    __slots__ = ['instances', 'bytes', 'fields']
+
+    def __init__(self):
+        #: number of instances
+        self.instances = 0
+        #: size of instances and their ``__dict__``
+        self.bytes = 0
+        #: field name -> field usage
+        self.fields = OrderedDict()
+
+    @property
+    def deep_bytes(self):
+        """
+        size of instances with their field values
+
+        :rtype: int
+        :return: size in bytes
+        """
+        return self.bytes + sum(usage.bytes for usage in self.fields.values())
+
+
+class MemoryUsage(object):
+    """
+    Memory usage of document tree, see :py:mod:`composite.memory`
+    """
+    def __init__(self):
+        #: document name -> class usage
+        self.classes = OrderedDict()
+        #: ids of objects already counted
+        self.seen = set()
+
+    @property
+    def total(self):
+        """
+        deep size of document tree
+
+        :rtype: int
+        :return: size in bytes
+        """
+        return sum(usage.deep_bytes for usage in self.classes.values())
+
+    def add(self, document):
+        """
+        count document tree, objects counted before are skipped
+
+        :param composite.Document document: document
+        :rtype: None
+        :return: None
+        """
+        seen = self.seen
+        if id(document) in seen:
+            return
+        seen.add(id(document))
+        documents = [document]
+        while documents:
+            document = documents.pop()
+            name = get_document_name(document.__class__)
+            usage = self.classes.get(name)
+            if usage is None:
+                usage = self.classes[name] = ClassUsage()
+            usage.instances += 1
+            usage.bytes += sys.getsizeof(document)
+            if hasattr(document, '__dict__'):
+                usage.bytes += sys.getsizeof(document.__dict__)
+            nested = []
+            for field_name, value in iterate_stored(document):
+                field_usage = usage.fields.get(field_name)
+                if field_usage is None:
+                    field_usage = usage.fields[field_name] = FieldUsage()
+                field_usage.values += 1
+                field_usage.bytes += get_deep_size(value, seen, nested)
+            #: keep document order of nested documents
+            documents.extend(reversed(nested))
+
+    def as_dict(self):
+        """
+        export usage
+
+        :rtype: dict
+        :return: ``{document name: {'instances': number, 'bytes': size,
+            'deep_bytes': size, 'fields': {field name: {'values': number,
+            'bytes': size}}}}``
+        """
+        return OrderedDict(
+            (name, {
+                'instances': usage.instances,
+                'bytes': usage.bytes,
+                'deep_bytes': usage.deep_bytes,
+                'fields': OrderedDict(
+                    (field_name, {'values': field_usage.values,
+                                  'bytes': field_usage.bytes})
+                    for field_name, field_usage in usage.fields.items()
+                ),
+            })
+            for name, usage in self.classes.items()
+        )
+
+    def format(self):
+        """
+        format usage as text table, classes go from the biggest one
+
+        :rtype: str
+        :return: table
+        """
+        lines = ['%-32s %10s %12s %12s' % ('document / field', 'count',
+                                           'bytes', 'deep bytes')]
+        classes = sorted(self.classes.items(),
+                         key=lambda item: -item[1].deep_bytes)
+        for name, usage in classes:
+            lines.append('%-32s %10d %12d %12d' % (
+                name, usage.instances, usage.bytes, usage.deep_bytes))
+            for field_name, field_usage in usage.fields.items():
+                lines.append('  %-30s %10d %12d' % (
+                    field_name, field_usage.values, field_usage.bytes))
+        lines.append('%-32s %10s %12s %12d' % ('total', '', '', self.total))
+        return '\n'.join(lines) + '\n'
+
+
+def get_memory_usage(*documents):
+    """
+    get memory usage of document trees
+
+    :param composite.Document documents: documents
+    :rtype: MemoryUsage
+    :return: memory usage
+    """
+    usage = MemoryUsage()
+    for document in documents:
+        usage.add(document)
+    return usage
+
+
+def trace_parse(document_class, builder_class, source, limit=10, **options):
+    """
+    parse source tracing memory allocations with :py:mod:`tracemalloc`
+
+    .. code-block:: python
+
+        users, allocations = trace_parse(Users, LXMLDocumentBuilder, source)
+        allocations['sites'][0]
+        # {'location': '.../composite/visitors/compilers.py:120',
+        #  'bytes': 1048576, 'count': 8192}
+
+    :param type document_class: document class
+    :param builder_class: builder class
+    :param source: source data
+    :param int limit: number of allocation sites to report
+    :param options: parse options, see
+        :py:meth:`composite.documents.Document.parse`
+    :rtype: tuple
+    :return: tuple[document, allocations], allocations are ``retained``
+        bytes parse left allocated, ``peak`` traced bytes (if tracing was
+        not started before) and ``sites``, source lines allocated the most
+        retained bytes
+    :raises composite.exceptions.ImproperlyConfigured:
+        - if python has no :py:mod:`tracemalloc`
+    """
+    if tracemalloc is None:  #: pragma: no cover
+        raise ImproperlyConfigured("tracemalloc requires python 3.4+")
+    start = not tracemalloc.is_tracing()
+    if start:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        document = document_class.parse(builder_class, source, **options)
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1] if start else None
+    finally:
+        if start:
+            tracemalloc.stop()
+
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    statistics = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), 'lineno')
+    return document, {
+        'retained': sum(stat.size_diff for stat in statistics),
+        'peak': peak,
+        'sites': [
+            {'location': '%s:%d' % (stat.traceback[0].filename,
+                                    stat.traceback[0].lineno),
+             'bytes': stat.size_diff,
+             'count': stat.count_diff}
+            for stat in statistics[:limit] if stat.size_diff > 0
+        ],
+    }
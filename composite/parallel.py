@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.parallel
+    :synopsis: Parallel parse of big list nodes in process pool
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+``ListNode`` items are collected into chunks, every chunk is dumped into
+picklable form by the builder (xml chunk for
+:py:class:`composite.builders.LXMLDocumentBuilder`, dicts for
+:py:class:`composite.builders.PythonDocumentBuilder`) and parsed in worker
+processes. Parsed documents come back in compact state form (tuples of
+field values, see :py:class:`composite.plans.StatePlan`) and are
+reassembled in source order, other fields are parsed in the calling
+process:
+
+.. code-block:: python
+
+    from composite import parallel
+
+    users = parallel.parse(Users, LXMLDocumentBuilder, source,
+                           max_workers=32)
+
+Documents should be importable by name (module level classes), so worker
+processes could unpickle them.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from .fields import ListNode, ColumnListNode
+from .plans import StatePlan, get_child_options, get_plan
+
+#: number of list node items parsed by one worker task
+CHUNK_SIZE = 1000
+
+
+def parse_nodes(document_class, builder_class, options, data):
+    """
+    parse chunk of list node items in worker process
+
+    :param type document_class: item document class
+    :param builder_class: builder class
+    :param dict options: item parse plan options
+    :param data: items dumped with builder ``dump_nodes``
+    :rtype: list[tuple]
+    :return: parsed items states
+    """
+    parse = document_class.get_parse_plan(builder_class, **options).parse
+    dump = get_plan(StatePlan, document_class).dump
+    return [dump(parse(node)) for node in builder_class.load_nodes(data)]
+
+
+class ChunkCollector(object):
+    """
+    Collects raw items of one list node and submits them to executor by
+    chunks, it's used as the list node setter
+    """
+    def __init__(self, executor, builder_class, document_class, options,
+                 chunk_size=CHUNK_SIZE):
+        """
+        initiate collector
+
+        :param concurrent.futures.Executor executor: executor
+        :param builder_class: builder class
+        :param type document_class: item document class
+        :param dict options: item parse plan options
+        :param int chunk_size: number of items per task
+        """
+        self.executor = executor
+        self.builder_class = builder_class
+        self.document_class = document_class
+        self.options = options
+        self.chunk_size = chunk_size
+        self.pending = []
+        self.futures = []
+
+    def __call__(self, document, raw_node):
+        chunk_size = self.chunk_size
+        for item in self.builder_class.iterate_list_node(raw_node):
+            self.pending.append(item)
+            if len(self.pending) >= chunk_size:
+                self.submit()
+
+    def submit(self):
+        """
+        submit pending items
+
+        :rtype: None
+        :return: None
+        """
+        if not self.pending:
+            return
+        builder_class = self.builder_class
+        self.futures.append(self.executor.submit(
+            parse_nodes, self.document_class, builder_class, self.options,
+            builder_class.dump_nodes(self.pending)
+        ))
+        self.pending = []
+
+    def results(self):
+        """
+        iterate through parsed items in source order
+
+        :rtype: generator
+        :return: parsed items
+        """
+        self.submit()
+        load = get_plan(StatePlan, self.document_class).load
+        for future in self.futures:
+            for state in future.result():
+                yield load(state)
+
+
+def parse(document_class, builder_class, source, executor=None,
+          max_workers=None, chunk_size=CHUNK_SIZE, only=None, exclude=None):
+    """
+    parse document, its ``ListNode`` items are parsed in process pool
+
+    :param type document_class: document class
+    :param builder_class: builder class supporting nodes dump
+        (:py:class:`composite.builders.LXMLDocumentBuilder`,
+        :py:class:`composite.builders.PythonDocumentBuilder`)
+    :param source: source data
+    :param concurrent.futures.Executor executor: executor to use, new
+        :py:class:`concurrent.futures.ProcessPoolExecutor` is started for
+        the parse if it's not given
+    :param int max_workers: number of worker processes of new executor
+    :param int chunk_size: number of list items per worker task
+    :param list[str] only: dotted field paths to parse
+    :param list[str] exclude: dotted field paths to skip
+    :rtype: composite.Document
+    :return: document instance
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers) as executor:
+            return parse(document_class, builder_class, source, executor,
+                         chunk_size=chunk_size, only=only, exclude=exclude)
+
+    options = document_class.get_parse_options(only=only, exclude=exclude)
+    plan = document_class.get_parse_plan(builder_class, **options)
+    setters = dict(plan.setters)
+    collectors = []
+    for field_name, field in document_class._fields.items():
+        if (not isinstance(field, ListNode) or
+                isinstance(field, ColumnListNode) or
+                field.name not in setters):
+            continue
+        collector = ChunkCollector(
+            executor, builder_class, field.type,
+            get_child_options(options, field_name), chunk_size
+        )
+        setters[field.name] = collector
+        collectors.append((field_name, collector))
+
+    document = plan.fill(document_class.blank(), source, setters)
+    for field_name, collector in collectors:
+        getattr(document, field_name).extend(collector.results())
+    return document
@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.plans
+    :synopsis: Compiled per-schema parse and build plans
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+"""
+import threading
+
+import six
+
+from .columns import Columns
+from .const import ATTRIBUTES_META_CLASS
+from .exceptions import ImproperlyConfigured
+from .fields import Node, ListNode, ColumnListNode, MetaListField
+
+#: projection path of document attributes
+ATTRIBUTES_PATH = 'attributes'
+
+#: guards plan compilation, reentrant as nested documents compile
+#: their own plans while the parent one is being compiled
+_lock = threading.RLock()
+#: plans being compiled right now, published only after the outermost
+#: compilation finishes so other threads never see half-built plans
+_compiling = {}
+
+
+def get_child_options(options, field_name):
+    """
+    get plan options for nested document of ``field_name`` field, for
+    example ``only={'ceo.sign', 'title'}`` turns into ``only={'sign'}``
+    for ``ceo`` node
+
+    :param dict options: plan options
+    :param str field_name: document field name (or ``attributes``)
+    :rtype: dict
+    :return: nested plan options, only non default ones
+    """
+    prefix = field_name + '.'
+    child_options = {}
+    if options.get('lazy'):
+        child_options['lazy'] = True
+    only = options.get('only')
+    if only is not None and field_name not in only:
+        child_options['only'] = frozenset(
+            path[len(prefix):] for path in only if path.startswith(prefix)
+        )
+    exclude = frozenset(
+        path[len(prefix):] for path in options.get('exclude') or ()
+        if path.startswith(prefix)
+    )
+    if exclude:
+        child_options['exclude'] = exclude
+    if options.get('profiler') is not None:
+        child_options['profiler'] = options['profiler']
+    return child_options
+
+
+def lazy_setter(name, setter):
+    """
+    wraps node setter, so it keeps raw node in document pending nodes
+    instead of parsing it. Node is parsed with ``setter`` on the first
+    document attribute access, see
+    :py:meth:`composite.documents.Document.materialize`
+
+    :param str name: document attribute name
+    :param callable setter: node setter
+    :rtype: callable
+    :return: lazy setter
+    """
+    def setter_lazy(document, raw_node):
+        try:
+            pending = document._lazy
+        except AttributeError:
+            pending = document._lazy = {}
+        nodes = pending.get(name)
+        if nodes is None:
+            nodes = pending[name] = (setter, [])
+            try:
+                delattr(document, name)
+            except AttributeError:
+                pass
+        nodes[1].append(raw_node)
+    return setter_lazy
+
+
+class ParsePlan(object):
+    """
+    Parse plan compiled once per (document class, builder class, options).
+    It keeps ``tag -> setter`` table built with builder's parse compiler
+    (see :py:mod:`composite.visitors.compilers`) so parse loop does neither
+    visitor double dispatch nor field map lookups.
+
+    Options:
+
+    - ``lazy``, ``Node`` and ``ListNode`` fields keep raw source and are
+      parsed on the first access only
+    - ``only``, dotted field paths to parse (``attributes`` path stands for
+      document attributes), other fields are skipped along with their
+      subtrees and keep default values
+    - ``exclude``, dotted field paths to skip
+    """
+    __slots__ = ['document_class', 'builder_class', 'setters',
+                 'attributes', 'iterate', 'build_attributes', 'options']
+
+    def __init__(self, document_class, builder_class, **options):
+        self.document_class = document_class
+        self.builder_class = builder_class
+        self.setters = {}
+        self.attributes = None
+        self.iterate = builder_class.iterate
+        self.build_attributes = None
+        self.options = options
+
+    def is_included(self, field_name):
+        """
+        if field (or ``attributes``) is included into projection
+
+        :param str field_name: document field name
+        :rtype: bool
+        :return: True if field should be parsed
+        """
+        only = self.options.get('only')
+        if only is not None and not any(
+                path.split('.', 1)[0] == field_name for path in only):
+            return False
+        return field_name not in (self.options.get('exclude') or ())
+
+    def check_projection(self):
+        """
+        check projection paths refer existing fields
+
+        :rtype: None
+        :return: None
+        :raises composite.exceptions.ImproperlyConfigured:
+            - if projection path refers unknown field
+        """
+        names = set(self.document_class._fields)
+        names.add(ATTRIBUTES_PATH)
+        paths = set(self.options.get('only') or ())
+        paths.update(self.options.get('exclude') or ())
+        errors = [
+            {'msg': "Field `%s` is not found" % path}
+            for path in sorted(paths) if path.split('.', 1)[0] not in names
+        ]
+        if errors:
+            raise ImproperlyConfigured(
+                "`%s` projection refers unknown fields" % (
+                    self.document_class.__name__), errors
+            )
+
+    def compile(self):
+        """
+        compile field setters table
+
+        :rtype: None
+        :return: None
+        """
+        self.check_projection()
+        document_class = self.document_class
+        builder = self.builder_class(None)
+        options = self.options
+        compiler = builder.get_parse_compiler(document_class, **options)
+
+        lazy = options.get('lazy')
+        profiler = options.get('profiler')
+        setters = self.setters
+        for field_name, field in document_class._fields.items():
+            if not self.is_included(field_name):
+                continue
+            if profiler is not None:
+                field = profiler.instrument_field(document_class, field_name,
+                                                  field)
+            setter = field.visit(compiler, field_name)
+            if (lazy and isinstance(field, (Node, ListNode)) and
+                    not isinstance(field, ColumnListNode)):
+                setter = lazy_setter(field_name, setter)
+            if profiler is not None:
+                setter = profiler.instrument_setter(document_class,
+                                                    field_name, setter)
+            setters[field.name] = setter
+        if profiler is not None:
+            self.setters = profiler.instrument_setters(document_class,
+                                                       setters)
+
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class and self.is_included(ATTRIBUTES_PATH):
+            self.attributes = attribute_class.get_parse_plan(
+                self.builder_class,
+                **get_child_options(options, ATTRIBUTES_PATH)
+            )
+            self.build_attributes = builder.build_attributes
+
+    def fill(self, document, source, setters=None):
+        """
+        fill document with source data
+
+        :param composite.documents.Document document: document instance
+        :param source: source data
+        :param dict setters: ``tag -> setter`` table to use instead of
+            compiled one
+        :rtype: composite.documents.Document
+        :return: document instance
+        """
+        attributes = self.attributes
+        if attributes is not None:
+            document._attributes = attributes.parse(
+                self.build_attributes(source))
+
+        if setters is None:
+            setters = self.setters
+        for name, node in self.iterate(source):
+            setter = setters.get(name)
+            if setter is not None:
+                setter(document, node)
+        return document
+
+    def parse(self, source):
+        """
+        parse source into new document instance
+
+        :param source: source data
+        :rtype: composite.documents.Document
+        :return: document instance
+        """
+        return self.fill(self.document_class.blank(), source)
+
+
+class BuildPlan(object):
+    """
+    Build plan compiled once per (document class, builder class) pair.
+    It keeps ``(attribute name, emitter)`` pairs built with builder's build
+    compiler (see :py:mod:`composite.visitors.compilers`), so nested
+    documents are emitted straight into the output object without builder
+    and visitor instances per node.
+    """
+    __slots__ = ['document_class', 'builder_class', 'emitters',
+                 'attribute_emitters', 'build_object', 'init_blank_attributes']
+
+    def __init__(self, document_class, builder_class):
+        self.document_class = document_class
+        self.builder_class = builder_class
+        self.emitters = ()
+        self.attribute_emitters = ()
+        self.build_object = None
+        self.init_blank_attributes = None
+
+    def compile(self):
+        """
+        compile field emitters
+
+        :rtype: None
+        :return: None
+        """
+        document_class = self.document_class
+        builder = self.builder_class(None)
+        compiler = builder.get_build_compiler(document_class)
+        self.build_object = builder.build_object
+        self.init_blank_attributes = builder.init_blank_attributes
+
+        self.emitters = tuple(
+            (field_name, field.visit(compiler, field_name))
+            for field_name, field in document_class._fields.items()
+        )
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class:
+            self.attribute_emitters = tuple(
+                (field_name, field.visit(compiler, field_name))
+                for field_name, field in attribute_class._fields.items()
+            )
+
+    def build(self, document, node_name):
+        """
+        build document
+
+        :param composite.documents.Document document: document instance
+        :param str node_name: node name
+        :rtype: any
+        :return: built instance
+        """
+        source_object = self.build_object(node_name)
+        for field_name, emit in self.emitters:
+            emit(source_object, getattr(document, field_name))
+
+        attribute_emitters = self.attribute_emitters
+        if attribute_emitters and document.has_attributes():
+            attributes = document._attributes
+            self.init_blank_attributes(source_object)
+            for field_name, emit in attribute_emitters:
+                emit(source_object, getattr(attributes, field_name))
+        return source_object
+
+
+def copy_value(value):
+    """
+    copy list field value
+
+    :param value: list, array or columns
+    :return: value copy
+    """
+    if isinstance(value, Columns):
+        return value.copy()
+    return value[:] if value is not None else None
+
+
+class StatePlan(object):
+    """
+    State plan compiled once per document class. It keeps generated
+    ``dump`` and ``load`` functions converting documents into compact
+    picklable state (tuple of field values in ``_fields`` order, nested
+    documents as nested states, attributes state is the last item) and back,
+    so documents could be transferred between processes without per object
+    pickle machinery. List values are copied both ways, states never share
+    mutable values with documents, so they could be kept and loaded many
+    times (:py:class:`composite.cache.ParseCache`).
+    """
+    __slots__ = ['document_class', 'builder_class', 'dump', 'load']
+
+    def __init__(self, document_class, builder_class=None):
+        self.document_class = document_class
+        self.builder_class = builder_class
+        self.dump = None
+        self.load = None
+
+    def compile(self):
+        """
+        compile dump and load functions
+
+        :rtype: None
+        :return: None
+        """
+        document_class = self.document_class
+        namespace = {'document_class': document_class,
+                     'new': document_class.__new__, 'copy': copy_value}
+        dump_items, load_items = [], []
+        for index, (field_name, field) in enumerate(
+                document_class._fields.items()):
+            value = 'document.%s' % field_name
+            state = 'state[%d]' % index
+            if isinstance(field, (Node, ListNode)) and not isinstance(
+                    field, ColumnListNode):
+                plan = 'plan_%d' % index
+                namespace[plan] = get_plan(StatePlan, field.type)
+                if isinstance(field, ListNode):
+                    value = '[%s.dump(x) for x in %s]' % (plan, value)
+                    state = '[%s.load(x) for x in %s]' % (plan, state)
+                else:
+                    value = '%s.dump(%s)' % (plan, value)
+                    state = '%s.load(%s)' % (plan, state)
+            elif isinstance(field, MetaListField):
+                value = 'copy(%s)' % value
+                state = 'copy(%s)' % state
+            dump_items.append(value)
+            load_items.append((field_name, state))
+
+        index = len(dump_items)
+        attribute_class = getattr(document_class, ATTRIBUTES_META_CLASS, None)
+        if attribute_class:
+            namespace['attributes_plan'] = get_plan(StatePlan,
+                                                    attribute_class)
+            dump_items.append(
+                "attributes_plan.dump(document._attributes) "
+                "if document.has_attributes() else None"
+            )
+
+        lines = ['def dump(document):',
+                 '    return (%s, )' % ', '.join(dump_items or ['None'])]
+        lines.append('def load(state):')
+        values = '{%s}' % ', '.join('%r: %s' % (field_name, state)
+                                    for field_name, state in load_items)
+        has_dict = hasattr(document_class.blank(), '__dict__')
+        if document_class._custom_init:
+            #: overridden ``__init__`` runs as it does on parse, attributes
+            #: it sets are kept
+            lines.append('    document = document_class()')
+            if has_dict:
+                lines.append('    document.__dict__.update(%s)' % values)
+        else:
+            lines.append('    document = new(document_class)')
+            #: documents with ``__dict__`` get it at once
+            if has_dict:
+                lines.append('    document.__dict__ = %s' % values)
+        if not has_dict:
+            lines += ['    document.%s = %s' % (field_name, state)
+                      for field_name, state in load_items]
+        if attribute_class:
+            lines += [
+                '    if state[%d] is not None:' % index,
+                '        document._attributes = attributes_plan.load('
+                'state[%d])' % index
+            ]
+        lines.append('    return document')
+        six.exec_('\n'.join(lines), namespace)
+        self.dump = namespace['dump']
+        self.load = namespace['load']
+
+
+def get_plan_key(plan_class, builder_class, options):
+    """
+    get plan key in document plans registry
+
+    :param type plan_class: plan class, for example :py:class:`ParsePlan`
+    :param builder_class: builder class
+    :param dict options: plan options, only non default ones
+    :rtype: tuple
+    :return: key
+    """
+    return (plan_class, builder_class) + tuple(sorted(options.items()))
+
+
+def get_plans_registry(document_class, options):
+    """
+    get registry keeping document plans, instrumented plans are kept by
+    their profilers (so they are dropped along with profilers), other ones
+    by document class
+
+    :param document_class: document class
+    :param dict options: plan options
+    :rtype: dict
+    :return: registry
+    """
+    profiler = options.get('profiler')
+    if profiler is None:
+        return document_class._plans
+    return profiler.plans.setdefault(document_class, {})
+
+
+def get_plan(plan_class, document_class, builder_class=None, **options):
+    """
+    get compiled plan, compiles it on first use
+
+    :param type plan_class: plan class, for example :py:class:`ParsePlan`
+    :param document_class: document class
+    :param builder_class: builder class
+    :param options: plan options, only non default ones
+    :return: compiled plan instance
+    """
+    key = get_plan_key(plan_class, builder_class, options)
+    registry = get_plans_registry(document_class, options)
+    plan = registry.get(key)
+    if plan is not None:
+        return plan
+    with _lock:
+        plan = registry.get(key)
+        if plan is not None:
+            return plan
+        pending_key = (document_class, key)
+        pending = _compiling.get(pending_key)
+        if pending is not None:
+            return pending[1]
+
+        outermost = not _compiling
+        plan = plan_class(document_class, builder_class, **options)
+        _compiling[pending_key] = registry, plan
+        try:
+            plan.compile()
+        except Exception:
+            _compiling.clear()
+            raise
+        if outermost:
+            for (_, pending), (pending_registry, compiled) in (
+                    _compiling.items()):
+                pending_registry[pending] = compiled
+            _compiling.clear()
+        return plan
@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.profiling
+    :synopsis: Per field parse profiling
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Profiler is a parse option, documents parsed with it get their own parse
+plans compiled with instrumented setters, so parse without profiler runs
+the same code as before and costs nothing extra:
+
+.. code-block:: python
+
+    from composite.profiling import Profiler
+
+    profiler = Profiler()
+    users = Users.parse(LXMLDocumentBuilder, source, profiler=profiler)
+    profiler.as_dict()
+    # {'User': {'fields': {'id': {'visits': 2, ...}}, 'skipped': 0}, ...}
+    print(profiler.as_prometheus())
+
+Profiler records per document class and field:
+
+- ``visits``, number of source nodes the field is parsed from
+- ``seconds``, time spent in field setters, it includes nested documents
+  parse for ``Node`` and ``ListNode`` fields
+- ``conversions``, ``conversion_seconds``, number of ``field.type`` calls
+  and time spent in them
+- ``bytes``, length of text values converted
+
+and number of source nodes skipped per document class, they have no
+fields (or are not included into projection).
+
+Every profiler compiles its own plans and keeps them in
+``Profiler.plans``, so they are dropped along with the profiler, reuse
+profiler instances instead of making new ones per parse. Counters are not
+synchronized, use profiler per thread. Profiler is not shared with worker
+processes (:py:mod:`composite.parallel` and :py:mod:`composite.batch`),
+documents restored from caches are not profiled.
+"""
+import copy
+import timeit
+from collections import OrderedDict
+
+import six
+
+from .fields import Node, ListNode
+
+#: counters of fields
+FIELD_COUNTERS = ('visits', 'seconds', 'conversions', 'conversion_seconds',
+                  'bytes')
+
+#: prometheus metrics of field counters, tuple[counter, metric, help]
+PROMETHEUS_METRICS = (
+    ('visits', 'field_visits_total', 'Number of parsed source nodes'),
+    ('seconds', 'field_seconds_total',
+     'Time spent in field setters, nested documents included'),
+    ('conversions', 'field_conversions_total',
+     'Number of field type conversions'),
+    ('conversion_seconds', 'field_conversion_seconds_total',
+     'Time spent in field type conversions'),
+    ('bytes', 'field_bytes_total', 'Length of converted text values'),
+)
+
+
+def get_document_name(document_class):
+    """
+    get document class name used in reports
+
+    :param type document_class: document class
+    :rtype: str
+    :return: name, qualified one for attributes classes
+    """
+    return getattr(document_class, '__qualname__', document_class.__name__)
+
+
+def escape_label(value):
+    """
+    escape prometheus label value
+
+    :param str value: value
+    :rtype: str
+    :return: escaped value
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+class FieldStats(object):
+    """
+    Field counters
+    """
+    __slots__ = FIELD_COUNTERS
+
+    def __init__(self):
+        self.visits = 0
+        self.seconds = 0.0
+        self.conversions = 0
+        self.conversion_seconds = 0.0
+        self.bytes = 0
+
+    def as_dict(self):
+        """
+        get counters
+
+        :rtype: dict
+        :return: counters
+        """
+        return dict((name, getattr(self, name)) for name in FIELD_COUNTERS)
+
+
+class ProfiledSetters(dict):
+    """
+    Plan ``tag -> setter`` table counting lookups of unknown tags, i.e.
+    source nodes skipped by builders
+    """
+    __slots__ = ['profiler', 'document_name']
+
+    def __init__(self, profiler, document_name, setters):
+        super(ProfiledSetters, self).__init__(setters)
+        self.profiler = profiler
+        self.document_name = document_name
+
+    def get(self, key, default=None):
+        setter = dict.get(self, key, default)
+        if setter is None:
+            skipped = self.profiler.skipped
+            skipped[self.document_name] = (
+                skipped.get(self.document_name, 0) + 1)
+        return setter
+
+
+class Profiler(object):
+    """
+    Parse profiler, see :py:mod:`composite.profiling`
+    """
+    def __init__(self, clock=timeit.default_timer):
+        """
+        initiate profiler
+
+        :param callable clock: clock returning seconds
+        """
+        self.clock = clock
+        #: document name -> field name -> field counters
+        self.fields = OrderedDict()
+        #: document name -> number of skipped source nodes
+        self.skipped = {}
+        #: document class -> plan key -> instrumented plan, see
+        #: :py:func:`composite.plans.get_plan`
+        self.plans = {}
+
+    def get_field_stats(self, document_class, field_name):
+        """
+        get counters of document field
+
+        :param type document_class: document class
+        :param str field_name: document field name
+        :rtype: FieldStats
+        :return: counters
+        """
+        fields = self.fields.setdefault(get_document_name(document_class),
+                                        OrderedDict())
+        stats = fields.get(field_name)
+        if stats is None:
+            stats = fields[field_name] = FieldStats()
+        return stats
+
+    def instrument_field(self, document_class, field_name, field):
+        """
+        get field copy which type conversions are counted, nested
+        document fields are returned as is
+
+        :param type document_class: document class
+        :param str field_name: document field name
+        :param composite.fields.BaseField field: field
+        :rtype: composite.fields.BaseField
+        :return: field
+        """
+        if isinstance(field, (Node, ListNode)):
+            return field
+        stats = self.get_field_stats(document_class, field_name)
+        clock, typ = self.clock, field.type
+
+        def convert(value):
+            start = clock()
+            try:
+                return typ(value)
+            finally:
+                stats.conversion_seconds += clock() - start
+                stats.conversions += 1
+                if isinstance(value, (six.binary_type, six.text_type)):
+                    stats.bytes += len(value)
+
+        instrumented = copy.copy(field)
+        instrumented.type = convert
+        return instrumented
+
+    def instrument_setter(self, document_class, field_name, setter):
+        """
+        wrap compiled setter with visits counter and timer, ``(plan,
+        setter)`` handlers of event-driven builders get their setters
+        wrapped
+
+        :param type document_class: document class
+        :param str field_name: document field name
+        :param setter: compiled setter
+        :type setter: callable | tuple
+        :rtype: callable | tuple
+        :return: instrumented setter
+        """
+        if isinstance(setter, tuple):
+            plan, setter = setter
+            return plan, self.instrument_setter(document_class, field_name,
+                                                setter)
+        stats = self.get_field_stats(document_class, field_name)
+        clock = self.clock
+
+        def instrumented(*args):
+            start = clock()
+            try:
+                return setter(*args)
+            finally:
+                stats.seconds += clock() - start
+                stats.visits += 1
+        return instrumented
+
+    def instrument_setters(self, document_class, setters):
+        """
+        get setters table counting skipped source nodes
+
+        :param type document_class: document class
+        :param dict setters: ``tag -> setter`` table
+        :rtype: ProfiledSetters
+        :return: setters table
+        """
+        document_name = get_document_name(document_class)
+        self.skipped.setdefault(document_name, 0)
+        return ProfiledSetters(self, document_name, setters)
+
+    def reset(self):
+        """
+        reset counters, instrumented plans keep working
+
+        :rtype: None
+        :return: None
+        """
+        for fields in self.fields.values():
+            for stats in fields.values():
+                stats.__init__()
+        for document_name in self.skipped:
+            self.skipped[document_name] = 0
+
+    def as_dict(self):
+        """
+        export counters
+
+        :rtype: dict
+        :return: ``{document name: {'fields': {field name: counters},
+            'skipped': number}}``
+        """
+        report = OrderedDict()
+        for document_name in list(self.fields) + sorted(
+                set(self.skipped) - set(self.fields)):
+            fields = self.fields.get(document_name, {})
+            report[document_name] = {
+                'fields': OrderedDict(
+                    (field_name, stats.as_dict())
+                    for field_name, stats in fields.items()
+                ),
+                'skipped': self.skipped.get(document_name, 0),
+            }
+        return report
+
+    def as_prometheus(self, namespace='composite'):
+        """
+        export counters in prometheus text format
+
+        :param str namespace: metrics name prefix
+        :rtype: str
+        :return: metrics
+        """
+        lines = []
+        report = self.as_dict()
+        for counter, metric, description in PROMETHEUS_METRICS:
+            name = '%s_%s' % (namespace, metric)
+            lines.append('# HELP %s %s' % (name, description))
+            lines.append('# TYPE %s counter' % name)
+            for document_name, document in report.items():
+                for field_name, counters in document['fields'].items():
+                    lines.append('%s{document="%s",field="%s"} %r' % (
+                        name, escape_label(document_name),
+                        escape_label(field_name), counters[counter]))
+        name = '%s_skipped_nodes_total' % namespace
+        lines.append('# HELP %s Number of skipped source nodes' % name)
+        lines.append('# TYPE %s counter' % name)
+        for document_name, document in report.items():
+            lines.append('%s{document="%s"} %d' % (
+                name, escape_label(document_name), document['skipped']))
+        return '\n'.join(lines) + '\n'
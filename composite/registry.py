@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.registry
+    :synopsis: Lazily imported package exports and entry points
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+
+Packages keep ``name -> module`` registry of their exports and import
+modules on the first access of their names (module ``__getattr__``,
+python 3.7+), so ``from composite.builders import PythonDocumentBuilder``
+does not import lxml. Older pythons import everything at once.
+
+Third party builders are discoverable through ``composite.builders``
+entry points group:
+
+.. code-block:: python
+
+    setup(
+        ...
+        entry_points={
+            'composite.builders': [
+                'YAMLDocumentBuilder = composite_yaml:YAMLDocumentBuilder',
+            ],
+        },
+    )
+"""
+import sys
+import importlib
+
+#: module ``__getattr__`` support, python 3.7+
+LAZY_IMPORTS = sys.version_info >= (3, 7)
+
+
+def iter_entry_points(group):
+    """
+    iterate through entry points of group, :py:mod:`importlib.metadata`
+    (python 3.8+) or ``pkg_resources`` are imported on demand only
+
+    :param str group: entry points group
+    :rtype: list
+    :return: entry points, they have ``name`` and ``load()``
+    """
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  #: pragma: no cover, python < 3.8
+        try:
+            import pkg_resources
+        except ImportError:
+            return []
+        return list(pkg_resources.iter_entry_points(group))
+    points = entry_points()
+    if hasattr(points, 'select'):
+        return list(points.select(group=group))
+    return list(points.get(group, ()))  #: pragma: no cover, python < 3.10
+
+
+class Registry(object):
+    """
+    Exports of package, names are imported from their modules on the
+    first access and cached in package namespace:
+
+    .. code-block:: python
+
+        registry = Registry(__name__, [('PythonDocumentBuilder', '.python')])
+        __all__ = registry.names
+
+        def __getattr__(name):
+            return registry.load(name)
+    """
+    def __init__(self, package, exports, entry_points_group=None):
+        """
+        initiate registry
+
+        :param str package: package name
+        :param list[tuple] exports: tuple[name, module] pairs, modules are
+            relative to package
+        :param str entry_points_group: entry points group of third party
+            objects, see :py:meth:`get`
+        """
+        self.package = package
+        self.exports = dict(exports)
+        self.names = [name for name, _ in exports]
+        self.entry_points_group = entry_points_group
+
+    def load(self, name):
+        """
+        import exported name
+
+        :param str name: exported name
+        :rtype: any
+        :return: object
+        :raises AttributeError:
+            - if name is not exported
+        """
+        module_name = self.exports.get(name)
+        if module_name is None:
+            raise AttributeError(
+                "module '%s' has no attribute '%s'" % (self.package, name))
+        module = importlib.import_module(module_name, self.package)
+        value = getattr(module, name)
+        setattr(sys.modules[self.package], name, value)
+        return value
+
+    def load_all(self):
+        """
+        import all exported names
+
+        :rtype: None
+        :return: None
+        """
+        for name in self.names:
+            self.load(name)
+
+    def get(self, name):
+        """
+        get exported object or third party one registered as entry point
+
+        :param str name: exported name or entry point name
+        :rtype: any
+        :return: object
+        :raises LookupError:
+            - if there's no such object
+        """
+        if name in self.exports:
+            return self.load(name)
+        if self.entry_points_group:
+            for entry_point in iter_entry_points(self.entry_points_group):
+                if entry_point.name == name:
+                    return entry_point.load()
+        raise LookupError("`%s` has no `%s`" % (self.package, name))
+
+    def dir(self, namespace):
+        """
+        list package names, exported ones included
+
+        :param dict namespace: package globals
+        :rtype: list[str]
+        :return: names
+        """
+        return sorted(set(namespace) | set(self.names))
@@ -1,14 +1,38 @@
 # -*- coding: utf-8 -*-
 """
 .. module:: composite.visitors
-    :synopsis: Visitors
+    :synopsis: Visitors, they are imported on the first access
     :platform: Linux, Unix, Windows
 .. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
-from .base import FieldVisitor
-from .parsers import LXMLParseVisitor, DictParseVisitor
-from .builders import LXMLBuildVisitor, DictBuildVisitor
+from ..registry import Registry, LAZY_IMPORTS
 
-__all__ = ['LXMLBuildVisitor', 'LXMLParseVisitor', 'DictBuildVisitor',
-           'DictParseVisitor', 'FieldVisitor']
+registry = Registry(__name__, [
+    ('LXMLBuildVisitor', '.builders'),
+    ('LXMLParseVisitor', '.parsers'),
+    ('DictBuildVisitor', '.builders'),
+    ('DictParseVisitor', '.parsers'),
+    ('FieldVisitor', '.base'),
+    ('ParseCompiler', '.compilers'),
+    ('LXMLParseCompiler', '.compilers'),
+    ('DictParseCompiler', '.compilers'),
+    ('EventParseCompiler', '.compilers'),
+    ('BuildCompiler', '.compilers'),
+    ('LXMLBuildCompiler', '.compilers'),
+    ('DictBuildCompiler', '.compilers'),
+])
+
+__all__ = registry.names
+
+
+def __getattr__(name):
+    return registry.load(name)
+
+
+def __dir__():
+    return registry.dir(globals())
+
+
+if not LAZY_IMPORTS:  #: pragma: no cover
+    registry.load_all()
@@ -74,9 +74,23 @@ class FieldVisitor(object):
                 </user>
             </Clients>
     """
-    def __init__(self, builder_class, composite):
+    def __init__(self, builder_class, composite, builder=None):
         self.builder_class = builder_class
         self.composite = composite
+        self.builder = builder
+
+    def parse_node(self, document_class, source):
+        """
+        parse nested document, with the visitor's builder if it's given
+
+        :param type document_class: nested document class
+        :param source: any source of data
+        :rtype: composite.documents.Document
+        :return: nested document
+        """
+        if self.builder is not None:
+            return self.builder.parse_nested(document_class, source)
+        return document_class.parse(self.builder_class, source)
 
     def visit_attribute_field(self, field, source):
         """
@@ -114,6 +128,18 @@ class FieldVisitor(object):
         """
         raise NotImplemented
 
+    def visit_array_field(self, field, source):
+        """
+        visit array field, visits it as list field by default
+
+        :param field: field to visit
+        :type field: composite.fields.ArrayField
+        :param source: any source of data
+        :rtype: None
+        :return: None
+        """
+        return self.visit_list_field(field, source)
+
     def visit_node(self, node, source):
         """
         visit node
@@ -137,3 +163,15 @@ class FieldVisitor(object):
         :return: None
         """
         raise NotImplemented
+
+    def visit_column_list_node(self, node, source):
+        """
+        visit column list node, visits it as list node by default
+
+        :param node: node field to visit
+        :type node: composite.fields.ColumnListNode
+        :param source: any source of data
+        :rtype: None
+        :return: None
+        """
+        return self.visit_list_node(node, source)
@@ -8,7 +8,6 @@
 .. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
-from lxml import etree
 from .base import FieldVisitor
 
 
@@ -23,6 +22,9 @@ class DictBuildVisitor(FieldVisitor):
     def visit_list_field(self, field, source):
         self.composite[field.name] = source
 
+    def visit_array_field(self, field, source):
+        self.composite[field.name] = [field.type(x) for x in source]
+
     def visit_list_node(self, node, source):
         self.composite[node.name] = []
         component_list = self.composite[node.name]
@@ -40,12 +42,19 @@ class DictBuildVisitor(FieldVisitor):
 
 
 class LXMLBuildVisitor(FieldVisitor):
+    def __init__(self, builder_class, composite, builder=None):
+        super(LXMLBuildVisitor, self).__init__(builder_class, composite,
+                                               builder)
+        #: lxml is imported by lxml builder users only
+        from lxml import etree
+        self.element = etree.Element
+
     def visit_node(self, node, source_node):
         self.composite.append(source_node.build(self.builder_class,
                                                 source_node, node.name))
 
     def visit_field(self, field, source_node):
-        element = etree.Element(field.name)
+        element = self.element(field.name)
         element.text = str(source_node)
         self.composite.append(element)
 
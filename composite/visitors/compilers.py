@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+.. module:: composite.visitors.compilers
+    :synopsis: Builtin parse and build compilers, they visit every document
+        field only once and return setters (emitters) for compiled plans:
+        - dict (python dict)
+        - lxml (libxml bindings)
+    :platform: Linux, Unix, Windows
+.. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+.. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
+"""
+from array import array
+from .base import FieldVisitor
+from ..columns import Columns
+from ..plans import get_child_options
+
+
+class ParseCompiler(FieldVisitor):
+    """
+    Base parse compiler. Visits fields of ``composite`` document class with
+    document attribute name as ``source`` and returns setter callable with
+    ``(document, raw_node)`` signature.
+    """
+    def __init__(self, builder_class, composite, **options):
+        super(ParseCompiler, self).__init__(builder_class, composite)
+        self.options = options
+
+    def get_node_parser(self, node):
+        """
+        get compiled parse function for node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: callable
+        :return: parse function
+        """
+        field_name = self.composite._fields_mapping[node.name]
+        options = get_child_options(self.options, field_name)
+        return node.type.get_parse_plan(self.builder_class, **options).parse
+
+    def visit_attribute_field(self, field, name):
+        typ = field.type
+
+        def setter(document, raw_node):
+            setattr(document, name, typ(raw_node))
+        return setter
+
+    def visit_node(self, node, name):
+        parse = self.get_node_parser(node)
+
+        def setter(document, raw_node):
+            setattr(document, name, parse(raw_node))
+        return setter
+
+
+class DictParseCompiler(ParseCompiler):
+    def visit_field(self, field, name):
+        typ = field.type
+
+        def setter(document, raw_node):
+            setattr(document, name, typ(raw_node))
+        return setter
+
+    def visit_list_field(self, field, name):
+        typ = field.type
+
+        def setter(document, raw_node):
+            setattr(document, name, [typ(x) for x in raw_node])
+        return setter
+
+    def visit_array_field(self, field, name):
+        typecode, typ = field.typecode, field.type
+
+        def setter(document, raw_node):
+            try:
+                #: bulk conversion, it works for numbers of the right type
+                values = array(typecode, raw_node)
+            except TypeError:
+                values = array(typecode, [typ(x) for x in raw_node])
+            setattr(document, name, values)
+        return setter
+
+    def visit_list_node(self, node, name):
+        parse = self.get_node_parser(node)
+
+        def setter(document, raw_node):
+            setattr(document, name, [parse(x) for x in raw_node])
+        return setter
+
+    def visit_column_list_node(self, node, name):
+        factory = node.factory
+        readers = [
+            (field.name, field.type, field.factory())
+            for field in node.type._fields.values()
+        ]
+
+        def setter(document, raw_node):
+            columns = factory()
+            for column, (key, typ, default) in zip(columns.columns, readers):
+                column.extend([
+                    typ(x[key]) if key in x else default for x in raw_node
+                ])
+            setattr(document, name, columns)
+        return setter
+
+
+class LXMLParseCompiler(ParseCompiler):
+    def visit_field(self, field, name):
+        typ = field.type
+
+        def setter(document, raw_node):
+            setattr(document, name, typ(raw_node.text))
+        return setter
+
+    def visit_list_field(self, field, name):
+        typ = field.type
+
+        def setter(document, raw_node):
+            getattr(document, name).append(typ(raw_node.text))
+        return setter
+
+    def visit_list_node(self, node, name):
+        parse = self.get_node_parser(node)
+
+        def setter(document, raw_node):
+            getattr(document, name).append(parse(raw_node))
+        return setter
+
+    def visit_column_list_node(self, node, name):
+        fields = list(node.type._fields.values())
+        readers = dict(
+            (field.name, (index, field.type))
+            for index, field in enumerate(fields)
+        )
+        defaults = [field.factory() for field in fields]
+
+        def setter(document, raw_node):
+            row = list(defaults)
+            for element in raw_node:
+                reader = readers.get(element.tag)
+                if reader is not None:
+                    row[reader[0]] = reader[1](element.text)
+            getattr(document, name).append_row(row)
+        return setter
+
+
+class EventParseCompiler(ParseCompiler):
+    """
+    Parse compiler of event-driven builders, element fields get
+    ``(plan, setter)`` handlers: ``plan`` is parse plan of nested document
+    (``None`` for text fields) and ``setter`` sets element text or parsed
+    nested document. Attribute fields get plain text setters.
+    """
+    def get_node_plan(self, node):
+        """
+        get compiled parse plan of node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: composite.plans.ParsePlan
+        :return: parse plan
+        """
+        field_name = self.composite._fields_mapping[node.name]
+        options = get_child_options(self.options, field_name)
+        return node.type.get_parse_plan(self.builder_class, **options)
+
+    def visit_field(self, field, name):
+        typ = field.type
+
+        def setter(document, text):
+            setattr(document, name, typ(text))
+        return None, setter
+
+    def visit_list_field(self, field, name):
+        typ = field.type
+
+        def setter(document, text):
+            getattr(document, name).append(typ(text))
+        return None, setter
+
+    def visit_node(self, node, name):
+        def setter(document, value):
+            setattr(document, name, value)
+        return self.get_node_plan(node), setter
+
+    def visit_list_node(self, node, name):
+        def setter(document, value):
+            getattr(document, name).append(value)
+        return self.get_node_plan(node), setter
+
+
+class BuildCompiler(FieldVisitor):
+    """
+    Base build compiler. Visits fields of ``composite`` document class with
+    document attribute name as ``source`` and returns emitter callable with
+    ``(source_object, value)`` signature.
+    """
+    def get_node_builder(self, node):
+        """
+        get compiled build function for node document class
+
+        :param node: node field
+        :type node: composite.fields.Node | composite.fields.ListNode
+        :rtype: callable
+        :return: build function
+        """
+        return node.type.get_build_plan(self.builder_class).build
+
+
+class DictBuildCompiler(BuildCompiler):
+    def visit_attribute_field(self, field, name):
+        key, typ = field.name, field.type
+
+        def emit(source_object, value):
+            source_object['_attributes'][key] = typ(value)
+        return emit
+
+    def visit_field(self, field, name):
+        key, typ = field.name, field.type
+
+        def emit(source_object, value):
+            source_object[key] = typ(value)
+        return emit
+
+    def visit_list_field(self, field, name):
+        key = field.name
+
+        def emit(source_object, value):
+            source_object[key] = value
+        return emit
+
+    def visit_array_field(self, field, name):
+        key, typ = field.name, field.type
+
+        def emit(source_object, value):
+            if isinstance(value, array):
+                source_object[key] = value.tolist()
+            else:
+                source_object[key] = [typ(x) for x in value]
+        return emit
+
+    def visit_node(self, node, name):
+        key, build = node.name, self.get_node_builder(node)
+
+        def emit(source_object, value):
+            source_object[key] = build(value, key)
+        return emit
+
+    def visit_list_node(self, node, name):
+        key, build = node.name, self.get_node_builder(node)
+
+        def emit(source_object, value):
+            source_object[key] = [build(x, key) for x in value]
+        return emit
+
+    def visit_column_list_node(self, node, name):
+        key, emit_list = node.name, self.visit_list_node(node, name)
+        keys = tuple(field.name for field in node.type._fields.values())
+
+        def emit(source_object, value):
+            if not isinstance(value, Columns):
+                return emit_list(source_object, value)
+            columns = [
+                column.tolist() if isinstance(column, array) else column
+                for column in value.columns
+            ]
+            source_object[key] = [dict(zip(keys, row))
+                                  for row in zip(*columns)]
+        return emit
+
+
+class LXMLBuildCompiler(BuildCompiler):
+    @property
+    def sub_element(self):
+        #: lxml is imported by lxml builder users only
+        from lxml import etree
+        return etree.SubElement
+
+    def visit_attribute_field(self, field, name):
+        key = field.name
+
+        def emit(source_object, value):
+            source_object.set(key, str(value))
+        return emit
+
+    def visit_field(self, field, name):
+        key, sub_element = field.name, self.sub_element
+
+        def emit(source_object, value):
+            sub_element(source_object, key).text = str(value)
+        return emit
+
+    def visit_list_field(self, field, name):
+        key, sub_element = field.name, self.sub_element
+
+        def emit(source_object, value):
+            for x in value:
+                sub_element(source_object, key).text = str(x)
+        return emit
+
+    def visit_node(self, node, name):
+        key, build = node.name, self.get_node_builder(node)
+
+        def emit(source_object, value):
+            source_object.append(build(value, key))
+        return emit
+
+    def visit_list_node(self, node, name):
+        key, build = node.name, self.get_node_builder(node)
+
+        def emit(source_object, value):
+            append = source_object.append
+            for x in value:
+                append(build(x, key))
+        return emit
+
+    def visit_column_list_node(self, node, name):
+        key, emit_list = node.name, self.visit_list_node(node, name)
+        keys = tuple(field.name for field in node.type._fields.values())
+        sub_element = self.sub_element
+
+        def emit(source_object, value):
+            if not isinstance(value, Columns):
+                return emit_list(source_object, value)
+            for row in zip(*value.columns):
+                element = sub_element(source_object, key)
+                for tag, x in zip(keys, row):
+                    sub_element(element, tag).text = str(x)
+        return emit
@@ -8,6 +8,7 @@
 .. moduleauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 .. sectionauthor:: Nickolas Fox <tarvitz@blacklibary.ru>
 """
+from array import array
 from .base import FieldVisitor
 
 
@@ -27,19 +28,25 @@ class DictParseVisitor(FieldVisitor):
         component_list = [typ(x) for x in raw_node]
         setattr(self.composite, name, component_list)
 
+    def visit_array_field(self, field, raw_node):
+        name = self.composite.field_map[field.name]
+        typ = field.type
+        component_array = array(field.typecode, [typ(x) for x in raw_node])
+        setattr(self.composite, name, component_array)
+
     def visit_node(self, node, raw_node):
         document = self.composite
         name = document.field_map[node.name]
-        element = node.type.parse(self.builder_class, raw_node)
+        element = self.parse_node(node.type, raw_node)
         setattr(document, name, element)
 
     def visit_list_node(self, node, raw_node):
         document = self.composite
         name = document.field_map[node.name]
         append_field = getattr(document, name)
-        builder_class = self.builder_class
+        parse_node = self.parse_node
         for value in raw_node:
-            element = node.type.parse(builder_class, value)
+            element = parse_node(node.type, value)
             append_field.append(element)
 
 
@@ -63,11 +70,11 @@ class LXMLParseVisitor(FieldVisitor):
     def visit_node(self, node, raw_node):
         document = self.composite
         name = document.field_map[node.name]
-        element = node.type.parse(self.builder_class, raw_node)
+        element = self.parse_node(node.type, raw_node)
         setattr(self.composite, name, element)
 
     def visit_list_node(self, node, raw_node):
         document = self.composite
         name = document.field_map[node.name]
-        element = node.type.parse(self.builder_class, raw_node)
+        element = self.parse_node(node.type, raw_node)
         getattr(self.composite, name).append(element)
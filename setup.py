@@ -37,6 +37,9 @@ install_requires = [
 if isinstance(py_version, tuple):
     if py_version < (2, 7):
         install_requires.append('importlib')
+    if py_version < (3, 2):
+        #: concurrent.futures backport for composite.parallel
+        install_requires.append('futures')
 
 
 setup(
@@ -52,7 +55,8 @@ setup(
     platforms=['OS Independent'],
     classifiers=CLASSIFIERS,
     install_requires=install_requires,
-    packages=find_packages(exclude=['tests', 'docs', 'documents']),
+    packages=find_packages(exclude=['tests', 'docs', 'documents',
+                                    'benchmarks']),
     test_suite='tests',
     include_package_data=True,
     zip_safe=False)
@@ -0,0 +1,7 @@
+import sys
+
+#: asyncio support (``composite.aio``) requires python 3.5.2+, async
+#: iterators return themselves from ``__aiter__``
+collect_ignore = []
+if sys.version_info < (3, 5, 2):
+    collect_ignore.append('test_aio.py')
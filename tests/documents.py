@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from composite import Document
-from composite.fields import Field, AttributeField, ListNode, ListField, Node
+from composite.fields import (
+    Field, AttributeField, ListNode, ListField, Node, ArrayField,
+    ColumnListNode
+)
 
 
 class User(Document):
@@ -74,6 +77,15 @@ class Vectors(Document):
         return self.vectors[item]
 
 
+class ColumnVectors(Document):
+    """
+    Vectors document stored in columns
+
+    :param composite.columns.Columns vectors: vector columns
+    """
+    vectors = ColumnListNode('vector', type=Vector)
+
+
 class ValueList(Document):
     """
     Value list
@@ -87,6 +99,19 @@ class ValueList(Document):
         return sum(self.values)
 
 
+class ValueArray(Document):
+    """
+    Value list stored in array
+
+    :param array.array values: values
+    """
+    values = ArrayField('values', 'l')
+
+    @property
+    def total(self):
+        return sum(self.values)
+
+
 class Company(Document):
     """
     Company document
@@ -103,3 +128,34 @@ class Company(Document):
 
     def __str__(self):
         return self.ceo.get_user_name()
+
+
+class SlotUser(Document):
+    """
+    User document stored in slots
+
+    :param int id: id
+    :param str sign: sign
+    """
+    id = Field(name='id', type=int)
+    sign = Field(name='sign', type=str)
+
+    class Attributes:
+        first_name = AttributeField(name='first_name', type=str)
+        last_name = AttributeField(name='last_name', type=str)
+        age = AttributeField(name='age', type=int)
+
+    class Meta:
+        slots = True
+
+
+class SlotUsers(Document):
+    """
+    users stored in slots
+
+    :param list[SlotUser] users: user list
+    """
+    users = ListNode(name='profile', type=SlotUser)
+
+    class Meta:
+        slots = True
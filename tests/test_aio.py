@@ -0,0 +1,121 @@
+import asyncio
+from lxml import etree
+from unittest import TestCase
+
+from tests.documents import Users, ValueList
+
+from composite import aio
+from composite.builders import ExpatDocumentBuilder, LXMLDocumentBuilder
+
+
+class ChunkIterator(object):
+    """
+    async iterator of data chunks, async generators are python 3.6+
+    """
+    def __init__(self, data, size=32):
+        self.chunks = iter([data[index:index + size]
+                            for index in range(0, len(data), size)])
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class Writer(object):
+    def __init__(self):
+        self.chunks = []
+        self.drains = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drains += 1
+
+
+class TestAsyncIO(TestCase):
+    def setUp(self):
+        with open('documents/users.xml', 'rb') as doc:
+            self.users_xml = doc.read()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_parse_stream_reader(self):
+        async def parse():
+            reader = asyncio.StreamReader()
+            reader.feed_data(self.users_xml)
+            reader.feed_eof()
+            return await aio.parse(Users, LXMLDocumentBuilder, reader,
+                                   chunk_size=64)
+        users = self.run_async(parse())
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+
+    def test_parse_iterator(self):
+        users = self.run_async(aio.parse(
+            Users, ExpatDocumentBuilder, ChunkIterator(self.users_xml)))
+        self.assertEqual([user.id for user in users], [1, 2])
+
+    def test_loop_released(self):
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def parse():
+            ticker = asyncio.ensure_future(tick())
+            users = await aio.parse(Users, LXMLDocumentBuilder,
+                                    ChunkIterator(self.users_xml))
+            ticker.cancel()
+            return users
+        self.run_async(parse())
+        self.assertGreater(len(ticks), 10)
+
+    def test_iterparse(self):
+        async def collect():
+            items = aio.iterparse(Users, LXMLDocumentBuilder,
+                                  ChunkIterator(self.users_xml),
+                                  field='users')
+            users = []
+            async for user in items:
+                users.append(user)
+            return users, items.document
+        users, document = self.run_async(collect())
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(document.users, [])
+
+    def test_iterparse_list_field(self):
+        async def total():
+            with open('documents/value_list.xml', 'rb') as doc:
+                data = doc.read()
+            items = aio.iterparse(ValueList, ExpatDocumentBuilder,
+                                  ChunkIterator(data, 8), field='values')
+            values = []
+            async for value in items:
+                values.append(value)
+            return sum(values)
+        self.assertEqual(self.run_async(total()), 55)
+
+    def test_write(self):
+        users = Users.parse(LXMLDocumentBuilder, etree.XML(self.users_xml))
+        writer = Writer()
+        self.run_async(aio.write(LXMLDocumentBuilder, users, writer,
+                                 'Users'))
+        self.assertEqual(writer.drains, len(writer.chunks))
+        self.assertGreater(len(writer.chunks), 1)
+        self.assertEqual(
+            etree.tostring(etree.XML(b''.join(writer.chunks))),
+            etree.tostring(Users.build(LXMLDocumentBuilder, users, 'Users'))
+        )
@@ -0,0 +1,73 @@
+import json
+from array import array
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import ValueArray
+
+from composite.fields import ArrayField
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class VisitorPythonDocumentBuilder(PythonDocumentBuilder):
+    parse_compiler_class = None
+    build_compiler_class = None
+
+
+class TestArrayField(TestCase):
+    def setUp(self):
+        with closing(open('documents/value_list.xml', 'r')) as doc:
+            self.xml_file = doc.read().encode('utf-8')
+
+        with closing(open('documents/value_list.json', 'r')) as doc:
+            self.json_file = doc.read()
+
+    def assert_values(self, value_array):
+        self.assertIsInstance(value_array.values, array)
+        self.assertEqual(value_array.values.typecode, 'l')
+        self.assertEqual(value_array.total, 55)
+
+    def test_default(self):
+        self.assertEqual(ValueArray().values, array('l'))
+
+    def test_typecode(self):
+        self.assertIs(ArrayField('values', 'd').type, float)
+        with self.assertRaises(ValueError):
+            ArrayField('values', 'z')
+
+    def test_from_xml(self):
+        value_array = ValueArray.parse(LXMLDocumentBuilder,
+                                       etree.XML(self.xml_file))
+        self.assert_values(value_array)
+
+    def test_to_xml(self):
+        source = ValueArray.parse(LXMLDocumentBuilder,
+                                  etree.XML(self.xml_file))
+        xml_node = ValueArray.build(LXMLDocumentBuilder, source)
+        self.assertEqual(xml_node[0].text, '1')
+        self.assert_values(ValueArray.parse(LXMLDocumentBuilder, xml_node))
+
+    def test_from_json(self):
+        value_array = ValueArray.parse(PythonDocumentBuilder,
+                                       json.loads(self.json_file))
+        self.assert_values(value_array)
+
+    def test_from_json_strings(self):
+        value_array = ValueArray.parse(
+            PythonDocumentBuilder, {'values': [str(x) for x in range(11)]})
+        self.assert_values(value_array)
+
+    def test_to_json(self):
+        source = ValueArray.parse(PythonDocumentBuilder,
+                                  json.loads(self.json_file))
+        raw = ValueArray.build(PythonDocumentBuilder, source)
+        self.assertEqual(raw, {'values': list(range(1, 11))})
+        self.assertEqual(json.loads(json.dumps(raw)), raw)
+
+    def test_visitors(self):
+        value_array = ValueArray.parse(VisitorPythonDocumentBuilder,
+                                       json.loads(self.json_file))
+        self.assert_values(value_array)
+        raw = ValueArray.build(VisitorPythonDocumentBuilder, value_array)
+        self.assertEqual(raw, {'values': list(range(1, 11))})
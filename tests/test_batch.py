@@ -0,0 +1,164 @@
+import io
+import os
+import sys
+import json
+import shutil
+import tempfile
+from unittest import TestCase
+from concurrent.futures import ProcessPoolExecutor
+
+from tests.documents import Users
+
+from composite import batch
+from composite.cache import FileCache
+from composite.__main__ import main
+from composite.builders import ExpatDocumentBuilder
+
+
+class TestBatch(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(2)
+        cls.directory = tempfile.mkdtemp()
+        for index in range(5):
+            for extension in ('xml', 'json'):
+                shutil.copy('documents/users.%s' % extension,
+                            os.path.join(cls.directory, '%d.%s' % (
+                                index, extension)))
+        with open(os.path.join(cls.directory, 'README'), 'w') as readme:
+            readme.write('not a document')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+        shutil.rmtree(cls.directory)
+
+    def test_iter_files(self):
+        files = list(batch.iter_files([self.directory]))
+        self.assertEqual(len(files), 10)
+        self.assertEqual(os.path.basename(files[0]), '0.json')
+        files = list(batch.iter_files([self.directory], pattern='*.xml'))
+        self.assertEqual(len(files), 5)
+        files = list(batch.iter_files([os.path.join(self.directory,
+                                                    '[12].*')]))
+        self.assertEqual(len(files), 4)
+
+    def test_import_object(self):
+        self.assertIs(batch.import_object('tests.documents:Users'), Users)
+        self.assertIs(batch.import_object('tests.documents.Users'), Users)
+
+    def test_parse_files(self):
+        results = list(batch.parse_files(Users, [self.directory],
+                                         executor=self.executor,
+                                         max_pending=3))
+        self.assertEqual(len(results), 10)
+        for path, users in results:
+            self.assertIsInstance(users, Users)
+            self.assertEqual([user.id for user in users], [1, 2])
+            self.assertEqual(users[1].attributes.first_name, 'Nick')
+
+    def test_builder_class(self):
+        pattern = os.path.join(self.directory, '*.xml')
+        results = list(batch.parse_files(
+            Users, [pattern], builder_class=ExpatDocumentBuilder,
+            executor=self.executor, only=['users.id']))
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0][1].users[1].id, 2)
+        self.assertFalse(results[0][1].users[1].has_attributes())
+
+    def test_imap_bounded(self):
+        args = ((index, ) for index in range(10))
+        results = batch.imap(self.executor, abs, args, 2)
+        self.assertEqual(next(results), ((0, ), 0))
+        #: arguments are taken lazily, 2 in flight and 1 waiting
+        self.assertEqual(next(args), (3, ))
+        self.assertEqual([result for _, result in results],
+                         [1, 2, 4, 5, 6, 7, 8, 9])
+
+    def test_dump_files(self):
+        target = io.StringIO()
+        count = batch.dump_files(Users, [self.directory], target,
+                                 executor=self.executor)
+        self.assertEqual(count, 10)
+        lines = target.getvalue().splitlines()
+        self.assertEqual(len(lines), 10)
+        line = json.loads(lines[0])
+        self.assertTrue(line['path'].endswith('0.json'))
+        self.assertEqual(line['document']['profile'][0]['id'], 1)
+
+    def test_main(self):
+        output = os.path.join(self.directory, 'out.jsonl')
+        code = main(['tests.documents:Users', self.directory,
+                     '--pattern', '*.xml', '--builder', 'expat',
+                     '--workers', '2', '--output', output])
+        self.assertEqual(code, 0)
+        with open(output) as lines:
+            documents = [json.loads(line)['document'] for line in lines]
+        self.assertEqual(len(documents), 5)
+        self.assertEqual(documents[0]['profile'][1]['id'], 2)
+
+    def test_errors(self):
+        paths = [os.path.join(self.directory, '0.json'),
+                 os.path.join(self.directory, 'missing.json'),
+                 os.path.join(self.directory, '1.json')]
+        with self.assertRaises(batch.FileError) as context:
+            list(batch.parse_files(Users, paths, executor=self.executor))
+        self.assertEqual(context.exception.path, paths[1])
+        self.assertIn(context.exception.error_class,
+                      ('IOError', 'FileNotFoundError'))
+        errors = []
+        results = list(batch.parse_files(
+            Users, paths, executor=self.executor,
+            on_error=lambda path, error: errors.append(path)))
+        self.assertEqual([path for path, _ in results],
+                         [paths[0], paths[2]])
+        self.assertEqual(errors, [paths[1]])
+
+    def test_main_errors(self):
+        output = os.path.join(self.directory, 'out.jsonl')
+        paths = [os.path.join(self.directory, '0.json'),
+                 os.path.join(self.directory, 'missing.json'),
+                 os.path.join(self.directory, '1.json')]
+        for option, lines in ((), 1), (('--skip-errors', ), 2):
+            code = main(['tests.documents:Users'] + paths + list(option) +
+                        ['--workers', '1', '--output', output])
+            self.assertEqual(code, 1)
+            with open(output) as documents:
+                self.assertEqual(len(documents.readlines()), lines)
+
+    def test_malformed_xml(self):
+        #: lxml errors could not be pickled, workers send their names
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        broken = os.path.join(directory, 'broken.xml')
+        with open(broken, 'w') as source:
+            source.write('<profiles><profile>')
+        errors = []
+        results = list(batch.parse_files(
+            Users, [os.path.join(self.directory, '0.xml'), broken],
+            executor=self.executor,
+            on_error=lambda path, error: errors.append(error)))
+        self.assertEqual(len(results), 1)
+        self.assertEqual([(error.path, error.error_class)
+                          for error in errors], [(broken, 'XMLSyntaxError')])
+
+        stderr, sys.stderr = sys.stderr, io.StringIO()
+        try:
+            code = main(['tests.documents:Users', broken, '--workers', '1',
+                         '--skip-errors', '--output',
+                         os.path.join(directory, 'out.jsonl')])
+            output = sys.stderr.getvalue()
+        finally:
+            sys.stderr = stderr
+        self.assertEqual(code, 1)
+        self.assertIn('%s: XMLSyntaxError: ' % broken, output)
+        self.assertNotIn('pickle', output)
+
+    def test_cache(self):
+        cache = FileCache(os.path.join(self.directory, 'cache'))
+        pattern = os.path.join(self.directory, '*.json')
+        for _ in range(2):
+            results = list(batch.parse_files(Users, [pattern], cache=cache,
+                                             executor=self.executor))
+            self.assertEqual([len(users) for _, users in results], [2] * 5)
+        self.assertEqual(len(os.listdir(cache.directory)), 5)
@@ -0,0 +1,152 @@
+import json
+import struct
+from array import array
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import (
+    Company, User, Users, SlotUsers, ValueArray, ValueList, ColumnVectors
+)
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import (
+    BinaryDocumentBuilder, LXMLDocumentBuilder, PythonDocumentBuilder
+)
+from composite.builders.binary import (
+    encode_varint, decode_varint, encode_int, decode_int
+)
+
+
+class TestBinary(TestCase):
+    def setUp(self):
+        with closing(open('documents/users.xml', 'rb')) as doc:
+            self.users_xml = doc.read()
+        with closing(open('documents/company.xml', 'rb')) as doc:
+            self.company_xml = doc.read()
+        with closing(open('documents/vectors.xml', 'rb')) as doc:
+            self.vectors_xml = doc.read()
+
+    def round_trip(self, document):
+        data = document.build(BinaryDocumentBuilder, document)
+        self.assertIsInstance(data, bytes)
+        return document.__class__.parse(BinaryDocumentBuilder, data)
+
+    def test_varint(self):
+        for value in (0, 1, 127, 128, 300, 2 ** 32, 2 ** 70):
+            out = bytearray()
+            encode_varint(out, value)
+            self.assertEqual(decode_varint(out, 0), (value, len(out)))
+        out = bytearray()
+        encode_varint(out, 127)
+        self.assertEqual(len(out), 1)
+
+    def test_int(self):
+        for value in (0, -1, 1, -64, 63, -65, 2 ** 40, -2 ** 63):
+            out = bytearray()
+            encode_int(out, value)
+            self.assertEqual(decode_int(out, 0), (value, len(out)))
+
+    def test_users(self):
+        users = Users.parse(LXMLDocumentBuilder, etree.XML(self.users_xml))
+        parsed = self.round_trip(users)
+        self.assertEqual([user.id for user in parsed], [1, 2])
+        self.assertEqual(
+            [user.attributes.values() for user in parsed],
+            [user.attributes.values() for user in users]
+        )
+
+    def test_slot_users(self):
+        users = SlotUsers.parse(LXMLDocumentBuilder,
+                                etree.XML(self.users_xml))
+        parsed = self.round_trip(users)
+        self.assertEqual([user.sign for user in parsed.users],
+                         [user.sign for user in users.users])
+        self.assertEqual(parsed.users[1].attributes.first_name, 'Nick')
+
+    def test_company(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml))
+        parsed = self.round_trip(company)
+        self.assertEqual(
+            Company.build(PythonDocumentBuilder, parsed),
+            Company.build(PythonDocumentBuilder, company)
+        )
+
+    def test_no_attributes(self):
+        users = Users.parse(PythonDocumentBuilder, {'profile': []})
+        user = User.blank()
+        user.id, user.sign = 1, 'x'
+        users.users.append(user)
+        parsed = self.round_trip(users)
+        self.assertEqual(parsed[0].sign, 'x')
+        self.assertFalse(parsed[0].has_attributes())
+
+    def test_lists(self):
+        values = ValueList.parse(PythonDocumentBuilder,
+                                 {'values': [0, -1, 2 ** 40]})
+        self.assertEqual(self.round_trip(values).values, [0, -1, 2 ** 40])
+        value_array = ValueArray.parse(PythonDocumentBuilder,
+                                       {'values': [3, -2, 1]})
+        parsed = self.round_trip(value_array)
+        self.assertEqual(parsed.values, array('l', [3, -2, 1]))
+
+    def test_columns(self):
+        vectors = ColumnVectors.parse(LXMLDocumentBuilder,
+                                      etree.XML(self.vectors_xml))
+        parsed = self.round_trip(vectors)
+        self.assertEqual(parsed.vectors.columns, vectors.vectors.columns)
+        self.assertEqual(str(parsed.vectors[1]), '(3.14, 2.71)')
+
+    def test_compact(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml))
+        data = Company.build(BinaryDocumentBuilder, company)
+        self.assertNotIn(b'title', data)
+        self.assertNotIn(b'first_name', data)
+        self.assertLess(len(data), len(json.dumps(
+            Company.build(PythonDocumentBuilder, company))))
+
+    def test_trailing_data(self):
+        values = ValueList.parse(PythonDocumentBuilder, {'values': [1]})
+        data = ValueList.build(BinaryDocumentBuilder, values)
+        with self.assertRaises(ValueError):
+            ValueList.parse(BinaryDocumentBuilder, data + b'\x00')
+
+    def test_options(self):
+        values = ValueList.parse(PythonDocumentBuilder, {'values': [1]})
+        data = ValueList.build(BinaryDocumentBuilder, values)
+        with self.assertRaises(ImproperlyConfigured):
+            ValueList.parse(BinaryDocumentBuilder, data, lazy=True)
+
+    def test_truncated(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml))
+        data = Company.build(BinaryDocumentBuilder, company)
+        for end in range(len(data)):
+            with self.assertRaises(ValueError):
+                Company.parse(BinaryDocumentBuilder, data[:end])
+
+    def test_array_item_size(self):
+        value_array = ValueArray.parse(PythonDocumentBuilder,
+                                       {'values': [3, -2, 1]})
+        data = ValueArray.build(BinaryDocumentBuilder, value_array)
+        self.assertEqual(data[:2], struct.pack('<BB', array('l').itemsize, 3))
+        #: 4 bytes ``l`` arrays written on windows
+        data = struct.pack('<BB3i', 4, 3, 3, -2, 1)
+        parsed = ValueArray.parse(BinaryDocumentBuilder, data)
+        self.assertEqual(parsed.values, array('l', [3, -2, 1]))
+        with self.assertRaises(ValueError):
+            ValueArray.parse(BinaryDocumentBuilder,
+                             struct.pack('<BB3b', 3, 3, 3, -2, 1))
+
+    def test_coercion(self):
+        users = Users.parse(PythonDocumentBuilder, {'profile': []})
+        user = User.blank()
+        user.id, user.sign = '5', 10
+        users.users.append(user)
+        values = ValueList.parse(PythonDocumentBuilder, {'values': []})
+        values.values.extend(['1', 2.0])
+        self.assertEqual(self.round_trip(values).values, [1, 2])
+        parsed = self.round_trip(users)
+        self.assertEqual((parsed[0].id, parsed[0].sign), (5, '10'))
@@ -0,0 +1,260 @@
+import os
+import pickle
+import json
+import shutil
+import tempfile
+from lxml import etree
+from unittest import TestCase
+
+from tests.documents import (
+    Company, Users, SlotUsers, ValueArray, ValueList, ColumnVectors
+)
+
+from composite import Document
+from composite.fields import Field, ListNode
+from composite.cache import ParseCache, FileCache, get_fingerprint
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import (
+    ExpatDocumentBuilder, LXMLDocumentBuilder, PythonDocumentBuilder
+)
+
+
+class TestParseCache(TestCase):
+    def setUp(self):
+        with open('documents/company.xml', 'rb') as doc:
+            self.company_xml = doc.read()
+        with open('documents/company.json', 'r') as doc:
+            self.company_json = json.load(doc)
+        self.cache = ParseCache()
+
+    def test_hit(self):
+        first = Company.parse(LXMLDocumentBuilder,
+                              etree.XML(self.company_xml), cache=self.cache)
+        second = Company.parse(LXMLDocumentBuilder,
+                               etree.XML(self.company_xml), cache=self.cache)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.title, first.title)
+        self.assertEqual(second.ceo.attributes.email,
+                         first.ceo.attributes.email)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']),
+                         (1, 1, 1))
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_hit_is_copy(self):
+        source = {'values': [1, 2, 3]}
+        first = ValueList.parse(PythonDocumentBuilder, source,
+                                cache=self.cache)
+        first.values.append(4)
+        second = ValueList.parse(PythonDocumentBuilder, dict(source),
+                                 cache=self.cache)
+        self.assertEqual(second.values, [1, 2, 3])
+        second.values.append(5)
+        third = ValueList.parse(PythonDocumentBuilder, source,
+                                cache=self.cache)
+        self.assertEqual(third.values, [1, 2, 3])
+
+    def test_hit_is_copy_of_arrays(self):
+        source = {'values': [1, 2]}
+        first = ValueArray.parse(PythonDocumentBuilder, source,
+                                 cache=self.cache)
+        first.values.append(3)
+        second = ValueArray.parse(PythonDocumentBuilder, source,
+                                  cache=self.cache)
+        self.assertEqual(list(second.values), [1, 2])
+        source = {'vector': [{'x': 1.0, 'y': 2.0}]}
+        first = ColumnVectors.parse(PythonDocumentBuilder, source,
+                                    cache=self.cache)
+        first.vectors.column('x')[0] = 5.0
+        second = ColumnVectors.parse(PythonDocumentBuilder, source,
+                                     cache=self.cache)
+        self.assertEqual(list(second.vectors.column('x')), [1.0])
+        self.assertEqual(self.cache.hits, 2)
+
+    def test_source_key(self):
+        class Value(object):
+            pass
+
+        #: source is not dumped, it could be any
+        for _ in range(2):
+            company = Company.parse(PythonDocumentBuilder,
+                                    {'title': 'x', 'ceo': Value()},
+                                    cache=self.cache, cache_key='message-1',
+                                    only=['title'])
+            self.assertEqual(company.title, 'x')
+        Company.parse(PythonDocumentBuilder, {'title': 'y'},
+                      cache=self.cache, cache_key='message-2')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_key(self):
+        Company.parse(PythonDocumentBuilder, self.company_json,
+                      cache=self.cache)
+        #: key order does not matter
+        reordered = dict(reversed(list(self.company_json.items())))
+        Company.parse(PythonDocumentBuilder, reordered, cache=self.cache)
+        self.assertEqual(self.cache.hits, 1)
+        #: options, builder and content do
+        Company.parse(PythonDocumentBuilder, self.company_json,
+                      cache=self.cache, only=['title'])
+        Company.parse(ExpatDocumentBuilder, self.company_xml,
+                      cache=self.cache)
+        Company.parse(PythonDocumentBuilder, {'title': 'x'},
+                      cache=self.cache)
+        self.assertEqual(self.cache.misses, 4)
+        self.assertEqual(len(self.cache), 4)
+
+    def test_key_not_json(self):
+        class Value(object):
+            def __repr__(self):
+                return 'value'
+
+        for source in ({'title': Value()}, {'title': 'x', 1: 'y'}):
+            with self.assertRaises(ValueError):
+                Company.parse(PythonDocumentBuilder, source,
+                              cache=self.cache)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_max_entries(self):
+        cache = ParseCache(max_entries=2)
+        for title in ('a', 'b', 'a', 'c', 'a', 'b'):
+            Company.parse(PythonDocumentBuilder, {'title': title},
+                          cache=cache)
+        stats = cache.stats()
+        #: ``b`` was evicted by ``c`` as least recently used
+        self.assertEqual((stats['hits'], stats['misses']), (2, 4))
+        self.assertEqual((stats['entries'], stats['evictions']), (2, 2))
+
+    def test_max_bytes(self):
+        with open('documents/users.json', 'r') as doc:
+            source = json.load(doc)
+        Company.parse(PythonDocumentBuilder, {'title': 'x'},
+                      cache=self.cache)
+        entry_size = self.cache.size
+
+        cache = ParseCache(max_bytes=entry_size + 1)
+        Users.parse(PythonDocumentBuilder, source, cache=cache)
+        self.assertEqual(cache.stats()['entries'], 0)
+        Company.parse(PythonDocumentBuilder, {'title': 'x'}, cache=cache)
+        Company.parse(PythonDocumentBuilder, {'title': 'y'}, cache=cache)
+        self.assertEqual(cache.stats()['entries'], 1)
+        self.assertEqual(cache.size, entry_size)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_clear(self):
+        Company.parse(PythonDocumentBuilder, {}, cache=self.cache)
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()['bytes'], 0)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lazy(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Company.parse(PythonDocumentBuilder, {}, cache=self.cache,
+                          lazy=True)
+
+
+class TestFileCache(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, 'users.xml')
+        shutil.copy('documents/users.xml', self.source)
+        self.cache = FileCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def parse(self, cache=None):
+        return Users.parse(LXMLDocumentBuilder, self.source,
+                           cache=cache or self.cache)
+
+    def test_hit(self):
+        first = self.parse()
+        #: same mtime and size, source is not even read
+        stat = os.stat(self.source)
+        with open(self.source, 'wb') as source:
+            source.write(b' ' * stat.st_size)
+        os.utime(self.source, (stat.st_atime, stat.st_mtime))
+        second = self.parse(FileCache(self.cache.directory))
+        self.assertEqual([user.id for user in second], [1, 2])
+        self.assertEqual(second[1].attributes.first_name,
+                         first[1].attributes.first_name)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_touched(self):
+        self.parse()
+        stat = os.stat(self.source)
+        os.utime(self.source, (stat.st_atime, stat.st_mtime + 10))
+        self.parse()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        #: entry keeps new mtime, so the source is not hashed again
+        entry_path, = [os.path.join(self.cache.directory, name)
+                       for name in os.listdir(self.cache.directory)]
+        with open(entry_path, 'rb') as entry:
+            (mtime, _, _), _ = pickle.load(entry)
+        self.assertEqual(mtime, os.stat(self.source).st_mtime)
+
+    def test_changed_while_parsed(self):
+        source_path = self.source
+
+        class EditedBuilder(LXMLDocumentBuilder):
+            @classmethod
+            def load_data(cls, data):
+                with open(source_path, 'wb') as source:
+                    source.write(data.replace(b'<id>2</id>', b'<id>3</id>'))
+                stat = os.stat(source_path)
+                os.utime(source_path, (stat.st_atime, stat.st_mtime + 10))
+                return super(EditedBuilder, cls).load_data(data)
+
+        users = Users.parse(EditedBuilder, self.source, cache=self.cache)
+        self.assertEqual([user.id for user in users], [1, 2])
+        #: entry describes parsed content, so the edit is not missed
+        self.assertEqual([user.id for user in self.parse()], [1, 3])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_changed(self):
+        self.parse()
+        with open(self.source, 'rb') as source:
+            data = source.read().replace(b'<id>2</id>', b'<id>3</id>')
+        with open(self.source, 'wb') as source:
+            source.write(data)
+        stat = os.stat(self.source)
+        os.utime(self.source, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual([user.id for user in self.parse()], [1, 3])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_options(self):
+        self.parse()
+        users = Users.parse(LXMLDocumentBuilder, self.source,
+                            cache=self.cache, only=['users.id'])
+        self.assertFalse(users[0].has_attributes())
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_fingerprint(self):
+        fingerprint = get_fingerprint(Users)
+        self.assertEqual(fingerprint, get_fingerprint(Users))
+        self.assertNotEqual(fingerprint, get_fingerprint(SlotUsers))
+
+        class Profile(Document):
+            id = Field('id', int)
+            sign = Field('sign', str)
+
+        class ChangedUsers(Document):
+            users = ListNode('profile', Profile)
+
+        self.assertNotEqual(get_fingerprint(ChangedUsers),
+                            get_fingerprint(Users))
+
+        fingerprint = get_fingerprint(Profile)
+
+        class Profile(Document):
+            sign = Field('sign', str)
+            id = Field('id', int)
+
+        #: states keep values in declaration order
+        self.assertNotEqual(get_fingerprint(Profile), fingerprint)
+
+    def test_clear(self):
+        self.parse()
+        self.cache.clear()
+        self.parse()
+        self.assertEqual(self.cache.misses, 2)
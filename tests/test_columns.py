@@ -0,0 +1,104 @@
+from array import array
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import ColumnVectors, Vector, User
+
+from composite import Document
+from composite.columns import Columns
+from composite.fields import Field, ColumnListNode
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class IntRow(Document):
+    id = Field('id', int)
+
+
+class IntRows(Document):
+    rows = ColumnListNode('profile', IntRow)
+
+
+class VisitorLXMLDocumentBuilder(LXMLDocumentBuilder):
+    parse_compiler_class = None
+    build_compiler_class = None
+
+
+class TestColumns(TestCase):
+    def setUp(self):
+        with closing(open('documents/vectors.xml', 'r')) as doc:
+            self.xml_file = doc.read().encode('utf-8')
+
+    def assert_vectors(self, vectors):
+        columns = vectors.vectors
+        self.assertIsInstance(columns, Columns)
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns.column('x'), array('d', [1.2, 3.14, 5.2]))
+        self.assertEqual(columns.column('y'), array('d', [3.2, 2.71, 4.9]))
+        vector = columns[1]
+        self.assertIsInstance(vector, Vector)
+        self.assertEqual((vector.x, vector.y), (3.14, 2.71))
+
+    def test_default(self):
+        vectors = ColumnVectors()
+        self.assertIsInstance(vectors.vectors, Columns)
+        self.assertEqual(len(vectors.vectors), 0)
+
+    def test_flat_only(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ColumnListNode('user', User)
+
+    def test_from_xml(self):
+        self.assert_vectors(
+            ColumnVectors.parse(LXMLDocumentBuilder, etree.XML(self.xml_file))
+        )
+
+    def test_from_xml_visitors(self):
+        self.assert_vectors(
+            ColumnVectors.parse(VisitorLXMLDocumentBuilder,
+                                etree.XML(self.xml_file))
+        )
+
+    def test_to_xml(self):
+        vectors = ColumnVectors.parse(LXMLDocumentBuilder,
+                                      etree.XML(self.xml_file))
+        for builder_class in (LXMLDocumentBuilder, VisitorLXMLDocumentBuilder):
+            xml_node = ColumnVectors.build(builder_class, vectors)
+            self.assert_vectors(
+                ColumnVectors.parse(LXMLDocumentBuilder, xml_node))
+
+    def test_json(self):
+        source = {'vector': [{'x': 1.2, 'y': 3.2}, {'x': 3.14, 'y': 2.71},
+                             {'x': '5.2', 'y': 4.9}, {'y': 0.5}]}
+        vectors = ColumnVectors.parse(PythonDocumentBuilder, source)
+        self.assertEqual(len(vectors.vectors), 4)
+        self.assertEqual(vectors.vectors[3].x, 0.0)
+        del vectors.vectors.column('x')[3]
+        del vectors.vectors.column('y')[3]
+        self.assert_vectors(vectors)
+
+        raw = ColumnVectors.build(PythonDocumentBuilder, vectors)
+        self.assertEqual(raw['vector'][2], {'x': 5.2, 'y': 4.9})
+        self.assert_vectors(ColumnVectors.parse(PythonDocumentBuilder, raw))
+
+    def test_mutation(self):
+        vectors = ColumnVectors()
+        columns = vectors.vectors
+        vector = Vector()
+        vector.x, vector.y = 1.0, 2.0
+        columns.extend([vector, vector])
+        vector.y = 3.0
+        columns[1] = vector
+        self.assertEqual([v.y for v in columns], [2.0, 3.0])
+        self.assertEqual([v.x for v in columns[:1]], [1.0])
+        #: rows are copies
+        columns[0].x = 5.0
+        self.assertEqual(columns.column('x')[0], 1.0)
+
+    def test_int64(self):
+        column_node = ColumnListNode('profile', IntRow)
+        self.assertEqual(column_node.typecodes, {'id': 'q'})
+        source = {'profile': [{'id': 2 ** 40}]}
+        rows = IntRows.parse(PythonDocumentBuilder, source)
+        self.assertEqual(rows.rows[0].id, 2 ** 40)
@@ -0,0 +1,86 @@
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import Company, SlotUsers, User, Users, ValueArray
+
+from composite.cache import ParseCache
+from composite.fields import Field
+from composite.plans import StatePlan, get_plan
+from composite.documents import Document
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class Custom(Document):
+    title = Field('title', str)
+
+    def __init__(self):
+        super(Custom, self).__init__()
+        self.title = 'custom'
+        self.initiated = True
+
+
+class Inherited(Custom):
+    def __init__(self):
+        pass
+
+
+class TestDefaults(TestCase):
+    def test_precomputed(self):
+        self.assertEqual(Company._defaults, {
+            'title': '', 'address': '', 'company_type': ''
+        })
+        self.assertEqual(Users._defaults, {})
+
+    def test_deferred(self):
+        users = Users()
+        self.assertNotIn('users', users.__dict__)
+        self.assertEqual(users.users, [])
+        self.assertIs(users.users, users.users)
+        self.assertIsNot(users.users, Users().users)
+
+    def test_deferred_node(self):
+        company = Company()
+        self.assertNotIn('ceo', company.__dict__)
+        self.assertIsInstance(company.ceo, User)
+        self.assertEqual(company.ceo.id, 0)
+
+    def test_deferred_slots(self):
+        self.assertEqual(SlotUsers().users, [])
+        self.assertEqual(len(ValueArray().values), 0)
+
+    def test_blank(self):
+        self.assertEqual(Custom().title, 'custom')
+        self.assertEqual(Custom.blank().title, 'custom')
+        self.assertFalse(Users._custom_init)
+        self.assertTrue(Inherited._custom_init)
+
+    def test_parse_custom_init(self):
+        custom = Custom.parse(PythonDocumentBuilder, {})
+        self.assertEqual(custom.title, 'custom')
+        custom = Custom.parse(PythonDocumentBuilder, {'title': 'parsed'})
+        self.assertEqual(custom.title, 'parsed')
+
+    def test_restore_custom_init(self):
+        plan = get_plan(StatePlan, Custom)
+        custom = plan.load(plan.dump(Custom.parse(PythonDocumentBuilder,
+                                                  {'title': 'parsed'})))
+        self.assertEqual((custom.title, custom.initiated), ('parsed', True))
+        cache = ParseCache()
+        for _ in range(2):
+            custom = Custom.parse(PythonDocumentBuilder, {'title': 'cached'},
+                                  cache=cache)
+            self.assertTrue(custom.initiated)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+    def test_parse_skips_defaults(self):
+        with closing(open('documents/users.xml', 'r')) as doc:
+            source = etree.XML(doc.read().encode('utf-8'))
+        users = Users.parse(LXMLDocumentBuilder, source)
+        self.assertEqual([user.id for user in users.users], [1, 2])
+        self.assertEqual(users.users[0].attributes.first_name, 'Alexander')
+
+    def test_inherited_field(self):
+        document = Inherited()
+        self.assertFalse(hasattr(document, 'title'))
+        self.assertEqual(getattr(document, 'title', 'default'), 'default')
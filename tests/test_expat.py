@@ -0,0 +1,92 @@
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import (
+    Company, Users, SlotUsers, ValueArray, ValueList, ColumnVectors
+)
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import ExpatDocumentBuilder, LXMLDocumentBuilder
+
+
+class TestExpat(TestCase):
+    def setUp(self):
+        with closing(open('documents/users.xml', 'rb')) as doc:
+            self.users_xml = doc.read()
+        with closing(open('documents/company.xml', 'rb')) as doc:
+            self.company_xml = doc.read()
+
+    def test_company(self):
+        company = Company.parse(ExpatDocumentBuilder, self.company_xml)
+        expected = Company.parse(LXMLDocumentBuilder,
+                                 etree.XML(self.company_xml))
+        for name in ('title', 'address', 'company_type'):
+            self.assertEqual(getattr(company, name), getattr(expected, name))
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.ceo.sign, 'Pepyako inc.')
+        self.assertEqual(company.ceo.attributes.values(),
+                         expected.ceo.attributes.values())
+
+    def test_users(self):
+        users = Users.parse(ExpatDocumentBuilder, self.users_xml)
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+        self.assertEqual(users[0].attributes.age, 23)
+
+    def test_file_object(self):
+        with open('documents/users.xml', 'rb') as source:
+            users = SlotUsers.parse(ExpatDocumentBuilder, source)
+        self.assertEqual([user.id for user in users.users], [1, 2])
+
+    def test_lists(self):
+        with open('documents/value_list.xml', 'rb') as doc:
+            source = doc.read()
+        self.assertEqual(ValueList.parse(ExpatDocumentBuilder, source).total,
+                         55)
+        values = ValueArray.parse(ExpatDocumentBuilder, source).values
+        self.assertEqual(values.tolist(), list(range(1, 11)))
+
+    def test_columns(self):
+        with open('documents/vectors.xml', 'rb') as doc:
+            source = doc.read()
+        vectors = ColumnVectors.parse(ExpatDocumentBuilder, source)
+        expected = ColumnVectors.parse(LXMLDocumentBuilder, etree.XML(source))
+        self.assertEqual(vectors.vectors.column('x'),
+                         expected.vectors.column('x'))
+
+    def test_unknown_nodes_skipped(self):
+        users = Users.parse(
+            ExpatDocumentBuilder,
+            b'<Users><profile><id>5</id><extra><id>7</id></extra></profile>'
+            b'<sign>x</sign></Users>'
+        )
+        self.assertEqual(len(users), 1)
+        self.assertEqual(users[0].id, 5)
+
+    def test_projection(self):
+        company = Company.parse(ExpatDocumentBuilder, self.company_xml,
+                                only=['ceo.id'])
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.ceo.sign, '')
+        self.assertEqual(company.title, '')
+
+    def test_lazy(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Company.parse(ExpatDocumentBuilder, self.company_xml, lazy=True)
+
+    def test_iterparse(self):
+        users = Users.iterparse(ExpatDocumentBuilder, 'documents/users.xml',
+                                field='users')
+        self.assertEqual([user.id for user in users], [1, 2])
+        values = ValueList.iterparse(ExpatDocumentBuilder,
+                                     'documents/value_list.xml',
+                                     field='values')
+        self.assertEqual(sum(values), 55)
+        with self.assertRaises(ImproperlyConfigured):
+            list(Company.iterparse(ExpatDocumentBuilder,
+                                   'documents/company.xml', field='ceo'))
+
+    def test_build(self):
+        with self.assertRaises(NotImplementedError):
+            Users.build(ExpatDocumentBuilder, Users())
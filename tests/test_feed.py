@@ -0,0 +1,162 @@
+from unittest import TestCase
+
+from tests.documents import Company, Users, ValueList
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import (
+    ExpatDocumentBuilder, LXMLDocumentBuilder, PythonDocumentBuilder,
+    JSONDocumentBuilder
+)
+from composite.builders.jsontext import MalformedData
+
+
+def chunks(data, size=16):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class FeedParserMixin(object):
+    builder_class = None
+    extension = 'xml'
+    #: end of the first users item
+    item_end = b'</profile>'
+
+    def setUp(self):
+        with open('documents/users.%s' % self.extension, 'rb') as doc:
+            self.users_xml = doc.read()
+        with open('documents/company.%s' % self.extension, 'rb') as doc:
+            self.company_xml = doc.read()
+
+    def test_document(self):
+        parser = Company.feed_parser(self.builder_class)
+        for chunk in chunks(self.company_xml):
+            parser.feed(chunk)
+        company = parser.close()
+        self.assertEqual(company.title, 'Pepyako industries')
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.ceo.attributes.first_name, 'Alexander')
+
+    def test_items(self):
+        parser = Users.feed_parser(self.builder_class, field='users')
+        data = self.users_xml
+        #: first profile is complete, the second one is not
+        split = data.index(self.item_end) + len(self.item_end) + 10
+        parser.feed(data[:split])
+        self.assertEqual([user.id for user in parser.read_items()], [1])
+        self.assertEqual(list(parser.read_items()), [])
+        parser.feed(data[split:])
+        users = list(parser.read_items())
+        self.assertEqual([user.id for user in users], [2])
+        self.assertEqual(users[0].attributes.first_name, 'Nick')
+        self.assertEqual(parser.close().users, [])
+
+    def test_list_field_items(self):
+        parser = ValueList.feed_parser(self.builder_class, field='values')
+        total = 0
+        with open('documents/value_list.%s' % self.extension, 'rb') as doc:
+            for chunk in chunks(doc.read()):
+                parser.feed(chunk)
+                total += sum(parser.read_items())
+        parser.close()
+        self.assertEqual(total, 55)
+
+    def test_projection(self):
+        parser = Company.feed_parser(self.builder_class, only=['ceo.id'])
+        parser.feed(self.company_xml)
+        company = parser.close()
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.title, '')
+
+    def test_wrong_field(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Company.feed_parser(self.builder_class, field='ceo')
+
+
+class TestLXMLFeedParser(FeedParserMixin, TestCase):
+    builder_class = LXMLDocumentBuilder
+
+    def test_elements_dropped(self):
+        parser = Users.feed_parser(self.builder_class, field='users')
+        parser.feed(self.users_xml)
+        self.assertEqual(len(parser.root), 1)
+        self.assertEqual(len(parser.root[0]), 0)
+
+
+class TestExpatFeedParser(FeedParserMixin, TestCase):
+    builder_class = ExpatDocumentBuilder
+
+
+class TestJSONFeedParser(FeedParserMixin, TestCase):
+    builder_class = JSONDocumentBuilder
+    extension = 'json'
+    item_end = b'"Pepyako inc."\n    }'
+
+    def test_text_dropped(self):
+        users = Users.parse(self.builder_class, self.users_xml)
+        users.users = users.users * 100
+        data = Users.build(self.builder_class, users)
+        parser = Users.feed_parser(self.builder_class, field='users')
+        count = 0
+        for chunk in chunks(data, 64):
+            parser.feed(chunk)
+            count += len(list(parser.read_items()))
+            #: pending text is bounded by item size
+            self.assertLess(parser.size, 1000)
+        parser.close()
+        self.assertEqual(count + len(list(parser.read_items())), 200)
+
+    def test_huge_value(self):
+        #: incomplete values are retried once pending text doubles
+        parser = ValueList.feed_parser(self.builder_class)
+        parser.feed(b'{"values": [')
+        for _ in range(50000):
+            parser.feed(b'1, ')
+        self.assertGreater(parser.wait, 0)
+        parser.feed(b'1]}')
+        self.assertEqual(parser.close().total, 50001)
+
+    def test_malformed(self):
+        parser = Users.feed_parser(self.builder_class, field='users')
+        parser.feed(b'{"profile": [{"id": 1}')
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_malformed_item(self):
+        users = Users.parse(self.builder_class, self.users_xml)
+        users.users = users.users * 100
+        data = Users.build(self.builder_class, users)
+        #: bad value and bad delimiter in the middle of the stream
+        middle = data.index(b'{"id":1,', len(data) // 2)
+        for bad in (b'{"id":"abc",', b'{"id":1;'):
+            parser = Users.feed_parser(self.builder_class, field='users')
+            source = data[:middle] + bad + data[middle + 8:]
+            count = 0
+            with self.assertRaises(MalformedData):
+                for chunk in chunks(source, 64):
+                    parser.feed(chunk)
+                    count += len(list(parser.read_items()))
+                    self.assertLess(parser.size, 1000)
+            self.assertEqual(count + len(list(parser.read_items())), 100)
+
+    def test_split_number(self):
+        parser = ValueList.feed_parser(self.builder_class, field='values')
+        for chunk in (b'{"values": [1.', b'5e', b'3, 2]}'):
+            parser.feed(chunk)
+        parser.close()
+        self.assertEqual(list(parser.read_items()), [1500, 2])
+        parser = Users.feed_parser(self.builder_class, field='users')
+        with self.assertRaises(ValueError):
+            parser.feed(b'{} []')
+
+    def test_number_split(self):
+        parser = ValueList.feed_parser(self.builder_class, field='values')
+        parser.feed(b'{"values": [12')
+        self.assertEqual(list(parser.read_items()), [])
+        parser.feed(b'3]}')
+        self.assertEqual(list(parser.read_items()), [123])
+        parser.close()
+
+
+class TestNoFeedParser(TestCase):
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            Users.feed_parser(PythonDocumentBuilder)
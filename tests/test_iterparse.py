@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from tests.documents import Users, ValueList, Company
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestIterParse(TestCase):
+    def test_users(self):
+        users = list(Users.iterparse(LXMLDocumentBuilder,
+                                     'documents/users.xml', field='users'))
+        self.assertEqual(len(users), 2)
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[0].sign, 'Pepyako inc.')
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+
+    def test_file_object(self):
+        with open('documents/value_list.xml', 'rb') as source:
+            values = ValueList.iterparse(LXMLDocumentBuilder, source,
+                                         field='values')
+            self.assertEqual(sum(values), 55)
+
+    def test_elements_cleared(self):
+        items = Users.iterparse(LXMLDocumentBuilder, 'documents/users.xml',
+                                field='users')
+        next(items)
+        next(items)
+        parent = items.gi_frame.f_locals['parent']
+        #: first profile is dropped, second one is cleared
+        self.assertEqual(len(parent), 1)
+        self.assertEqual(len(parent[0]), 0)
+        self.assertEqual(len(parent[0].attrib), 0)
+
+    def test_wrong_field(self):
+        with self.assertRaises(ImproperlyConfigured):
+            list(Company.iterparse(LXMLDocumentBuilder,
+                                   'documents/company.xml', field='ceo'))
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            Users.iterparse(PythonDocumentBuilder, 'documents/users.json',
+                            field='users')
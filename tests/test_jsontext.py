@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+from unittest import TestCase
+
+from tests.documents import (
+    Company, User, Users, ValueArray, ValueList, ColumnVectors
+)
+
+from composite import Document
+from composite.fields import Field, AttributeField, ListNode
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import JSONDocumentBuilder, PythonDocumentBuilder
+
+
+class Team(Document):
+    title = Field('title', str)
+    members = ListNode('member', type=User)
+
+    class Attributes:
+        size = AttributeField('size', type=int)
+
+
+def dumps(document):
+    return json.dumps(document.build(PythonDocumentBuilder, document),
+                      separators=(',', ':')).encode('utf-8')
+
+
+class TestJSONText(TestCase):
+    def setUp(self):
+        with open('documents/company.json', 'r') as doc:
+            self.company_json = json.load(doc)
+        with open('documents/users.json', 'rb') as doc:
+            self.users_json = doc.read()
+
+    def test_build(self):
+        company = Company.parse(PythonDocumentBuilder, self.company_json)
+        self.assertEqual(Company.build(JSONDocumentBuilder, company),
+                         dumps(company))
+        users = Users.parse(JSONDocumentBuilder, self.users_json)
+        self.assertEqual(Users.build(JSONDocumentBuilder, users),
+                         dumps(users))
+
+    def test_parse(self):
+        company = Company.parse(JSONDocumentBuilder,
+                                json.dumps(self.company_json, indent=2))
+        expected = Company.parse(PythonDocumentBuilder, self.company_json)
+        self.assertEqual(company.build(PythonDocumentBuilder, company),
+                         expected.build(PythonDocumentBuilder, expected))
+
+    def test_file_object(self):
+        users = Users.parse(JSONDocumentBuilder, io.BytesIO(self.users_json))
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+
+    def test_nested_attributes(self):
+        source = {
+            'member': [{'id': 1, 'sign': u'знак', 'extra': [{'a': 1}]}],
+            'unknown': {'member': []},
+            'title': 'team',
+            '_attributes': {'size': 1},
+        }
+        team = Team.parse(JSONDocumentBuilder, json.dumps(source))
+        self.assertEqual(team.title, 'team')
+        self.assertEqual(team.attributes.size, 1)
+        self.assertEqual(team.members[0].sign, u'знак')
+        self.assertEqual(Team.parse(JSONDocumentBuilder,
+                                    Team.build(JSONDocumentBuilder, team))
+                         .members[0].sign, u'знак')
+
+    def test_empty(self):
+        team = Team.parse(JSONDocumentBuilder, b'{ }')
+        self.assertEqual(team.members, [])
+        self.assertEqual(team.attributes.size, 0)
+        team = Team.parse(JSONDocumentBuilder, b'{"member": [ ]}')
+        self.assertEqual(Team.build(JSONDocumentBuilder, team),
+                         dumps(team))
+
+    def test_values(self):
+        values = ValueList.parse(JSONDocumentBuilder, b'{"values": [1, 2]}')
+        self.assertEqual(values.total, 3)
+        value_array = ValueArray.parse(JSONDocumentBuilder,
+                                       ValueList.build(JSONDocumentBuilder,
+                                                       values))
+        self.assertEqual(value_array.total, 3)
+        self.assertEqual(ValueArray.build(JSONDocumentBuilder, value_array),
+                         b'{"values":[1,2]}')
+
+    def test_columns(self):
+        source = b'{"vector": [{"x": 1.5, "y": 2.0}, {"x": 3.0}]}'
+        vectors = ColumnVectors.parse(JSONDocumentBuilder, source)
+        self.assertEqual(list(vectors.vectors.columns[0]), [1.5, 3.0])
+        self.assertEqual(ColumnVectors.build(JSONDocumentBuilder, vectors),
+                         dumps(vectors))
+
+    def test_projection(self):
+        users = Users.parse(JSONDocumentBuilder, self.users_json,
+                            only=['users.id'])
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[0].sign, '')
+        self.assertIsNone(users[0].attributes)
+
+    def test_malformed(self):
+        for source in (b'', b'[]', b'{"title" 1}', b'{"member": [{}, ]}',
+                       b'{"title": "a",}', b'{"title": "a"} {}'):
+            with self.assertRaises(ValueError):
+                Team.parse(JSONDocumentBuilder, source)
+
+    def test_lazy(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Users.parse(JSONDocumentBuilder, self.users_json, lazy=True)
+
+    def test_iterparse(self):
+        users = list(Users.iterparse(JSONDocumentBuilder,
+                                     'documents/users.json', field='users'))
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+        with open('documents/value_list.json', 'rb') as source:
+            values = ValueList.iterparse(JSONDocumentBuilder, source,
+                                         field='values')
+            self.assertEqual(sum(values), 55)
+
+    def test_iterparse_wrong_field(self):
+        with self.assertRaises(ImproperlyConfigured):
+            list(Company.iterparse(JSONDocumentBuilder,
+                                   'documents/company.json', field='ceo'))
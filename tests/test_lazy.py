@@ -0,0 +1,79 @@
+import json
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import Company, Users, SlotUsers
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class VisitorLXMLDocumentBuilder(LXMLDocumentBuilder):
+    parse_compiler_class = None
+
+
+class TestLazy(TestCase):
+    def setUp(self):
+        with closing(open('documents/company.xml', 'r')) as doc:
+            self.company_xml = doc.read().encode('utf-8')
+
+        with closing(open('documents/company.json', 'r')) as doc:
+            self.company_json = doc.read()
+
+        with closing(open('documents/users.xml', 'r')) as doc:
+            self.users_xml = doc.read().encode('utf-8')
+
+    def test_node_from_xml(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml), lazy=True)
+        self.assertEqual(company.title, 'Pepyako industries')
+        self.assertNotIn('ceo', company.__dict__)
+        self.assertIn('ceo', company._lazy)
+
+        ceo = company.ceo
+        self.assertIn('ceo', company.__dict__)
+        self.assertNotIn('ceo', company._lazy)
+        self.assertIs(company.ceo, ceo)
+        self.assertEqual(ceo.id, 1)
+        self.assertEqual(ceo.attributes.first_name, 'Alexander')
+
+    def test_node_from_json(self):
+        company = Company.parse(PythonDocumentBuilder,
+                                json.loads(self.company_json), lazy=True)
+        self.assertNotIn('ceo', company.__dict__)
+        raw = Company.build(PythonDocumentBuilder, company)
+        self.assertEqual(raw['ceo']['sign'], 'Pepyako inc.')
+        self.assertEqual(raw, json.loads(self.company_json))
+
+    def test_list_node_from_xml(self):
+        users = Users.parse(LXMLDocumentBuilder,
+                            etree.XML(self.users_xml), lazy=True)
+        self.assertNotIn('users', users.__dict__)
+        self.assertEqual(len(users), 2)
+        self.assertEqual([user.id for user in users], [1, 2])
+
+    def test_slots(self):
+        users = SlotUsers.parse(LXMLDocumentBuilder,
+                                etree.XML(self.users_xml), lazy=True)
+        self.assertIn('users', users._lazy)
+        self.assertEqual(users.users[1].attributes.first_name, 'Nick')
+        self.assertEqual(users._lazy, {})
+
+    def test_materialize(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml), lazy=True)
+        company.materialize()
+        self.assertEqual(company._lazy, {})
+        self.assertEqual(company.__dict__['ceo'].id, 1)
+        self.assertEqual(company.materialize('title'), company.title)
+
+    def test_missing_node(self):
+        company = Company.parse(PythonDocumentBuilder, {'title': 'x'},
+                                lazy=True)
+        self.assertEqual(company.ceo.id, 0)
+
+    def test_visitors(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Company.parse(VisitorLXMLDocumentBuilder,
+                          etree.XML(self.company_xml), lazy=True)
@@ -0,0 +1,89 @@
+import sys
+import json
+from lxml import etree
+from unittest import TestCase, skipIf
+
+from tests.documents import Users, SlotUsers, ColumnVectors
+
+from composite.memory import get_memory_usage, trace_parse
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestMemoryUsage(TestCase):
+    def setUp(self):
+        with open('documents/users.json', 'r') as doc:
+            self.users_json = json.load(doc)
+
+    def test_usage(self):
+        users = Users.parse(PythonDocumentBuilder, self.users_json)
+        report = get_memory_usage(users).as_dict()
+        self.assertEqual(list(report),
+                         ['Users', 'User', 'User.Attributes'])
+        self.assertEqual(report['Users']['instances'], 1)
+        self.assertEqual(report['Users']['fields']['users'],
+                         {'values': 1, 'bytes': sys.getsizeof(users.users)})
+        user = report['User']
+        self.assertEqual(user['instances'], 2)
+        self.assertEqual(user['fields']['_attributes'],
+                         {'values': 2, 'bytes': 0})
+        self.assertEqual(
+            user['fields']['sign']['bytes'],
+            sys.getsizeof(users[0].sign) + sys.getsizeof(users[1].sign))
+        self.assertEqual(user['deep_bytes'], user['bytes'] + sum(
+            field['bytes'] for field in user['fields'].values()))
+        self.assertEqual(report['User.Attributes']['instances'], 2)
+
+    def test_slots(self):
+        users = SlotUsers.parse(PythonDocumentBuilder, self.users_json)
+        usage = get_memory_usage(users)
+        self.assertEqual(usage.classes['SlotUser'].bytes,
+                         2 * sys.getsizeof(users.users[0]))
+        self.assertEqual(usage.classes['SlotUser'].fields['id'].values, 2)
+        self.assertLess(usage.total, get_memory_usage(Users.parse(
+            PythonDocumentBuilder, self.users_json)).total)
+
+    def test_defaults(self):
+        users = Users.parse(PythonDocumentBuilder, {'profile': [{}, {}]})
+        usage = get_memory_usage(users)
+        #: shared default values are counted once
+        sign = usage.classes['User'].fields['sign']
+        self.assertEqual(sign.values, 2)
+        self.assertEqual(sign.bytes, sys.getsizeof(''))
+
+    def test_lazy(self):
+        with open('documents/users.xml', 'rb') as doc:
+            source = etree.XML(doc.read())
+        users = Users.parse(LXMLDocumentBuilder, source, lazy=True)
+        usage = get_memory_usage(users)
+        self.assertEqual(list(usage.classes), ['Users'])
+        self.assertIn('_lazy', usage.classes['Users'].fields)
+        #: accounting does not trigger lazy parse
+        self.assertEqual(len(users), 2)
+
+    def test_columns(self):
+        source = etree.parse('documents/vectors.xml').getroot()
+        vectors = ColumnVectors.parse(LXMLDocumentBuilder, source)
+        usage = get_memory_usage(vectors)
+        self.assertEqual(list(usage.classes), ['ColumnVectors'])
+        self.assertGreater(usage.classes['ColumnVectors'].fields[
+            'vectors'].bytes, sum(sys.getsizeof(column)
+                                  for column in vectors.vectors.columns))
+
+    def test_format(self):
+        users = Users.parse(PythonDocumentBuilder, self.users_json)
+        usage = get_memory_usage(users, users)
+        lines = usage.format().splitlines()
+        self.assertTrue(lines[-1].endswith(' %d' % usage.total))
+        self.assertEqual(usage.classes['Users'].instances, 1)
+
+    @skipIf(sys.version_info < (3, 4), 'tracemalloc requires python 3.4+')
+    def test_trace_parse(self):
+        source = {'profile': self.users_json['profile'] * 100}
+        users, allocations = trace_parse(Users, PythonDocumentBuilder,
+                                         source, limit=3)
+        self.assertEqual(len(users), 200)
+        self.assertGreater(allocations['retained'], 0)
+        self.assertGreaterEqual(allocations['peak'],
+                                allocations['retained'])
+        self.assertLessEqual(len(allocations['sites']), 3)
+        self.assertTrue(allocations['sites'][0]['location'])
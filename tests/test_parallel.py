@@ -0,0 +1,74 @@
+import json
+from lxml import etree
+from unittest import TestCase
+from concurrent.futures import ProcessPoolExecutor
+
+from tests.documents import Company, Users, SlotUsers
+
+from composite import parallel
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestParallelParse(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(2)
+        with open('documents/users.xml', 'rb') as doc:
+            users = etree.XML(doc.read())
+        #: 2 profiles of users.xml repeated 10 times
+        cls.source = etree.Element('Users')
+        for index in range(10):
+            for profile in users:
+                element = etree.fromstring(etree.tostring(profile))
+                element.find('id').text = str(index * 2 + int(
+                    element.find('id').text))
+                cls.source.append(element)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def assert_same_users(self, users, expected):
+        self.assertEqual(len(users.users), len(expected.users))
+        for user, expected_user in zip(users.users, expected.users):
+            self.assertEqual(user.id, expected_user.id)
+            self.assertEqual(user.sign, expected_user.sign)
+            self.assertEqual(user.attributes.values(),
+                             expected_user.attributes.values())
+
+    def test_xml(self):
+        users = parallel.parse(Users, LXMLDocumentBuilder, self.source,
+                               self.executor, chunk_size=3)
+        self.assert_same_users(
+            users, Users.parse(LXMLDocumentBuilder, self.source))
+        self.assertEqual([user.id for user in users.users],
+                         list(range(1, 21)))
+
+    def test_json(self):
+        source = Users.build(
+            PythonDocumentBuilder,
+            Users.parse(LXMLDocumentBuilder, self.source)
+        )
+        users = parallel.parse(Users, PythonDocumentBuilder, source,
+                               self.executor, chunk_size=7)
+        self.assert_same_users(
+            users, Users.parse(PythonDocumentBuilder, source))
+
+    def test_slots(self):
+        users = parallel.parse(SlotUsers, LXMLDocumentBuilder, self.source,
+                               self.executor, chunk_size=4)
+        self.assert_same_users(
+            users, SlotUsers.parse(LXMLDocumentBuilder, self.source))
+
+    def test_projection(self):
+        users = parallel.parse(Users, LXMLDocumentBuilder, self.source,
+                               self.executor, exclude=['users.attributes'])
+        self.assertEqual(users.users[0].id, 1)
+        self.assertFalse(users.users[0].has_attributes())
+
+    def test_no_list_nodes(self):
+        with open('documents/company.json', 'r') as doc:
+            source = json.load(doc)
+        company = parallel.parse(Company, PythonDocumentBuilder, source,
+                                 self.executor)
+        self.assertEqual(company.ceo.attributes.first_name, 'Alexander')
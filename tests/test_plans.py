@@ -0,0 +1,146 @@
+import json
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import Company, User, Users, SlotUsers
+
+from composite.plans import ParsePlan, BuildPlan, StatePlan, get_plan
+from composite.visitors import LXMLParseVisitor
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class VisitorLXMLDocumentBuilder(LXMLDocumentBuilder):
+    parse_compiler_class = None
+    build_compiler_class = None
+
+
+class VisitorPythonDocumentBuilder(PythonDocumentBuilder):
+    parse_compiler_class = None
+    build_compiler_class = None
+
+
+class TestParsePlans(TestCase):
+    def setUp(self):
+        with closing(open('documents/company.xml', 'r')) as doc:
+            self.xml_file = doc.read().encode('utf-8')
+
+        with closing(open('documents/company.json', 'r')) as doc:
+            self.json_file = doc.read()
+
+    def assert_same_company(self, company, expected):
+        self.assertEqual(company.title, expected.title)
+        self.assertEqual(company.address, expected.address)
+        self.assertEqual(company.company_type, expected.company_type)
+        self.assertEqual(company.ceo.id, expected.ceo.id)
+        self.assertEqual(company.ceo.sign, expected.ceo.sign)
+        self.assertEqual(company.ceo.attributes.values(),
+                         expected.ceo.attributes.values())
+
+    def test_plan_is_cached(self):
+        plan = Company.get_parse_plan(LXMLDocumentBuilder)
+        self.assertIsInstance(plan, ParsePlan)
+        self.assertIs(plan, Company.get_parse_plan(LXMLDocumentBuilder))
+        self.assertIsNot(plan, Company.get_parse_plan(PythonDocumentBuilder))
+        self.assertEqual(sorted(plan.setters),
+                         ['address', 'ceo', 'company_type', 'title'])
+
+    def test_nested_plans_compiled(self):
+        Users.get_parse_plan(LXMLDocumentBuilder)
+        self.assertIn((ParsePlan, LXMLDocumentBuilder), User._plans)
+        self.assertIn((ParsePlan, LXMLDocumentBuilder),
+                      User.Attributes._plans)
+
+    def test_xml_matches_visitors(self):
+        node = etree.XML(self.xml_file)
+        self.assert_same_company(
+            Company.parse(LXMLDocumentBuilder, node),
+            Company.parse(VisitorLXMLDocumentBuilder, node)
+        )
+
+    def test_json_matches_visitors(self):
+        source = json.loads(self.json_file)
+        self.assert_same_company(
+            Company.parse(PythonDocumentBuilder, source),
+            Company.parse(VisitorPythonDocumentBuilder, source)
+        )
+
+    def test_unknown_nodes_skipped(self):
+        user = User.parse(PythonDocumentBuilder,
+                          {'id': 10, 'sign': 'x', 'unknown': {'a': 1}})
+        self.assertEqual(user.id, 10)
+        self.assertNotIn('unknown', user.__dict__)
+
+
+class TestBuildPlans(TestCase):
+    def setUp(self):
+        with closing(open('documents/users.xml', 'r')) as doc:
+            self.users = Users.parse(
+                LXMLDocumentBuilder, etree.XML(doc.read().encode('utf-8')))
+
+    def test_plan_is_cached(self):
+        plan = Users.get_build_plan(PythonDocumentBuilder)
+        self.assertIsInstance(plan, BuildPlan)
+        self.assertIs(plan, Users.get_build_plan(PythonDocumentBuilder))
+        self.assertIn((BuildPlan, PythonDocumentBuilder), User._plans)
+
+    def test_xml_matches_visitors(self):
+        self.assertEqual(
+            etree.tostring(Users.build(LXMLDocumentBuilder, self.users)),
+            etree.tostring(Users.build(VisitorLXMLDocumentBuilder,
+                                       self.users))
+        )
+
+    def test_json_matches_visitors(self):
+        self.assertEqual(
+            Users.build(PythonDocumentBuilder, self.users),
+            Users.build(VisitorPythonDocumentBuilder, self.users)
+        )
+
+
+class CountingVisitor(LXMLParseVisitor):
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingVisitor.instances += 1
+        super(CountingVisitor, self).__init__(*args, **kwargs)
+
+
+class CountingLXMLDocumentBuilder(VisitorLXMLDocumentBuilder):
+    parse_visitor_class = CountingVisitor
+    instances = 0
+
+    def __init__(self, document):
+        CountingLXMLDocumentBuilder.instances += 1
+        super(CountingLXMLDocumentBuilder, self).__init__(document)
+
+
+class TestVisitorReuse(TestCase):
+    def test_nested_documents(self):
+        source = etree.parse('documents/users.xml').getroot()
+        users = Users.parse(CountingLXMLDocumentBuilder, source)
+        self.assertEqual([user.id for user in users], [1, 2])
+        self.assertEqual(users[1].attributes.first_name, 'Nick')
+        self.assertEqual(CountingLXMLDocumentBuilder.instances, 1)
+        self.assertEqual(CountingVisitor.instances, 1)
+
+
+class TestStatePlans(TestCase):
+    def setUp(self):
+        self.source = etree.parse('documents/users.xml').getroot()
+
+    def test_round_trip(self):
+        for document_class in (Users, SlotUsers):
+            users = document_class.parse(LXMLDocumentBuilder, self.source)
+            plan = get_plan(StatePlan, document_class)
+            state = plan.dump(users)
+            self.assertIsInstance(state, tuple)
+            restored = plan.load(state)
+            self.assertIsInstance(restored, document_class)
+            self.assertEqual(plan.dump(restored), state)
+            self.assertEqual(restored.users[1].attributes.first_name, 'Nick')
+
+    def test_no_attributes(self):
+        plan = get_plan(StatePlan, User)
+        self.assertEqual(plan.dump(User()), (0, '', None))
+        self.assertFalse(plan.load((1, 'x', None)).has_attributes())
@@ -0,0 +1,121 @@
+import gc
+import json
+import weakref
+from lxml import etree
+from unittest import TestCase
+
+from tests.documents import User, Users
+
+from composite.plans import ParsePlan
+from composite.cache import ParseCache
+from composite.profiling import Profiler
+from composite.builders import (
+    ExpatDocumentBuilder, JSONDocumentBuilder, LXMLDocumentBuilder,
+    PythonDocumentBuilder
+)
+
+
+class TestProfiler(TestCase):
+    def setUp(self):
+        with open('documents/users.xml', 'rb') as doc:
+            self.users_xml = doc.read()
+        with open('documents/users.json', 'r') as doc:
+            self.users_json = json.load(doc)
+        self.profiler = Profiler()
+
+    def assert_counters(self, report):
+        #: xml builders visit every list item element, dict ones the list
+        users = report['Users']['fields']['users']
+        self.assertIn(users['visits'], (1, 2))
+        self.assertEqual(users['conversions'], 0)
+        user = report['User']['fields']
+        self.assertEqual(user['id']['visits'], 2)
+        self.assertEqual(user['id']['conversions'], 2)
+        self.assertEqual(user['sign']['bytes'],
+                         len('Pepyako inc.') + len('In beat we blast.'))
+        self.assertGreaterEqual(user['sign']['conversion_seconds'], 0)
+        self.assertEqual(report['User.Attributes']['fields']['age'][
+            'conversions'], 2)
+
+    def test_builders(self):
+        sources = (
+            (LXMLDocumentBuilder, etree.XML(self.users_xml)),
+            (ExpatDocumentBuilder, self.users_xml),
+            (PythonDocumentBuilder, self.users_json),
+            (JSONDocumentBuilder, json.dumps(self.users_json)),
+        )
+        for builder_class, source in sources:
+            profiler = Profiler()
+            users = Users.parse(builder_class, source, profiler=profiler)
+            self.assertEqual([user.id for user in users], [1, 2])
+            self.assertEqual(users[1].attributes.age, 28)
+            self.assert_counters(profiler.as_dict())
+
+    def test_skipped(self):
+        source = dict(self.users_json, unknown=[1, 2])
+        source['profile'][0]['extra'] = 'value'
+        Users.parse(PythonDocumentBuilder, source, profiler=self.profiler)
+        report = self.profiler.as_dict()
+        self.assertEqual(report['Users']['skipped'], 1)
+        #: ``extra`` and ``_attributes`` source keys
+        self.assertEqual(report['User']['skipped'], 3)
+
+    def test_plans(self):
+        Users.parse(PythonDocumentBuilder, self.users_json,
+                    profiler=self.profiler)
+        Users.parse(PythonDocumentBuilder, self.users_json,
+                    profiler=self.profiler)
+        self.assertEqual(
+            self.profiler.as_dict()['User']['fields']['id']['visits'], 4)
+        plan = Users.get_parse_plan(PythonDocumentBuilder)
+        self.assertIsNot(plan, Users.get_parse_plan(PythonDocumentBuilder,
+                                                    profiler=self.profiler))
+        self.assertIs(type(plan.setters), dict)
+        self.assertIsNotNone(self.profiler.plans[Users].get(
+            (ParsePlan, PythonDocumentBuilder, ('profiler', self.profiler))))
+
+    def test_plans_not_kept(self):
+        Users.parse(PythonDocumentBuilder, self.users_json)
+        plans, user_plans = len(Users._plans), len(User._plans)
+        for _ in range(3):
+            profiler = Profiler()
+            Users.parse(PythonDocumentBuilder, self.users_json,
+                        profiler=profiler)
+            self.assertIn(User, profiler.plans)
+        self.assertEqual(len(Users._plans), plans)
+        self.assertEqual(len(User._plans), user_plans)
+        reference = weakref.ref(profiler)
+        del profiler
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_reset(self):
+        Users.parse(PythonDocumentBuilder, self.users_json,
+                    profiler=self.profiler)
+        self.profiler.reset()
+        report = self.profiler.as_dict()
+        self.assertEqual(report['User']['fields']['id']['visits'], 0)
+        self.assertEqual(report['User']['skipped'], 0)
+        Users.parse(PythonDocumentBuilder, self.users_json,
+                    profiler=self.profiler)
+        self.assertEqual(
+            self.profiler.as_dict()['User']['fields']['id']['visits'], 2)
+
+    def test_prometheus(self):
+        Users.parse(PythonDocumentBuilder, self.users_json,
+                    profiler=self.profiler)
+        lines = self.profiler.as_prometheus(namespace='app').splitlines()
+        self.assertIn('# TYPE app_field_visits_total counter', lines)
+        self.assertIn('app_field_visits_total{document="User",field="id"} 2',
+                      lines)
+        self.assertIn('app_field_bytes_total{document="User",field="sign"} '
+                      '%d' % len('Pepyako inc.In beat we blast.'), lines)
+        self.assertIn('app_skipped_nodes_total{document="User"} 2', lines)
+
+    def test_cache(self):
+        cache = ParseCache()
+        Users.parse(PythonDocumentBuilder, self.users_json, cache=cache)
+        Users.parse(PythonDocumentBuilder, self.users_json, cache=cache,
+                    profiler=self.profiler)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(self.profiler.as_dict(), {})
@@ -0,0 +1,77 @@
+import json
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import Company, Users
+
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestProjection(TestCase):
+    def setUp(self):
+        with closing(open('documents/company.xml', 'r')) as doc:
+            self.company_xml = doc.read().encode('utf-8')
+
+        with closing(open('documents/company.json', 'r')) as doc:
+            self.company_json = doc.read()
+
+        with closing(open('documents/users.xml', 'r')) as doc:
+            self.users_xml = doc.read().encode('utf-8')
+
+    def test_only(self):
+        company = Company.parse(PythonDocumentBuilder,
+                                json.loads(self.company_json),
+                                only=['title', 'ceo.sign'])
+        self.assertEqual(company.title, 'Pepyako industries')
+        self.assertEqual(company.address, '')
+        self.assertEqual(company.ceo.sign, 'Pepyako inc.')
+        self.assertEqual(company.ceo.id, 0)
+        self.assertFalse(company.ceo.has_attributes())
+
+    def test_only_node(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml), only=['ceo'])
+        self.assertEqual(company.title, '')
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.ceo.attributes.age, 23)
+
+    def test_only_attributes(self):
+        users = Users.parse(LXMLDocumentBuilder, etree.XML(self.users_xml),
+                            only=['users.attributes.age'])
+        self.assertEqual(len(users), 2)
+        user = users[1]
+        self.assertEqual(user.id, 0)
+        self.assertEqual(user.attributes.age, 28)
+        self.assertEqual(user.attributes.first_name, '')
+
+    def test_exclude(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml),
+                                exclude=['address', 'ceo.attributes'])
+        self.assertEqual(company.title, 'Pepyako industries')
+        self.assertEqual(company.address, '')
+        self.assertEqual(company.ceo.id, 1)
+        self.assertFalse(company.ceo.has_attributes())
+
+    def test_lazy(self):
+        company = Company.parse(LXMLDocumentBuilder,
+                                etree.XML(self.company_xml), lazy=True,
+                                only=['ceo.id'])
+        self.assertNotIn('ceo', company.__dict__)
+        self.assertEqual(company.ceo.id, 1)
+        self.assertEqual(company.ceo.sign, '')
+
+    def test_compiled_once(self):
+        plan = Company.get_parse_plan(PythonDocumentBuilder,
+                                      only=['ceo.sign', 'title'])
+        self.assertIs(plan, Company.get_parse_plan(
+            PythonDocumentBuilder, only=('title', 'ceo.sign')))
+        self.assertEqual(sorted(plan.setters), ['ceo', 'title'])
+
+    def test_unknown_field(self):
+        with self.assertRaises(ImproperlyConfigured):
+            Company.parse(PythonDocumentBuilder, {}, only=['ceo.name'])
+        with self.assertRaises(ImproperlyConfigured):
+            Company.parse(PythonDocumentBuilder, {}, exclude=['name'])
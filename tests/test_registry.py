@@ -0,0 +1,51 @@
+import sys
+import subprocess
+from collections import namedtuple
+from unittest import TestCase, skipIf
+
+from composite import builders, registry
+from composite.builders import (
+    LXMLDocumentBuilder, PythonDocumentBuilder, get_builder
+)
+
+EntryPoint = namedtuple('EntryPoint', ['name', 'load'])
+
+
+class TestRegistry(TestCase):
+    def test_get_builder(self):
+        self.assertIs(get_builder('LXMLDocumentBuilder'), LXMLDocumentBuilder)
+        self.assertIs(get_builder('PythonDocumentBuilder'),
+                      PythonDocumentBuilder)
+        with self.assertRaises(LookupError):
+            get_builder('YAMLDocumentBuilder')
+
+    def test_entry_points(self):
+        def iter_entry_points(group):
+            self.assertEqual(group, 'composite.builders')
+            return [EntryPoint('YAMLDocumentBuilder', lambda: dict)]
+
+        original = registry.iter_entry_points
+        registry.iter_entry_points = iter_entry_points
+        try:
+            self.assertIs(get_builder('YAMLDocumentBuilder'), dict)
+        finally:
+            registry.iter_entry_points = original
+
+    def test_exports(self):
+        self.assertIn('JSONDocumentBuilder', dir(builders))
+        self.assertEqual(set(builders.__all__) - set(dir(builders)), set())
+        with self.assertRaises(AttributeError):
+            getattr(builders, 'YAMLDocumentBuilder')
+
+    @skipIf(not registry.LAZY_IMPORTS, 'module __getattr__ is python 3.7+')
+    def test_lazy_imports(self):
+        output = subprocess.check_output([
+            sys.executable, '-c',
+            'import sys, composite.batch\n'
+            'from composite.builders import PythonDocumentBuilder\n'
+            'from composite.builders import JSONDocumentBuilder\n'
+            'print("lxml" in sys.modules)\n'
+            'from composite.builders import LXMLDocumentBuilder\n'
+            'print("lxml" in sys.modules)\n'
+        ])
+        self.assertEqual(output.split(), [b'False', b'True'])
@@ -0,0 +1,75 @@
+import json
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import SlotUser, SlotUsers
+
+from composite.fields import Field
+from composite.documents import Document
+from composite.exceptions import ImproperlyConfigured
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestSlots(TestCase):
+    def setUp(self):
+        with closing(open('documents/users.xml', 'r')) as doc:
+            self.xml_file = doc.read().encode('utf-8')
+
+        with closing(open('documents/users.json', 'r')) as doc:
+            self.json_raw = doc.read()
+
+    def assert_user(self, user):
+        self.assertEqual(user.id, 1)
+        self.assertEqual(user.sign, "Pepyako inc.")
+        self.assertFalse(hasattr(user, '__dict__'))
+        attributes = user.attributes
+        self.assertIsInstance(attributes, SlotUser.Attributes)
+        self.assertFalse(hasattr(attributes, '__dict__'))
+        self.assertEqual(attributes.first_name, "Alexander")
+        self.assertEqual(attributes.last_name, "Pepyako")
+        self.assertEqual(attributes.age, 23)
+
+    def test_slots(self):
+        self.assertEqual(set(SlotUser.__slots__),
+                         {'id', 'sign', '_attributes'})
+        self.assertEqual(SlotUsers.__slots__, ('users', '_lazy'))
+        self.assertEqual(set(SlotUser.Attributes.__slots__),
+                         {'first_name', 'last_name', 'age'})
+
+    def test_init(self):
+        user = SlotUser()
+        self.assertEqual(user.id, 0)
+        self.assertEqual(user.sign, '')
+        self.assertFalse(user.has_attributes())
+        self.assertEqual(SlotUsers().users, [])
+
+    def test_from_xml(self):
+        users = SlotUsers.parse(LXMLDocumentBuilder,
+                                etree.XML(self.xml_file))
+        self.assertEqual(len(users.users), 2)
+        self.assert_user(users.users[0])
+
+    def test_to_json(self):
+        users = SlotUsers.parse(PythonDocumentBuilder,
+                                json.loads(self.json_raw))
+        raw_object = SlotUsers.build(PythonDocumentBuilder, users)
+        self.assertEqual(raw_object['profile'][0], {
+            '_attributes': {
+                'first_name': 'Alexander', 'last_name': 'Pepyako',
+                'age': 23
+            },
+            'id': 1,
+            'sign': 'Pepyako inc.'
+        })
+        self.assert_user(
+            SlotUsers.parse(PythonDocumentBuilder, raw_object).users[0])
+
+    def test_attribute_class_failure(self):
+        attrs = {
+            'x': Field('x', int),
+            'Attributes': type('Attributes', (), {'z': Field('z', int)}),
+            'Meta': type('Meta', (), {'slots': True})
+        }
+        with self.assertRaises(ImproperlyConfigured):
+            type('Vector', (Document, ), attrs)
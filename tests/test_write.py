@@ -0,0 +1,64 @@
+import io
+import os
+import tempfile
+from lxml import etree
+from unittest import TestCase
+from contextlib import closing
+
+from tests.documents import Users, User, Company
+
+from composite.builders import LXMLDocumentBuilder, PythonDocumentBuilder
+
+
+class TestWrite(TestCase):
+    def setUp(self):
+        with closing(open('documents/users.xml', 'r')) as doc:
+            self.users = Users.parse(LXMLDocumentBuilder,
+                                     etree.XML(doc.read().encode('utf-8')))
+
+    def test_write_matches_build(self):
+        target = io.BytesIO()
+        Users.write(LXMLDocumentBuilder, self.users, target)
+        self.assertEqual(
+            etree.tostring(etree.XML(target.getvalue())),
+            etree.tostring(Users.build(LXMLDocumentBuilder, self.users))
+        )
+
+    def test_write_generator(self):
+        def make_users(count):
+            for index in range(count):
+                user = User()
+                user.id = index
+                user.sign = 'user %d' % index
+                yield user
+
+        users = Users()
+        users.users = make_users(100)
+        builder = LXMLDocumentBuilder(users)
+        chunks = list(builder.iterwrite('Users'))
+        self.assertGreater(len(chunks), 100)
+
+        source = Users.parse(LXMLDocumentBuilder,
+                             etree.XML(b''.join(chunks)))
+        self.assertEqual(len(source), 100)
+        self.assertEqual(source[99].id, 99)
+        self.assertEqual(source[99].sign, 'user 99')
+
+    def test_write_file(self):
+        source = etree.parse('documents/company.xml').getroot()
+        company = Company.parse(LXMLDocumentBuilder, source)
+        descriptor, path = tempfile.mkstemp(suffix='.xml')
+        os.close(descriptor)
+        try:
+            Company.write(LXMLDocumentBuilder, company, path, 'Company')
+            node = etree.parse(path).getroot()
+        finally:
+            os.unlink(path)
+        self.assertEqual(node.tag, 'Company')
+        company = Company.parse(LXMLDocumentBuilder, node)
+        self.assertEqual(company.ceo.attributes.first_name, 'Alexander')
+        self.assertEqual(company.title, 'Pepyako industries')
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            Users.write(PythonDocumentBuilder, self.users, io.BytesIO())